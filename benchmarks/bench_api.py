@@ -0,0 +1,101 @@
+"""Read throughput of the ``todo api`` HTTP server under concurrent clients.
+
+Run from the repository root:
+
+    python benchmarks/bench_api.py --tasks 100000 --concurrency 100 --requests 20000
+
+Serves a seeded store from an in-process `TaskAPI` and drives it with
+keep-alive asyncio clients issuing ``GET /tasks/<id>`` reads, optionally
+mixed with ``POST /tasks`` writes (``--write-ratio``); writes are
+cheapest with ``--backend journal``, which appends instead of rewriting.
+Clients and server share one event loop and one core, so the figure is a
+lower bound.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.dirname(HERE)
+for path in (REPO, HERE):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from generator import make_tasks  # noqa: E402
+from src.cli.http_api import TaskAPI  # noqa: E402
+from src.cli.interface import make_storage  # noqa: E402
+from src.services.task_service import TaskService  # noqa: E402
+
+
+async def client(port: int, n: int, tasks: int, write_ratio: float, rng: random.Random) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = b'{"raw": "Bench write @bench #low"}'
+    for _ in range(n):
+        if rng.random() < write_ratio:
+            writer.write(
+                b"POST /tasks HTTP/1.1\r\nHost: x\r\nContent-Length: "
+                + str(len(body)).encode() + b"\r\n\r\n" + body
+            )
+        else:
+            writer.write(f"GET /tasks/{rng.randint(1, tasks)} HTTP/1.1\r\nHost: x\r\n\r\n".encode())
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line == b"\r\n":
+                break
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":")[1])
+        await reader.readexactly(length)
+    writer.close()
+
+
+async def run(args: argparse.Namespace, svc: TaskService) -> float:
+    api = TaskAPI(svc)
+    server = await api.start("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    per_client = args.requests // args.concurrency
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(port, per_client, args.tasks, args.write_ratio, random.Random(rng.random()))
+        for _ in range(args.concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+    server.close()
+    await server.wait_closed()
+    await api.stop()
+    return per_client * args.concurrency / elapsed
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--tasks", type=int, default=100_000)
+    p.add_argument("--concurrency", type=int, default=100)
+    p.add_argument("--requests", type=int, default=20_000)
+    p.add_argument("--write-ratio", type=float, default=0.0)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--backend", default="json", help="storage backend (see todo --backend)")
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = make_storage(Path(tmp) / "tasks", args.backend)
+        storage.save(make_tasks(args.tasks, args.seed))
+        svc = TaskService(storage, flush_interval=1.0)
+        svc.todo  # load before timing
+        rps = asyncio.run(run(args, svc))
+        svc.close()
+    print(
+        f"{args.backend}: {args.tasks} tasks, {args.concurrency} clients, "
+        f"write ratio {args.write_ratio:.0%}: {rps:,.0f} requests/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
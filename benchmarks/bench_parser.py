@@ -0,0 +1,82 @@
+"""Throughput of `parse_task_input` against the original multi-pass parser.
+
+Run from the repository root:
+
+    python benchmarks/bench_parser.py --count 100000 --distinct 1000
+
+``--distinct`` controls how many unique inputs the workload cycles through,
+which decides how often the LRU cache can answer a repeated line.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from parsers import task_parser  # noqa: E402
+from reference_parser import parse_task_input_reference  # noqa: E402
+
+WORDS = ["report", "milk", "sprint", "review", "call", "invoice", "deploy", "notes"]
+TOKENS = [
+    lambda r: f"@{r.choice(WORDS)}",
+    lambda r: f"#{r.choice(['high', 'medium', 'low'])}",
+    lambda r: f"due:2025-{r.randint(1, 12):02d}-{r.randint(1, 28):02d}",
+    lambda r: "due:tomorrow",
+    lambda r: f"assigned:{r.choice(WORDS)}@example.com",
+    lambda r: f"at {r.randint(1, 12)}{r.choice(['am', 'pm'])}",
+    lambda r: f"every {r.choice(['day', 'monday', 'week'])}",
+]
+
+
+def make_inputs(count: int, distinct: int, seed: int = 0):
+    rng = random.Random(seed)
+    pool = []
+    for _ in range(distinct):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(2, 6))]
+        words += [tok(rng) for tok in rng.sample(TOKENS, rng.randint(1, 4))]
+        rng.shuffle(words)
+        pool.append(" ".join(words))
+    return [pool[i % distinct] for i in range(count)]
+
+
+def per_call_us(fn, inputs, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in inputs:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(inputs) * 1e6
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--count", type=int, default=100_000)
+    ap.add_argument("--distinct", type=int, default=1000)
+    ap.add_argument("--repeat", type=int, default=3, help="best of N runs")
+    args = ap.parse_args(argv)
+    inputs = make_inputs(args.count, args.distinct)
+
+    rows = [("original", parse_task_input_reference)]
+    task_parser.configure_parse_cache(0)
+    rows.append(("uncached", task_parser.parse_task_input))
+    results = [(name, per_call_us(fn, inputs, args.repeat)) for name, fn in rows]
+    task_parser.configure_parse_cache()
+    cached = per_call_us(task_parser.parse_task_input, inputs, args.repeat)
+    results.append(("cached", cached))
+
+    base = results[0][1]
+    print(f"{args.count} inputs, {args.distinct} distinct")
+    print(f"{'parser':>10} {'us/call':>9} {'speedup':>8}")
+    for name, us in results:
+        print(f"{name:>10} {us:9.2f} {base / us:7.2f}x")
+    print(f"cache: {task_parser.parse_cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
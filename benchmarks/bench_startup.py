@@ -0,0 +1,96 @@
+"""Startup cost of the JSON store versus the memory-mapped snapshot.
+
+Run from the repository root:
+
+    python benchmarks/bench_startup.py --sizes 10000 100000 1000000
+    python benchmarks/bench_startup.py --sizes 100000 --cli
+
+For each size the same seeded tasks are written in both formats, then a
+fresh store is timed for: opening it and counting tasks, the first
+selective filter through a new `TaskService` (what one CLI invocation
+does), and a full load. ``--cli`` also times whole ``todo list``
+processes, which includes interpreter start-up.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.dirname(HERE)
+for path in (os.path.join(REPO, "src"), HERE):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from generator import make_tasks  # noqa: E402
+from services.snapshot_storage import SnapshotStorageService  # noqa: E402
+from services.storage_service import StorageService  # noqa: E402
+from services.task_service import TaskService  # noqa: E402
+
+BACKENDS = {"json": StorageService, "snapshot": SnapshotStorageService}
+ASSIGNEE = "user7@example.com"
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def count(storage) -> int:
+    counter = getattr(storage, "count", None)
+    return counter() if counter is not None else len(storage.load())
+
+
+def run(n: int, seed: int, cli: bool, tmp: Path) -> None:
+    tasks = make_tasks(n, seed)
+    paths = {}
+    for name, cls in BACKENDS.items():
+        paths[name] = tmp / f"tasks-{n}.{name}"
+        cls(paths[name]).save(tasks)
+    del tasks
+    for name, cls in BACKENDS.items():
+        path = paths[name]
+        size_mb = path.stat().st_size / 1e6
+        open_s = timed(lambda: count(cls(path)))
+        first_s = timed(lambda: TaskService(cls(path)).filter_by_assignee(ASSIGNEE))
+        load_s = timed(lambda: cls(path).load())
+        row = (
+            f"{n:>9} {name:<9} {size_mb:>8.1f} {open_s * 1e3:>10.2f} "
+            f"{first_s * 1e3:>12.2f} {load_s * 1e3:>10.1f}"
+        )
+        if cli:
+            argv = [
+                sys.executable, "-m", "src.main", "--log-level", "ERROR",
+                "--backend", name, "list", "--assigned", ASSIGNEE, "--data", str(path),
+            ]
+            run_s = timed(lambda: subprocess.run(
+                argv, cwd=REPO, check=True, stdout=subprocess.DEVNULL
+            ))
+            row += f" {run_s * 1e3:>10.0f}"
+        print(row, flush=True)
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--cli", action="store_true", help="also time whole CLI processes")
+    args = p.parse_args()
+
+    header = (
+        f"{'tasks':>9} {'format':<9} {'MB':>8} {'open ms':>10} "
+        f"{'1st filter':>12} {'load ms':>10}"
+    )
+    print(header + (f" {'cli ms':>10}" if args.cli else ""))
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            run(n, args.seed, args.cli, Path(tmp))
+
+
+if __name__ == "__main__":
+    main()
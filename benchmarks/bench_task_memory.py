@@ -0,0 +1,85 @@
+"""Bytes per task for the `Task`, `LazyTask` and `CompactTask` representations.
+
+Run from the repository root:
+
+    python benchmarks/bench_task_memory.py --n 1000000
+
+Each representation is built from freshly decoded JSON dictionaries, as a
+load from storage would, and tracemalloc reports what the task objects keep
+alive (descriptions and tags included) once the dictionaries are dropped.
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from models.task import CompactTask, LazyTask, Task  # noqa: E402
+
+TAGS = ["work", "home", "ops", "school", "family", "shopping", "sprint42", "release"]
+PRIORITIES = [None, "high", "medium", "low"]
+
+
+def make_dicts(n: int, seed: int) -> list:
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 1)
+    out = []
+    for i in range(1, n + 1):
+        due = base + timedelta(days=rng.randrange(365)) if rng.random() < 0.6 else None
+        created = base + timedelta(seconds=rng.randrange(30_000_000))
+        out.append(Task(
+            id=i,
+            description=f"Task number {i} about {rng.choice(TAGS)}",
+            tags=rng.sample(TAGS, rng.randrange(3)),
+            priority=rng.choice(PRIORITIES),
+            due_date=due,
+            assigned_to=f"user{rng.randrange(50)}@example.com" if rng.random() < 0.3 else None,
+            time=due.replace(hour=15) if due and rng.random() < 0.3 else None,
+            created_at=created,
+            updated_at=created,
+        ).to_dict())
+    return out
+
+
+def bytes_per_task(factory, payload: str) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    dicts = json.loads(payload)
+    tasks = [factory(d) for d in dicts]
+    del dicts
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    size = (after - before) / len(tasks)
+    del tasks
+    return size
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--n", type=int, default=1_000_000, help="Number of tasks")
+    p.add_argument("--seed", type=int, default=42)
+    args = p.parse_args()
+
+    payload = json.dumps(make_dicts(args.n, args.seed))
+    print(f"{'representation':>16} {'bytes/task':>12} {'MB total':>10}")
+    for name, factory in [
+        ("Task", Task.from_dict),
+        ("LazyTask", LazyTask.from_dict),
+        ("CompactTask", CompactTask.from_dict),
+    ]:
+        per = bytes_per_task(factory, payload)
+        print(f"{name:>16} {per:>12.1f} {per * args.n / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
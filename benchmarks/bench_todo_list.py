@@ -0,0 +1,74 @@
+"""Per-operation latency of `TodoList` id lookups at increasing sizes.
+
+Run from the repository root:
+
+    python benchmarks/bench_todo_list.py --sizes 1000 10000 100000 1000000
+
+With the id-keyed index every column should stay roughly flat as the list
+grows; a linear scan shows up as latency proportional to the size.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from models.task import Task  # noqa: E402
+from models.todo_list import TodoList  # noqa: E402
+
+
+def build(n: int) -> TodoList:
+    now = datetime.now()
+    todo = TodoList()
+    todo.load_tasks([
+        Task(id=i, description=f"task {i}", created_at=now, updated_at=now)
+        for i in range(1, n + 1)
+    ])
+    return todo
+
+
+def per_op_us(fn, ids) -> float:
+    start = time.perf_counter()
+    for tid in ids:
+        fn(tid)
+    return (time.perf_counter() - start) / len(ids) * 1e6
+
+
+def run(n: int, ops: int, rng: random.Random) -> dict:
+    todo = build(n)
+    ids = [rng.randint(1, n) for _ in range(ops)]
+    results = {
+        "find_by_id": per_op_us(todo.find_by_id, ids),
+        "update_task": per_op_us(
+            lambda tid: todo.update_task(tid, lambda t: setattr(t, "priority", "high")), ids
+        ),
+        "mark_complete": per_op_us(todo.mark_complete, ids),
+    }
+    unique = list(dict.fromkeys(ids))
+    results["delete_task"] = per_op_us(todo.delete_task, unique)
+    return results
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    p.add_argument("--ops", type=int, default=10_000, help="Operations per measurement")
+    p.add_argument("--seed", type=int, default=42)
+    args = p.parse_args()
+
+    rng = random.Random(args.seed)
+    columns = ["find_by_id", "update_task", "mark_complete", "delete_task"]
+    print(f"{'tasks':>10} " + " ".join(f"{c + ' (us)':>18}" for c in columns))
+    for n in args.sizes:
+        res = run(n, args.ops, rng)
+        print(f"{n:>10} " + " ".join(f"{res[c]:>18.3f}" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Seeded synthetic task data for the benchmarks.
+
+Every task is drawn once from a `random.Random(seed)` stream and can be
+rendered either as the raw line a user would type (``raw_inputs``) or
+directly as a `Task` holding the fields that line encodes (``make_tasks``),
+so large stores can be built without paying for parsing. The same seed
+always yields the same data.
+"""
+
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+from typing import Iterator, List
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from models.task import Task  # noqa: E402
+
+VERBS = ["Write", "Review", "Fix", "Plan", "Call", "Buy", "Deploy", "Email", "Update", "Clean"]
+NOUNS = [
+    "report", "invoice", "release notes", "milk", "sprint board", "dentist",
+    "server", "budget", "slides", "garage", "contract", "backlog",
+]
+TAGS = ["work", "home", "ops", "school", "family", "shopping", "sprint42", "release", "urgent"]
+PRIORITIES = [None, None, "high", "medium", "low"]
+PEOPLE = [f"user{i}" for i in range(50)]
+BASE_DATE = datetime(2025, 1, 1)
+
+
+def _draw(rng: random.Random) -> dict:
+    fields = {
+        "description": f"{rng.choice(VERBS)} {rng.choice(NOUNS)} {rng.randrange(10_000)}",
+        "tags": rng.sample(TAGS, rng.choice((0, 1, 1, 2, 3))),
+        "priority": rng.choice(PRIORITIES),
+        "due_date": None,
+        "assigned_to": None,
+        "hour": None,
+    }
+    if rng.random() < 0.6:
+        fields["due_date"] = BASE_DATE + timedelta(days=rng.randrange(730))
+    if rng.random() < 0.3:
+        fields["assigned_to"] = f"{rng.choice(PEOPLE)}@example.com"
+    if fields["due_date"] and rng.random() < 0.3:
+        fields["hour"] = rng.randrange(1, 13)
+    return fields
+
+
+def _render(fields: dict) -> str:
+    parts = [fields["description"]]
+    parts += [f"@{tag}" for tag in fields["tags"]]
+    if fields["priority"]:
+        parts.append(f"#{fields['priority']}")
+    if fields["due_date"]:
+        parts.append(f"due:{fields['due_date']:%Y-%m-%d}")
+    if fields["assigned_to"]:
+        parts.append(f"assigned:{fields['assigned_to']}")
+    if fields["hour"]:
+        parts.append(f"at {fields['hour']}pm")
+    return " ".join(parts)
+
+
+def raw_inputs(n: int, seed: int = 0) -> Iterator[str]:
+    """Yield ``n`` raw task lines covering every token the parser knows."""
+    rng = random.Random(seed)
+    for _ in range(n):
+        yield _render(_draw(rng))
+
+
+def make_tasks(n: int, seed: int = 0) -> List[Task]:
+    """Build the tasks ``raw_inputs(n, seed)`` describes, with ids 1..n.
+
+    Fields match the parser's result except for its known quirk with
+    ``assigned:`` tokens, whose email domain it also reads as an ``@tag``.
+    """
+    rng = random.Random(seed)
+    tasks = []
+    for i in range(1, n + 1):
+        fields = _draw(rng)
+        created = BASE_DATE + timedelta(seconds=i)
+        due = fields["due_date"]
+        hour = fields["hour"]
+        tasks.append(Task(
+            id=i,
+            description=fields["description"],
+            tags=fields["tags"],
+            priority=fields["priority"],
+            due_date=due,
+            assigned_to=fields["assigned_to"],
+            time=due.replace(hour=hour % 12 + 12) if hour else None,
+            created_at=created,
+            updated_at=created,
+        ))
+    return tasks
@@ -0,0 +1,211 @@
+"""Time the hot paths at several store sizes and check for regressions.
+
+Run from the repository root:
+
+    python benchmarks/run_benchmarks.py --sizes 1000 100000 --output bench.json
+    python benchmarks/run_benchmarks.py --baseline bench.json --threshold 0.25
+
+Each size gets a fresh store built by `generator.make_tasks`; the cases
+cover `parse_task_input`, `StorageService.load/save`, the `TaskService`
+mutations and queries, and the CLI `execute_command`. Results are written
+as JSON (seconds per operation). With ``--baseline`` every case is compared
+to the stored run and the exit status is 1 when any case got slower than
+its threshold allows; ``--case-threshold 'service.add*=1.0'`` loosens or
+tightens individual cases.
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.dirname(HERE)
+for path in (os.path.join(REPO, "src"), REPO, HERE):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+# Per-task INFO logging would dominate the mutation timings.
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from generator import make_tasks, raw_inputs  # noqa: E402
+from parsers import task_parser  # noqa: E402
+from src.cli import interface  # noqa: E402
+
+# Parsing cost does not depend on the store, so cap the lines per size.
+PARSE_LINES = 20_000
+
+
+def timed(fn: Callable[[], object], ops: int = 1) -> Tuple[float, int]:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start, ops
+
+
+def run_size(n: int, args: argparse.Namespace) -> List[dict]:
+    """Run every case against a fresh store of ``n`` tasks."""
+    results: List[dict] = []
+    rng = random.Random(args.seed)
+
+    def record(name: str, seconds: float, ops: int) -> None:
+        results.append({
+            "name": name, "size": n, "ops": ops,
+            "seconds": seconds, "per_op": seconds / ops,
+        })
+        print(f"{n:>9} {name:<34} {seconds / ops * 1e3:12.4f} ms/op", flush=True)
+
+    lines = list(raw_inputs(min(n, PARSE_LINES), args.seed))
+    task_parser.configure_parse_cache(0)
+    try:
+        parse = task_parser.parse_task_input
+        record("parse_task_input", *timed(lambda: [parse(x) for x in lines], len(lines)))
+    finally:
+        task_parser.configure_parse_cache()
+
+    tasks = make_tasks(n, args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / f"tasks-{args.backend}"
+        storage = interface.make_storage(path, args.backend)
+        record("storage.save", *timed(lambda: storage.save(tasks)))
+        del tasks
+        record("storage.load", *timed(storage.load))
+
+        svc = interface.TaskService(interface.make_storage(path, args.backend))
+        record("service.load", *timed(lambda: svc.todo))
+
+        new_lines = list(raw_inputs(args.ops, args.seed + 1))
+        record("service.add", *timed(lambda: [svc.add(x) for x in new_lines], args.ops))
+        ids = rng.sample(range(1, n + 1), min(args.ops, n))
+        record(
+            "service.update",
+            *timed(lambda: [svc.update(i, "@ops #high") for i in ids], len(ids)),
+        )
+        record("service.delete", *timed(lambda: [svc.delete(i) for i in ids], len(ids)))
+
+        queries = {
+            "service.search": lambda: svc.search("invoice|deploy"),
+            "service.filter_by_tag": lambda: svc.filter_by_tag("ops"),
+            "service.filter_by_priority": lambda: svc.filter_by_priority("high"),
+            "service.filter_by_due": lambda: svc.filter_by_due("2025-0[1-3]"),
+            "service.filter_by_assignee": lambda: svc.filter_by_assignee("user7@example.com"),
+            "service.filter_by_due_range": lambda: svc.filter_by_due_range(
+                after=datetime(2025, 3, 1), before=datetime(2025, 4, 1)
+            ),
+            "service.find": lambda: svc.find("priority:high tag:~ops due<2025-06-01 !completed"),
+        }
+        for name, query in queries.items():
+            # The first call also builds the in-memory index it relies on.
+            record(f"{name}.first", *timed(query))
+            record(name, *timed(lambda: [query() for _ in range(args.repeat)], args.repeat))
+
+        parser = interface.make_parser()
+        commands = {
+            "cli.list": ["list", "--tag", "ops", "--priority", "high"],
+            "cli.search": ["search", "invoice"],
+        }
+        for name, argv in commands.items():
+            cmd = parser.parse_args(argv)
+            with contextlib.redirect_stdout(io.StringIO()):
+                elapsed, ops = timed(
+                    lambda: [interface.execute_command(cmd, svc) for _ in range(args.repeat)],
+                    args.repeat,
+                )
+            record(name, elapsed, ops)
+        svc.close()
+    return results
+
+
+def compare(
+    results: List[dict], baseline: List[dict], threshold: float, overrides: Dict[str, float]
+) -> List[str]:
+    """Print a comparison table and return the names of regressed cases."""
+    base = {(r["name"], r["size"]): r["per_op"] for r in baseline}
+    regressions = []
+    print(f"\n{'size':>9} {'case':<34} {'baseline':>10} {'current':>10} {'change':>8}")
+    for r in results:
+        old = base.get((r["name"], r["size"]))
+        if not old:
+            continue
+        limit = threshold
+        for pattern, value in overrides.items():
+            if fnmatch.fnmatchcase(r["name"], pattern):
+                limit = value
+        change = r["per_op"] / old - 1
+        flag = ""
+        if change > limit:
+            flag = "  REGRESSION"
+            regressions.append(f"{r['name']}@{r['size']}")
+        print(
+            f"{r['size']:>9} {r['name']:<34} {old * 1e3:9.3f}ms "
+            f"{r['per_op'] * 1e3:9.3f}ms {change:+7.0%}{flag}"
+        )
+    return regressions
+
+
+def parse_override(text: str) -> Tuple[str, float]:
+    pattern, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError("expected CASE_GLOB=FRACTION")
+    return pattern, float(value)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 100_000, 1_000_000])
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--ops", type=int, default=20, help="mutations timed per size")
+    ap.add_argument("--repeat", type=int, default=5, help="calls per query case")
+    ap.add_argument("--backend", default="json", choices=sorted(interface.STORAGE_BACKENDS))
+    ap.add_argument("--output", type=Path, help="write results as JSON")
+    ap.add_argument("--baseline", type=Path, help="results JSON to compare against")
+    ap.add_argument(
+        "--threshold", type=float, default=0.25,
+        help="allowed slowdown as a fraction of the baseline (default 0.25)",
+    )
+    ap.add_argument(
+        "--case-threshold", type=parse_override, action="append", default=[],
+        metavar="GLOB=FRACTION", help="per-case threshold, e.g. 'service.add*=1.0'",
+    )
+    args = ap.parse_args(argv)
+
+    results: List[dict] = []
+    for n in args.sizes:
+        results.extend(run_size(n, args))
+
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": args.backend,
+            "seed": args.seed,
+            "ops": args.ops,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nWrote {len(results)} results to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline, args.threshold, dict(args.case_threshold))
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+        print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
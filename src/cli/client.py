@@ -0,0 +1,70 @@
+"""Thin client forwarding CLI commands to a running ``todo serve`` daemon.
+
+Only the standard library is imported here, so forwarding a command costs
+neither the service imports nor parsing and loading the task store. The
+daemon parses the command itself and may decline it, in which case the
+caller runs it in-process as usual.
+"""
+
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+DEFAULT_DATA = Path("data/tasks.json")
+
+
+def socket_path(data_path: Path) -> Path:
+    """Unix socket a daemon serving ``data_path`` listens on."""
+    return data_path.with_name(data_path.name + ".sock")
+
+
+def data_arg(argv: List[str]) -> Path:
+    """The ``--data`` value in ``argv`` without building the full parser."""
+    for i, token in enumerate(argv):
+        if token == "--data" and i + 1 < len(argv):
+            return Path(argv[i + 1])
+        if token.startswith("--data="):
+            return Path(token[len("--data="):])
+    return DEFAULT_DATA
+
+
+def request(path: Path, message: dict, timeout: Optional[float] = None) -> dict:
+    """Send one JSON message to the daemon at ``path`` and return its reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.settimeout(timeout)
+        s.connect(str(path))
+        s.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        s.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = s.recv(1 << 16)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return json.loads(b"".join(chunks))
+
+
+def forward(argv: List[str]) -> Optional[int]:
+    """Run ``argv`` in the daemon serving its ``--data`` store.
+
+    Returns the command's exit status, or ``None`` when no daemon is
+    listening or it declined the command. Set ``TODO_NO_DAEMON=1`` to
+    always run in-process.
+    """
+    if os.environ.get("TODO_NO_DAEMON") or not hasattr(socket, "AF_UNIX"):
+        return None
+    path = socket_path(data_arg(argv))
+    if not path.exists():
+        return None
+    try:
+        reply = request(path, {"argv": argv, "cwd": os.getcwd()})
+    except (OSError, ValueError):
+        return None
+    if reply.get("fallback"):
+        return None
+    sys.stdout.write(reply.get("stdout", ""))
+    sys.stderr.write(reply.get("stderr", ""))
+    return reply.get("status", 0)
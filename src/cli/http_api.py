@@ -0,0 +1,371 @@
+"""``todo api``: a small asyncio JSON-over-HTTP API on top of `TaskService`.
+
+Routes (all bodies and responses are JSON)::
+
+    GET    /tasks                 {"tasks": [...], "next": cursor or null};
+                                  filters priority, tag, due, due_before,
+                                  due_after, assigned and q (query
+                                  language), paged by limit (default 100,
+                                  at most 1000), offset, sort and cursor
+    GET    /tasks/<id>            one task
+    GET    /search?pattern=RE     regex search, paged and returned like /tasks
+    GET    /stats                 task counts (see TaskService.stats)
+    POST   /tasks                 {"raw": "Buy milk @home"} -> 201 + task
+    PATCH  /tasks/<id>            {"raw": "#high"}
+    DELETE /tasks/<id>
+    POST   /tasks/<id>/complete   and /tasks/<id>/incomplete
+
+Mutations go through a single-writer actor: handlers put them on a queue
+and one coroutine hands them, in order, to a dedicated writer thread, so
+the loop keeps serving while a mutation runs. Reads never touch the live
+service. They are answered from a published copy of the task list, which
+nothing changes while it is published: after each mutation the writer
+thread brings a spare copy up to date with the tasks that changed, and
+the loop swaps the two. Reads therefore never see a half-applied change
+and never wait for, or trigger, a flush. The service runs in
+write-behind mode, so the flusher thread does the saving. Each response
+carries an ``X-Todo-Version`` header, the number of changes applied so far.
+"""
+
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from ..models.todo_list import TodoList
+from ..services.query import Query, cursor_for
+from ..services.task_service import TaskService
+
+MAX_BODY = 1 << 20
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+_REASONS = {
+    200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error",
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _task_id(text: str) -> int:
+    try:
+        return int(text)
+    except ValueError:
+        raise HttpError(404, f"no such task: {text}") from None
+
+
+def _date(params: Dict[str, str], name: str) -> Optional[datetime]:
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise HttpError(400, f"invalid {name}: {value!r}") from None
+
+
+def _count(params: Dict[str, str], name: str, default: int) -> int:
+    value = params.get(name)
+    if value is None:
+        return default
+    if not value.isdigit():
+        raise HttpError(400, f"invalid {name}: {value!r}")
+    return int(value)
+
+
+class TaskAPI:
+    """HTTP front-end serializing mutations through one writer thread.
+
+    Two copies of the task list are kept besides the service's own: the
+    published one readers use and a spare the writer thread updates,
+    so the API holds about three times the list in memory.
+    """
+
+    def __init__(self, svc: TaskService, queue_size: int = 1024):
+        self.svc = svc
+        self.version = 0
+        self.queue_size = queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._reader: Optional[TaskService] = None
+        self._spare: Optional[TodoList] = None
+        # Ids the spare copy is missing, and ids changed since the last
+        # mutation; None when every task may have changed.
+        self._behind: Optional[Set[int]] = set()
+        self._changed: Optional[Set[int]] = set()
+        self._changed_lock = threading.Lock()
+        self._writer_ident: Optional[int] = None
+        self._republishing = False
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+        """Copy the list, start the writer actor and listen; returns the `asyncio` server."""
+        self._loop = asyncio.get_running_loop()
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="task-api-writer")
+        self._queue = asyncio.Queue(self.queue_size)
+        self._writer_ident = await self._loop.run_in_executor(self._executor, threading.get_ident)
+        self.svc.add_listener(self._on_change)
+        published, self._spare = await self._loop.run_in_executor(
+            self._executor, lambda: (self.svc.copy_list(), self.svc.copy_list())
+        )
+        self._reader = TaskService.reading(published)
+        self._writer_task = asyncio.create_task(self._writer())
+        return await asyncio.start_server(self._serve_connection, host, port)
+
+    async def stop(self) -> None:
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+        if self._executor is not None:
+            self.svc.remove_listener(self._on_change)
+            self._executor.shutdown(wait=True)
+
+    def _on_change(self, task_id: Optional[int]) -> None:
+        """Service listener (any thread): note ``task_id`` for the next publish.
+
+        Changes the writer thread did not make, such as the flusher merging
+        another process's writes, are published through a no-op mutation.
+        """
+        with self._changed_lock:
+            if task_id is None:
+                self._changed = None
+            elif self._changed is not None:
+                self._changed.add(task_id)
+            if threading.get_ident() == self._writer_ident or self._republishing:
+                return
+            self._republishing = True
+        self._loop.call_soon_threadsafe(self._republish)
+
+    def _republish(self) -> None:
+        try:
+            self._queue.put_nowait((None, (), None))
+        except asyncio.QueueFull:
+            pass  # the queued mutations publish it anyway
+
+    async def _writer(self) -> None:
+        """The single writer: apply queued mutations one at a time, in order."""
+        loop = asyncio.get_running_loop()
+        while True:
+            fn, args, future = await self._queue.get()
+            try:
+                result = await loop.run_in_executor(self._executor, self._apply, fn, args)
+            except Exception as exc:
+                self._publish()
+                if future is not None and not future.cancelled():
+                    future.set_exception(exc)
+                continue
+            self._publish()
+            if result is not False:  # False: no such task, nothing changed
+                self.version += 1
+            if future is not None and not future.cancelled():
+                future.set_result(result)
+
+    def _apply(self, fn: Optional[Callable[..., Any]], args: Tuple) -> Any:
+        """Run ``fn(*args)`` on the writer thread, then bring the spare copy up to date."""
+        try:
+            return None if fn is None else fn(*args)
+        finally:
+            with self._changed_lock:
+                changed, self._changed = self._changed, set()
+                self._republishing = False
+            if changed is None or self._behind is None:
+                self._spare = self.svc.copy_list()
+            else:
+                spare = self._spare
+                for tid, task in self.svc.copy_tasks(self._behind | changed).items():
+                    if task is None:
+                        spare.delete_task(tid)
+                    elif not spare.replace_task(task):
+                        spare.add_task(task, tid)
+            # The copy about to be retired has yet to see this mutation.
+            self._behind = changed
+
+    def _publish(self) -> None:
+        """Swap the updated spare copy in for readers; runs on the loop."""
+        self._reader, self._spare = TaskService.reading(self._spare), self._reader.todo
+
+    async def mutate(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Queue ``fn(*args)`` for the writer and wait for its result."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((fn, args, future))
+        return await future
+
+    async def handle(self, method: str, target: str, body: bytes) -> Tuple[int, Any]:
+        """Route one request; mutations go to the service, reads to the published copy.
+
+        Returns (status, payload).
+        """
+        url = urlsplit(target)
+        parts = [p for p in url.path.split("/") if p]
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        svc, reader = self.svc, self._reader
+        if parts == ["tasks"]:
+            if method == "GET":
+                return 200, self._list(params)
+            if method == "POST":
+                task = await self.mutate(svc.add, self._raw(body))
+                return 201, task.to_dict()
+        elif len(parts) == 2 and parts[0] == "tasks":
+            tid = _task_id(parts[1])
+            if method == "GET":
+                task = reader.get(tid)
+                if task is None:
+                    raise HttpError(404, f"no such task: {tid}")
+                return 200, task.to_dict()
+            if method == "PATCH":
+                return self._ok(tid, await self.mutate(svc.update, tid, self._raw(body)))
+            if method == "DELETE":
+                return self._ok(tid, await self.mutate(svc.delete, tid))
+        elif len(parts) == 3 and parts[0] == "tasks" and parts[2] in ("complete", "incomplete"):
+            tid = _task_id(parts[1])
+            if method == "POST":
+                fn = svc.mark_complete if parts[2] == "complete" else svc.mark_incomplete
+                return self._ok(tid, await self.mutate(fn, tid))
+        elif parts == ["search"]:
+            if method == "GET":
+                try:
+                    query = Query.from_filters(search=params.get("pattern", ""))
+                except ValueError as exc:
+                    raise HttpError(400, str(exc)) from None
+                return 200, self._page(query, params)
+        elif parts == ["stats"]:
+            if method == "GET":
+                return 200, reader.stats(days=_count(params, "days", 7))
+        else:
+            raise HttpError(404, f"no route for {url.path}")
+        raise HttpError(405, f"{method} not allowed on {url.path}")
+
+    def _list(self, params: Dict[str, str]) -> Dict[str, Any]:
+        try:
+            query = Query.from_filters(
+                priority=params.get("priority"),
+                tag=params.get("tag"),
+                due=params.get("due"),
+                due_after=_date(params, "due_after"),
+                due_before=_date(params, "due_before"),
+                assigned=params.get("assigned"),
+            )
+            if params.get("q"):
+                query = query & Query.parse(params["q"])
+        except ValueError as exc:
+            raise HttpError(400, str(exc)) from None
+        return self._page(query, params)
+
+    def _page(self, query: Query, params: Dict[str, str]) -> Dict[str, Any]:
+        """One page of ``query``'s tasks and the cursor of the next, as `list --cursor` pages."""
+        limit = _count(params, "limit", DEFAULT_LIMIT)
+        if not 1 <= limit <= MAX_LIMIT:
+            raise HttpError(400, f"limit must be between 1 and {MAX_LIMIT}")
+        sort = params.get("sort")
+        try:
+            rows = list(self._reader.stream(
+                query, sort=sort, limit=limit + 1,
+                offset=_count(params, "offset", 0), cursor=params.get("cursor"),
+            ))
+        except ValueError as exc:
+            raise HttpError(400, str(exc)) from None
+        more = len(rows) > limit
+        del rows[limit:]
+        return {
+            "tasks": [t.to_dict() for t in rows],
+            "next": cursor_for(rows[-1], sort) if more else None,
+        }
+
+    @staticmethod
+    def _raw(body: bytes) -> str:
+        try:
+            raw = json.loads(body or b"{}").get("raw")
+        except (ValueError, AttributeError):
+            raise HttpError(400, 'expected a JSON object like {"raw": "..."}') from None
+        if not isinstance(raw, str):
+            raise HttpError(400, 'missing string field "raw"')
+        return raw
+
+    @staticmethod
+    def _ok(tid: int, ok: bool) -> Tuple[int, Any]:
+        if not ok:
+            raise HttpError(404, f"no such task: {tid}")
+        return 200, {"ok": True, "id": tid}
+
+    async def _serve_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer HTTP/1.1 requests on one connection, honouring keep-alive."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                try:
+                    method, target, version = line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = h.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+                keep_alive = (
+                    version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                )
+                if length > MAX_BODY:
+                    status, payload = 413, {"error": "request body too large"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    try:
+                        status, payload = await self.handle(method, target, body)
+                    except HttpError as exc:
+                        status, payload = exc.status, {"error": str(exc)}
+                    except Exception as exc:
+                        status, payload = 500, {"error": str(exc)}
+                data = json.dumps(payload).encode("utf-8")
+                head = (
+                    f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"X-Todo-Version: {self.version}\r\n"
+                )
+                if not keep_alive:
+                    head += "Connection: close\r\n"
+                writer.write(head.encode("latin-1") + b"\r\n" + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+def run_api(args, svc: TaskService, logger) -> None:
+    """Serve the API on ``args.host:args.port`` until interrupted."""
+    api = TaskAPI(svc)
+
+    async def main() -> None:
+        server = await api.start(args.host, args.port)
+        logger.info("Serving %s on http://%s:%s", args.data, args.host, args.port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await api.stop()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -1,9 +1,141 @@
 import argparse
+import json
+from datetime import datetime
 from pathlib import Path
 from ..services.task_service import TaskService
 from ..services.storage_service import StorageService
+from ..services.journal_storage import JournalStorageService
+from ..services.sqlite_storage import SqliteStorageService
+from ..services.snapshot_storage import SnapshotStorageService
+from ..services.sharded_storage import ShardedStorageService
+from ..services.query import Query, cursor_for
+from ..models.columns import HAVE_NUMPY
+from ..models.indexes import due_moment
 from ..utils.logger import get_logger, silence_third_party_warnings, set_log_level
+from ..utils.metrics import Metrics, load_metrics, save_metrics
 import shlex
+import sys
+
+
+STORAGE_BACKENDS = {
+    "json": StorageService,
+    "journal": JournalStorageService,
+    "sqlite": SqliteStorageService,
+    "snapshot": SnapshotStorageService,
+    "sharded": ShardedStorageService,
+}
+
+
+def make_storage(path: Path, backend: str = "json", compact: bool = False):
+    """Instantiate the storage backend registered under `backend`."""
+    return STORAGE_BACKENDS[backend](path, compact=compact)
+
+
+def perf_path(data_path: Path) -> Path:
+    """Sidecar file accumulating ``--profile`` metrics for a task store."""
+    return data_path.with_name(data_path.name + ".perf.json")
+
+
+def _add_stats_options(s_stats) -> None:
+    s_stats.add_argument(
+        "--perf", action="store_true", help="Show recorded --profile latency metrics"
+    )
+    s_stats.add_argument(
+        "--format", default="table", choices=["table", "json", "prometheus"],
+        help="Output format (prometheus needs --perf)",
+    )
+    s_stats.add_argument(
+        "--days", type=int, default=7, help="Days of created/completed history (default 7)"
+    )
+    s_stats.add_argument("--output", type=Path, help="Write --perf output to a file")
+    s_stats.add_argument(
+        "--reset", action="store_true", help="Discard recorded metrics after showing them"
+    )
+
+
+def _at_least(minimum: int):
+    """argparse type for integers no smaller than ``minimum``."""
+    def count(text: str) -> int:
+        value = int(text)
+        if value < minimum:
+            raise argparse.ArgumentTypeError(f"must be at least {minimum}")
+        return value
+
+    return count
+
+
+def _add_page_options(s) -> None:
+    s.add_argument(
+        "--sort", choices=["due", "priority", "created", "updated"],
+        help="Order results (default: id order)",
+    )
+    s.add_argument("--limit", type=_at_least(1), help="Print at most N tasks")
+    s.add_argument("--offset", type=_at_least(0), default=0, help="Skip the first N tasks")
+    s.add_argument("--cursor", type=str, help="Resume after a previous page's cursor")
+
+
+def _print_page(svc: TaskService, query, args: argparse.Namespace, fmt) -> None:
+    """Stream one page of ``query`` through ``fmt``; announce the next cursor.
+
+    One extra row is fetched to know whether another page follows.
+    """
+    sort, limit = getattr(args, "sort", None), getattr(args, "limit", None)
+    rows = svc.stream(
+        query, sort=sort, limit=None if limit is None else limit + 1,
+        offset=getattr(args, "offset", 0) or 0, cursor=getattr(args, "cursor", None),
+    )
+    last = None
+    for n, t in enumerate(rows):
+        if n == limit:
+            rows.close()
+            print(f"-- more: --cursor {cursor_for(last, sort)}")
+            break
+        print(fmt(t))
+        last = t
+
+
+def _add_next_options(s_next) -> None:
+    s_next.add_argument(
+        "--until", type=datetime.fromisoformat,
+        help="List every occurrence due before DATE, repeating tasks included",
+    )
+    s_next.add_argument(
+        "--since", type=datetime.fromisoformat, help="Start of the --until window (default: now)"
+    )
+
+
+def _every(t) -> str:
+    return f" every {t.recurrence}" if getattr(t, "recurrence", None) else ""
+
+
+def _add_query_options(s_ls) -> None:
+    s_ls.add_argument(
+        "--open", action="store_true", help="Only tasks that are not completed"
+    )
+    s_ls.add_argument(
+        "--query", "-q", type=str,
+        help="Filter expression, e.g. 'priority:high tag:~ops due<2026-11-01 !completed'",
+    )
+    s_ls.add_argument(
+        "--explain", action="store_true", help="Print the query plan instead of the tasks"
+    )
+
+
+def _add_bulk_options(s) -> None:
+    """Selection options turning a per-id command into a bulk one."""
+    s.add_argument("--tag", type=str, help="Every task with a tag matching PATTERN")
+    s.add_argument("--priority", type=str, help="Every task with this priority")
+    s.add_argument("--assigned", type=str, help="Every task assigned to EMAIL")
+    s.add_argument(
+        "--before", type=datetime.fromisoformat, help="Every task due strictly before DATE"
+    )
+    s.add_argument(
+        "--after", type=datetime.fromisoformat, help="Every task due strictly after DATE"
+    )
+    done = s.add_mutually_exclusive_group()
+    done.add_argument("--completed", action="store_true", help="Only completed tasks")
+    done.add_argument("--open", action="store_true", help="Only tasks not completed")
+    s.add_argument("--query", "-q", type=str, help="Every task matching a filter expression")
 
 
 def make_parser():
@@ -21,6 +153,34 @@ def make_parser():
         action="store_true",
         help="Start interactive mode (REPL)",
     )
+    p.add_argument(
+        "--backend",
+        default="json",
+        choices=sorted(STORAGE_BACKENDS),
+        help="Storage backend for the --data file",
+    )
+    p.add_argument(
+        "--compact",
+        action="store_true",
+        help="Hold tasks in the compact in-memory representation",
+    )
+    p.add_argument(
+        "--flush-interval",
+        type=int,
+        default=None,
+        metavar="MS",
+        help="Write changes behind in the background every MS milliseconds",
+    )
+    p.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record per-operation latency metrics (see 'stats --perf')",
+    )
+    p.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Filter with a NumPy column store (needs numpy)",
+    )
 
     # add
     s_add = sub.add_parser("add")
@@ -34,13 +194,15 @@ def make_parser():
 
     # delete
     s_del = sub.add_parser("delete")
-    s_del.add_argument("id", type=int, help="ID of task to delete")
+    s_del.add_argument("id", type=int, nargs="?", help="ID of task to delete")
+    _add_bulk_options(s_del)
     s_del.add_argument("--data", type=Path, default=Path("data/tasks.json"))
 
     # update
     s_up = sub.add_parser("update")
-    s_up.add_argument("id", type=int, help="ID of task to update")
+    s_up.add_argument("id", type=int, nargs="?", help="ID of task to update")
     s_up.add_argument("raw", type=str, help="Raw task input with new values")
+    _add_bulk_options(s_up)
     s_up.add_argument("--data", type=Path, default=Path("data/tasks.json"))
 
     # list
@@ -48,28 +210,100 @@ def make_parser():
     s_ls.add_argument("--priority", type=str, help="Filter by priority")
     s_ls.add_argument("--tag", type=str, help="Filter by tag pattern")
     s_ls.add_argument("--due", type=str, help="Filter by due-date regex")
+    s_ls.add_argument(
+        "--due-before", type=datetime.fromisoformat, help="Due strictly before DATE"
+    )
+    s_ls.add_argument(
+        "--due-after", type=datetime.fromisoformat, help="Due strictly after DATE"
+    )
+    s_ls.add_argument("--assigned", type=str, help="Filter by assignee email")
+    _add_query_options(s_ls)
+    _add_page_options(s_ls)
     s_ls.add_argument("--data", type=Path, default=Path("data/tasks.json"))
 
+    # next
+    s_next = sub.add_parser("next", help="The N soonest-due open tasks")
+    s_next.add_argument("n", type=int, nargs="?", default=10, help="How many (default 10)")
+    _add_next_options(s_next)
+    s_next.add_argument("--data", type=Path, default=Path("data/tasks.json"))
+
     # complete / incomplete
     s_c = sub.add_parser("complete")
-    s_c.add_argument("id", type=int)
+    s_c.add_argument("id", type=int, nargs="?")
+    _add_bulk_options(s_c)
     s_c.add_argument("--data", type=Path, default=Path("data/tasks.json"))
     s_ic = sub.add_parser("incomplete")
-    s_ic.add_argument("id", type=int)
+    s_ic.add_argument("id", type=int, nargs="?")
+    _add_bulk_options(s_ic)
     s_ic.add_argument("--data", type=Path, default=Path("data/tasks.json"))
 
     # search
     s_search = sub.add_parser("search")
     s_search.add_argument("pattern", type=str, help="Regex pattern")
+    s_search.add_argument(
+        "--stats", action="store_true", help="Print search index size and hit ratio"
+    )
+    _add_page_options(s_search)
     s_search.add_argument("--data", type=Path, default=Path("data/tasks.json"))
 
+    # import
+    s_imp = sub.add_parser("import", help="Add one task per line of FILE")
+    s_imp.add_argument(
+        "file", nargs="?", default="-", help="File of raw task lines ('-' for stdin)"
+    )
+    s_imp.add_argument("--workers", type=int, default=None, help="Parser processes")
+    s_imp.add_argument("--chunk-size", type=int, default=1000, help="Lines per chunk")
+    s_imp.add_argument("--data", type=Path, default=Path("data/tasks.json"))
+
+    # stats
+    s_stats = sub.add_parser("stats", help="Task counts and performance metrics")
+    _add_stats_options(s_stats)
+    s_stats.add_argument("--data", type=Path, default=Path("data/tasks.json"))
+
+    # serve
+    s_serve = sub.add_parser(
+        "serve", help="Keep the store loaded and answer commands over a Unix socket"
+    )
+    s_serve.add_argument("--data", type=Path, default=Path("data/tasks.json"))
+
+    # remind
+    s_rem = sub.add_parser("remind", help="Print a reminder as each open task falls due")
+    s_rem.add_argument(
+        "--lead", type=float, default=0, metavar="MINUTES", help="Remind this long before due"
+    )
+    s_rem.add_argument(
+        "--exec", metavar="CMD", help="Run CMD per reminder instead of printing (see README)"
+    )
+    s_rem.add_argument(
+        "--tick", type=float, default=1.0, metavar="SECONDS", help="Timer resolution"
+    )
+    s_rem.add_argument("--data", type=Path, default=Path("data/tasks.json"))
+
+    # api
+    s_api = sub.add_parser("api", help="Serve a JSON HTTP API on localhost")
+    s_api.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    s_api.add_argument("--port", type=int, default=8765, help="TCP port")
+    s_api.add_argument("--data", type=Path, default=Path("data/tasks.json"))
+
+    # migrate
+    s_mig = sub.add_parser("migrate", help="Copy a task store between backends")
+    s_mig.add_argument("source", type=Path, help="Existing store to read")
+    s_mig.add_argument("target", type=Path, help="Store to create or overwrite")
+    s_mig.add_argument(
+        "--from", dest="from_backend", default="json", choices=sorted(STORAGE_BACKENDS)
+    )
+    s_mig.add_argument(
+        "--to", dest="to_backend", default="sqlite", choices=sorted(STORAGE_BACKENDS)
+    )
+
     return p
 
 
 def make_commands_parser():
     """Create a parser for commands only (used by REPL).
 
-    Supports: add, update, delete, list, complete, incomplete, search, exit/quit.
+    Supports: add, update, delete, list, next, complete, incomplete, search,
+    stats, exit/quit.
     The REPL uses this to parse each input line without global options.
     """
     p = argparse.ArgumentParser(prog="todo", add_help=False)
@@ -79,24 +313,41 @@ def make_commands_parser():
     s_add.add_argument("raw", type=str)
 
     s_del = sub.add_parser("delete")
-    s_del.add_argument("id", type=int)
+    s_del.add_argument("id", type=int, nargs="?")
+    _add_bulk_options(s_del)
 
     s_up = sub.add_parser("update")
-    s_up.add_argument("id", type=int)
+    s_up.add_argument("id", type=int, nargs="?")
     s_up.add_argument("raw", type=str)
+    _add_bulk_options(s_up)
 
     s_ls = sub.add_parser("list")
     s_ls.add_argument("--priority", type=str)
     s_ls.add_argument("--tag", type=str)
     s_ls.add_argument("--due", type=str)
+    s_ls.add_argument("--due-before", type=datetime.fromisoformat)
+    s_ls.add_argument("--due-after", type=datetime.fromisoformat)
+    s_ls.add_argument("--assigned", type=str)
+    _add_query_options(s_ls)
+    _add_page_options(s_ls)
+
+    s_next = sub.add_parser("next")
+    s_next.add_argument("n", type=int, nargs="?", default=10)
+    _add_next_options(s_next)
 
     s_c = sub.add_parser("complete")
-    s_c.add_argument("id", type=int)
+    s_c.add_argument("id", type=int, nargs="?")
+    _add_bulk_options(s_c)
     s_ic = sub.add_parser("incomplete")
-    s_ic.add_argument("id", type=int)
+    s_ic.add_argument("id", type=int, nargs="?")
+    _add_bulk_options(s_ic)
 
     s_search = sub.add_parser("search")
     s_search.add_argument("pattern", type=str)
+    s_search.add_argument("--stats", action="store_true")
+    _add_page_options(s_search)
+
+    _add_stats_options(sub.add_parser("stats"))
 
     s_exit = sub.add_parser("exit")
     sub.add_parser("quit")
@@ -113,36 +364,179 @@ def execute_command(args: argparse.Namespace, svc: TaskService) -> None:
         case "add":
             t = svc.add(args.raw)
             print(f"Added task #{t.id}: {t.description}")
+        case "delete" if _bulk(args, svc, "delete", "Deleted"):
+            pass
         case "delete":
             ok = svc.delete(args.id)
             print("Deleted." if ok else "No such task.")
+        case "update" if _bulk(args, svc, TaskService.updater(args.raw), "Updated"):
+            pass
         case "update":
             ok = svc.update(args.id, args.raw)
             print("Updated." if ok else "No such task.")
         case "list":
-            tasks = svc.list_all()
-            if getattr(args, "priority", None):
-                tasks = svc.filter_by_priority(args.priority)
-            if getattr(args, "tag", None):
-                tasks = svc.filter_by_tag(args.tag)
-            if getattr(args, "due", None):
-                tasks = svc.filter_by_due(args.due)
-            for t in tasks:
-                status = "✓" if t.completed else " "
-                print(
-                    f"[{status}] {t.id}: {t.description} (tags: {t.tags}) "
-                    f"due: {t.due_date}"
+            try:
+                query = Query.from_filters(
+                    priority=getattr(args, "priority", None),
+                    tag=getattr(args, "tag", None),
+                    due=getattr(args, "due", None),
+                    due_after=getattr(args, "due_after", None),
+                    due_before=getattr(args, "due_before", None),
+                    assigned=getattr(args, "assigned", None),
+                    completed=False if getattr(args, "open", False) else None,
                 )
+                if getattr(args, "query", None):
+                    query = query & Query.parse(args.query)
+                if getattr(args, "explain", False):
+                    print(svc.explain(query))
+                    return
+                _print_page(svc, query, args, lambda t: (
+                    f"[{'✓' if t.completed else ' '}] {t.id}: {t.description} "
+                    f"(tags: {t.tags}) due: {t.due_date}{_every(t)}"
+                ))
+            except ValueError as exc:
+                print(f"Invalid query: {exc}")
+        case "next":
+            until = getattr(args, "until", None)
+            if until is None:
+                for t in svc.next_due(args.n):
+                    print(
+                        f"{t.id}: {t.description} (tags: {t.tags}) "
+                        f"due: {due_moment(t)}{_every(t)}"
+                    )
+            else:
+                for when, t in svc.upcoming(until, getattr(args, "since", None), args.n):
+                    print(f"{when}  {t.id}: {t.description} (tags: {t.tags}){_every(t)}")
+        case "complete" if _bulk(args, svc, "complete", "Completed"):
+            pass
         case "complete":
             ok = svc.mark_complete(args.id)
-            print("Marked complete." if ok else "No such task.")
+            t = svc.get(args.id) if ok else None
+            if t is not None and t.recurrence and not t.completed:
+                print(f"Marked complete; next occurrence due {due_moment(t)}.")
+            else:
+                print("Marked complete." if ok else "No such task.")
+        case "incomplete" if _bulk(args, svc, "incomplete", "Reopened"):
+            pass
         case "incomplete":
             ok = svc.mark_incomplete(args.id)
             print("Marked incomplete." if ok else "No such task.")
+        case "import":
+            import time
+            start = time.perf_counter()
+            if args.file == "-":
+                added = svc.add_many(sys.stdin, args.workers, args.chunk_size)
+            else:
+                with open(args.file, "r", encoding="utf-8") as f:
+                    added = svc.add_many(f, args.workers, args.chunk_size)
+            elapsed = time.perf_counter() - start
+            rate = len(added) / elapsed if elapsed > 0 else float("inf")
+            print(f"Imported {len(added)} tasks in {elapsed:.2f}s ({rate:,.0f} lines/sec)")
         case "search":
-            results = svc.search(args.pattern)
-            for t in results:
-                print(f"{t.id}: {t.description} (tags: {t.tags})")
+            try:
+                _print_page(
+                    svc, Query.from_filters(search=args.pattern), args,
+                    lambda t: f"{t.id}: {t.description} (tags: {t.tags})",
+                )
+            except ValueError as exc:
+                print(f"Invalid search: {exc}")
+            if getattr(args, "stats", False) and svc._query() is None:
+                st = svc.search_stats()
+                print(
+                    f"index: {st['documents']} tasks, {st['trigrams']} trigrams, "
+                    f"{st['postings']} postings; hit ratio {st['hit_ratio']:.0%}, "
+                    f"{st['candidates']} candidates -> {st['matches']} matches"
+                )
+        case "stats":
+            if getattr(args, "perf", False):
+                show_perf(args, svc)
+            else:
+                show_stats(args, svc)
+
+
+def _bulk(args: argparse.Namespace, svc: TaskService, mutation, verb: str) -> bool:
+    """Run the bulk form of a per-id command if selection options were given.
+
+    Returns False, doing nothing, when the command names one task by id.
+    """
+    if getattr(args, "id", None) is not None:
+        return False
+    try:
+        query = Query.from_filters(
+            priority=getattr(args, "priority", None),
+            tag=getattr(args, "tag", None),
+            due_after=getattr(args, "after", None),
+            due_before=getattr(args, "before", None),
+            assigned=getattr(args, "assigned", None),
+            completed=True if getattr(args, "completed", False)
+            else False if getattr(args, "open", False) else None,
+        )
+        if getattr(args, "query", None):
+            query = query & Query.parse(args.query)
+    except ValueError as exc:
+        print(f"Invalid query: {exc}")
+        return True
+    if not query:
+        print("Give a task id or selection options such as --tag or --query.")
+        return True
+    import time
+    start = time.perf_counter()
+    ids = svc.apply_bulk(query, mutation)
+    elapsed = time.perf_counter() - start
+    print(f"{verb} {len(ids)} tasks in {elapsed * 1000:.1f} ms.")
+    return True
+
+
+def show_stats(args: argparse.Namespace, svc: TaskService) -> None:
+    """Print the task counters of `TaskService.stats`."""
+    st = svc.stats(days=getattr(args, "days", 7))
+    if getattr(args, "format", "table") == "json":
+        print(json.dumps(st, indent=2))
+        return
+    print(f"{st['tasks']} tasks: {st['completed']} completed, {st['open']} open")
+    print(f"{st['overdue']} overdue, {st['due_this_week']} due this week")
+    for title, rows in (
+        ("priority", st["priority"]), ("tag", st["tags"]), ("assignee", st["assignees"])
+    ):
+        if not rows:
+            continue
+        width = max(len(title), *(len(name) for name in rows))
+        print(f"\n{title:<{width}}  {'open':>6}  {'done':>6}")
+        for name, row in sorted(rows.items(), key=lambda kv: -sum(kv[1].values())):
+            print(f"{name:<{width}}  {row['open']:>6}  {row['completed']:>6}")
+    print(f"\n{'day':<10}  {'created':>7}  {'completed':>9}")
+    for day, created in st["created_per_day"].items():
+        print(f"{day:<10}  {created:>7}  {st['completed_per_day'][day]:>9}")
+
+
+def show_perf(args: argparse.Namespace, svc: TaskService) -> None:
+    """Print or export the recorded metrics of this store and this session."""
+    path = perf_path(svc.storage.filepath)
+    metrics = load_metrics(path)
+    if svc.metrics is not None:
+        metrics.merge(svc.metrics)
+    if args.format == "json":
+        text = metrics.to_json() + "\n"
+    elif args.format == "prometheus":
+        text = metrics.to_prometheus()
+    else:
+        text = metrics.to_table() + "\n"
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+        print(f"Wrote {args.format} metrics to {args.output}")
+    else:
+        print(text, end="")
+    if args.reset:
+        path.unlink(missing_ok=True)
+        if svc.metrics is not None:
+            svc.metrics = Metrics()
+
+
+def run_migrate(args: argparse.Namespace) -> None:
+    """Load every task from one backend and save it into another."""
+    tasks = make_storage(args.source, args.from_backend).load()
+    make_storage(args.target, args.to_backend).save(tasks)
+    print(f"Migrated {len(tasks)} tasks from {args.source} to {args.target}.")
 
 
 def run_repl(svc: TaskService, logger) -> None:
@@ -163,8 +557,14 @@ def run_repl(svc: TaskService, logger) -> None:
         if line.lower() in {"exit", "quit"}:
             break
         if line.lower() in {"help", "?"}:
-            print("Commands: add, update, delete, list [--priority P --tag REGEX --due PATTERN],")
-            print("          complete ID, incomplete ID, search PATTERN, exit")
+            print("Commands: add, update, delete, list [--priority P --tag REGEX --due PATTERN")
+            print("          --due-before DATE --due-after DATE --assigned EMAIL")
+            print("          --query EXPR --explain --sort KEY --limit N --cursor C],")
+            print("          next [N], complete ID, incomplete ID, search PATTERN,")
+            print("          complete/incomplete/delete/update with --tag, --priority,")
+            print("          --assigned, --before, --after, --completed/--open or --query")
+            print("          instead of an ID act on every matching task,")
+            print("          stats [--perf --format table|json|prometheus --output FILE], exit")
             continue
         try:
             tokens = shlex.split(line)
@@ -190,16 +590,58 @@ def main():
     logger = get_logger("todo.cli")
     logger.info("Starting CLI with log level %s", args.log_level)
 
-    # Allow per-command override of storage path
-    data_path = getattr(args, "data", Path("data/tasks.json"))
-    storage = StorageService(data_path)
-    svc = TaskService(storage)
-    # Interactive mode if requested or if no subcommand provided
-    if getattr(args, "interactive", False) or not getattr(args, "cmd", None):
-        run_repl(svc, logger)
+    if getattr(args, "cmd", None) == "migrate":
+        run_migrate(args)
         return
 
-    execute_command(args, svc)
+    # Allow per-command override of storage path
+    data_path = getattr(args, "data", Path("data/tasks.json"))
+    storage = make_storage(
+        data_path, getattr(args, "backend", "json"), getattr(args, "compact", False)
+    )
+    flush_ms = getattr(args, "flush_interval", None)
+    if args.cmd in ("serve", "api") and flush_ms is None:
+        # Servers write behind so mutations do not rewrite the store each time.
+        flush_ms = 1000
+    metrics = Metrics() if getattr(args, "profile", False) else None
+    if getattr(args, "columnar", False) and not HAVE_NUMPY:
+        parser.error("--columnar needs numpy (pip install numpy)")
+    if args.cmd == "remind" and not hasattr(storage, "version"):
+        parser.error(
+            f"remind cannot follow changes to a --backend {getattr(args, 'backend', 'json')} store"
+        )
+    svc = TaskService(
+        storage,
+        flush_interval=flush_ms / 1000 if flush_ms is not None else None,
+        metrics=metrics,
+        columnar=getattr(args, "columnar", False),
+    )
+    # close() flushes write-behind changes on exit, EOF and Ctrl-C alike
+    try:
+        # Interactive mode if requested or if no subcommand provided
+        if getattr(args, "interactive", False) or not getattr(args, "cmd", None):
+            run_repl(svc, logger)
+            return
+        if args.cmd == "serve":
+            from .server import run_server
+            run_server(args, svc, logger)
+            return
+        if args.cmd == "api":
+            from .http_api import run_api
+            run_api(args, svc, logger)
+            return
+        if args.cmd == "remind":
+            from .remind import run_reminders
+            run_reminders(args, svc, logger)
+            return
+
+        execute_command(args, svc)
+    finally:
+        svc.close()
+        if svc.metrics is not None:
+            save_metrics(perf_path(Path(data_path)), svc.metrics)
+            if svc.metrics.histograms:
+                print(svc.metrics.to_table(), file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,33 @@
+"""``todo remind``: print or hand off reminders for due tasks until stopped."""
+
+import argparse
+import signal
+import threading
+from datetime import timedelta
+from pathlib import Path
+
+from ..services.reminders import HookNotifier, ReminderScheduler, print_notifier
+from ..services.task_service import TaskService
+
+
+def run_reminders(args: argparse.Namespace, svc: TaskService, logger) -> None:
+    """Watch ``args.data`` until interrupted; the caller closes ``svc``."""
+    data_path = Path(args.data)
+    notify = HookNotifier(args.exec) if args.exec else print_notifier
+    scheduler = ReminderScheduler(svc, notify, timedelta(minutes=args.lead), args.tick)
+    count = scheduler.sync()
+    print(f"Watching {data_path}: {count} reminders scheduled. Ctrl-C to stop.", flush=True)
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    previous = signal.signal(signal.SIGTERM, stop)
+    logger.info("Reminding from %s (%s scheduled)", data_path, count)
+    try:
+        scheduler.run(threading.Event())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+        scheduler.close()
+        logger.info("Stopped reminding from %s", data_path)
@@ -0,0 +1,141 @@
+"""``todo serve``: keep one `TaskService` resident behind a Unix socket.
+
+Each connection carries one JSON request ``{"argv": [...], "cwd": ...}``
+sent by `client.forward`; the reply holds the command's captured stdout,
+stderr and exit status, or ``{"fallback": true}`` for commands that must
+run in the client process (the REPL, ``serve``, ``migrate``, importing
+from stdin, another store, or global options other than the daemon's).
+
+Before each command the daemon picks up writes other processes made to
+the store (`TaskService.refresh`), so it never answers from a stale list.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import signal
+import socketserver
+import sys
+import threading
+from pathlib import Path
+from typing import Optional
+
+from ..services.task_service import TaskService
+from .client import request, socket_path
+from .interface import execute_command, make_parser
+
+FORWARDED = {
+    "add", "delete", "update", "list", "next", "complete", "incomplete", "search", "stats",
+    "import",
+}
+# Global options that change how the service runs; a command giving other
+# values than the daemon was started with runs in the client instead.
+SERVICE_OPTIONS = ("backend", "compact", "columnar", "profile", "flush_interval")
+
+
+class _CommandHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        try:
+            message = json.loads(self.rfile.readline())
+            reply = self.server.run(message["argv"], message.get("cwd"))
+        except (ValueError, KeyError, TypeError) as exc:
+            reply = {"stdout": "", "stderr": f"Bad request: {exc}\n", "status": 2}
+        self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+
+class CommandServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Runs forwarded CLI commands against ``svc`` one at a time.
+
+    Commands are serialized because their output is captured by swapping
+    ``sys.stdout``; each one is an in-memory operation, so this costs
+    little next to the process start-up it saves.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        path: Path,
+        svc: TaskService,
+        data_path: Path,
+        options: Optional[argparse.Namespace] = None,
+    ):
+        self.svc = svc
+        self.data_path = data_path.resolve()
+        self.parser = make_parser()
+        # The daemon's own `SERVICE_OPTIONS` (the defaults if not given).
+        options = options or self.parser.parse_args([])
+        self.options = {name: getattr(options, name, None) for name in SERVICE_OPTIONS}
+        self._run_lock = threading.Lock()
+        super().__init__(str(path), _CommandHandler)
+
+    def _prepare(self, args: argparse.Namespace, cwd: Optional[str]) -> bool:
+        """Resolve client-relative paths; False if the client should run ``args``."""
+        base = Path(cwd) if cwd else Path.cwd()
+        if args.cmd not in FORWARDED or args.interactive:
+            return False
+        if (base / args.data).resolve() != self.data_path:
+            return False
+        if any(getattr(args, name) != value for name, value in self.options.items()):
+            return False
+        if args.cmd == "import":
+            if args.file == "-":
+                return False
+            args.file = str(base / args.file)
+        if getattr(args, "output", None):
+            args.output = base / args.output
+        return True
+
+    def run(self, argv: list, cwd: Optional[str] = None) -> dict:
+        out, err = io.StringIO(), io.StringIO()
+        with self._run_lock, contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            try:
+                args = self.parser.parse_args(argv)
+                if not self._prepare(args, cwd):
+                    return {"fallback": True}
+                # Merge or reload what other processes wrote; ids of new
+                # tasks are reserved in the store, so the id `add` prints
+                # is the one it is written under.
+                self.svc.refresh()
+                execute_command(args, self.svc)
+                status = 0
+            except SystemExit as exc:
+                # argparse errors and --help
+                status = exc.code if isinstance(exc.code, int) else int(exc.code is not None)
+            except Exception as exc:
+                print(f"Error: {exc}", file=sys.stderr)
+                status = 1
+        return {"stdout": out.getvalue(), "stderr": err.getvalue(), "status": status}
+
+
+def run_server(args: argparse.Namespace, svc: TaskService, logger) -> None:
+    """Serve ``args.data`` until interrupted; the caller closes ``svc``."""
+    data_path = Path(args.data)
+    path = socket_path(data_path)
+    if path.exists():
+        try:
+            request(path, {"argv": ["--help"]}, timeout=1)
+        except OSError:
+            path.unlink()  # left behind by a daemon that did not shut down
+        else:
+            print(f"A daemon is already serving {data_path} on {path}.")
+            return
+    if getattr(svc.storage, "query", None) is None:
+        svc.todo  # load now so the first command is fast
+    server = CommandServer(path, svc, data_path, args)
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    previous = signal.signal(signal.SIGTERM, stop)
+    logger.info("Serving %s on %s", data_path, path)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+        server.server_close()
+        path.unlink(missing_ok=True)
+        logger.info("Stopped serving %s", data_path)
@@ -1,4 +1,16 @@
-from .cli.interface import main
+import sys
+
+from .cli.client import forward
+
+
+def main() -> None:
+    """Forward to a running ``todo serve`` daemon if any, else run in-process."""
+    status = forward(sys.argv[1:])
+    if status is not None:
+        sys.exit(status)
+    from .cli.interface import main as run_cli
+    run_cli()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,242 @@
+"""Columnar mirror of a `TodoList` for vectorized filtering (needs NumPy).
+
+`ColumnIndex` follows the index protocol of `models.indexes`, so `TodoList`
+keeps it in sync on every add, update and delete like any other index.
+Each task occupies one row of parallel arrays:
+
+- ``id`` (int64), ``completed`` (bool),
+- ``priority`` and ``assignee`` as int32 codes into small dictionaries
+  (-1 for none; priorities are pre-seeded high, medium, low),
+- ``due``, ``time``, ``created`` and ``updated`` as ``datetime64[us]``
+  (NaT for none),
+- one bool membership column per distinct tag.
+
+Filters combine into a single boolean mask over all rows, evaluated by
+NumPy instead of a Python predicate per task. Rows freed by deletes are
+reused by later inserts; ``alive`` marks the rows in use.
+"""
+
+from datetime import datetime
+from importlib.util import find_spec
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+from .indexes import PRIORITY_RANK
+from .task import Task
+
+# NumPy is optional and only imported once a `ColumnIndex` is built, so
+# commands that never use it do not pay for the import at startup.
+HAVE_NUMPY = find_spec("numpy") is not None
+np = None
+
+_DATES = ("due", "time", "created", "updated")
+_NONE = -1
+
+
+def _datetimes(values: Iterable[Optional[datetime]]):
+    # None becomes NaT; aware datetimes are not used by this app.
+    return np.array(list(values), dtype="datetime64[us]")
+
+
+class _Codes:
+    """Dictionary encoding of strings as small ints (None -> -1)."""
+
+    def __init__(self, seed: Iterable[str] = ()):
+        self.codes: Dict[str, int] = {}
+        for value in seed:
+            self.encode(value)
+
+    def encode(self, value: Optional[str]) -> int:
+        if value is None:
+            return _NONE
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.codes)
+        return code
+
+    def lookup(self, value: Optional[str]) -> Optional[int]:
+        """Code of ``value`` without adding it; None if it never occurred."""
+        return _NONE if value is None else self.codes.get(value)
+
+
+class ColumnIndex:
+    """Parallel NumPy arrays, one row per task, plus tag bitmaps."""
+
+    def __init__(self, capacity: int = 1024):
+        global np
+        if np is None:
+            if not HAVE_NUMPY:
+                raise RuntimeError("the columnar store needs NumPy: pip install numpy")
+            import numpy as np
+        self._priorities = _Codes(PRIORITY_RANK)
+        self._assignees = _Codes()
+        self._rows: Dict[int, int] = {}
+        self._free: List[int] = []
+        self._size = 0  # rows ever handed out; [0, _size) are valid
+        self._allocate(capacity)
+        self.tags: Dict[str, "np.ndarray"] = {}
+
+    def _allocate(self, capacity: int) -> None:
+        self.id = np.zeros(capacity, dtype=np.int64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.completed = np.zeros(capacity, dtype=bool)
+        self.priority = np.full(capacity, _NONE, dtype=np.int32)
+        self.assignee = np.full(capacity, _NONE, dtype=np.int32)
+        for name in _DATES:
+            setattr(self, name, np.full(capacity, np.datetime64("NaT"), dtype="datetime64[us]"))
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self.id)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        old = {name: getattr(self, name) for name in self._columns()}
+        tags = self.tags
+        self._allocate(capacity)
+        for name, column in old.items():
+            getattr(self, name)[: len(column)] = column
+        self.tags = {}
+        for tag, bits in tags.items():
+            self.tags[tag] = grown = np.zeros(capacity, dtype=bool)
+            grown[: len(bits)] = bits
+
+    @staticmethod
+    def _columns() -> Tuple[str, ...]:
+        return ("id", "alive", "completed", "priority", "assignee") + _DATES
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def keys(self, task: Task) -> Tuple[Hashable, ...]:
+        return (
+            task.completed, task.priority, task.assigned_to,
+            task.due_date, task.time, task.created_at, task.updated_at,
+            tuple(task.tags),
+        )
+
+    def insert(self, task_id: int, keys: Tuple[Hashable, ...]) -> None:
+        if self._free:
+            row = self._free.pop()
+        else:
+            row = self._size
+            self._grow(row + 1)
+            self._size += 1
+        self._rows[task_id] = row
+        completed, priority, assignee, *dates, tags = keys
+        self.id[row] = task_id
+        self.alive[row] = True
+        self.completed[row] = completed
+        self.priority[row] = self._priorities.encode(priority)
+        self.assignee[row] = self._assignees.encode(assignee)
+        for name, value in zip(_DATES, dates):
+            getattr(self, name)[row] = np.datetime64("NaT") if value is None else value
+        for tag in tags:
+            bits = self.tags.get(tag)
+            if bits is None:
+                bits = self.tags[tag] = np.zeros(len(self.id), dtype=bool)
+            bits[row] = True
+
+    def discard(self, task_id: int, keys: Tuple[Hashable, ...]) -> None:
+        row = self._rows.pop(task_id, None)
+        if row is None:
+            return
+        self.alive[row] = False
+        for tag in keys[-1]:
+            bits = self.tags.get(tag)
+            if bits is not None:
+                bits[row] = False
+        self._free.append(row)
+
+    def build(self, items: Iterable[Tuple[int, Tuple[Hashable, ...]]]) -> None:
+        """Fill an empty index column by column instead of row by row."""
+        items = list(items)
+        n = len(items)
+        self._allocate(max(n, 1024))
+        self._size = n
+        self._rows = {tid: row for row, (tid, _) in enumerate(items)}
+        self._free = []
+        if not n:
+            return
+        ids, keys = zip(*items)
+        completed, priority, assignee, *dates, tags = zip(*keys)
+        self.id[:n] = ids
+        self.alive[:n] = True
+        self.completed[:n] = completed
+        self.priority[:n] = [self._priorities.encode(p) for p in priority]
+        self.assignee[:n] = [self._assignees.encode(a) for a in assignee]
+        for name, values in zip(_DATES, dates):
+            getattr(self, name)[:n] = _datetimes(values)
+        rows_by_tag: Dict[str, List[int]] = {}
+        for row, names in enumerate(tags):
+            for tag in names:
+                rows_by_tag.setdefault(tag, []).append(row)
+        capacity = len(self.id)
+        self.tags = {}
+        for tag, rows in rows_by_tag.items():
+            self.tags[tag] = bits = np.zeros(capacity, dtype=bool)
+            bits[rows] = True
+
+    def all(self) -> "np.ndarray":
+        """Mask of the rows holding a task."""
+        return self.alive.copy()
+
+    def with_priority(self, value: Optional[str]) -> "np.ndarray":
+        code = self._priorities.lookup(value)
+        if code is None:
+            return np.zeros(len(self.id), dtype=bool)
+        return self.priority == code
+
+    def assigned_to(self, email: Optional[str]) -> "np.ndarray":
+        code = self._assignees.lookup(email)
+        if code is None:
+            return np.zeros(len(self.id), dtype=bool)
+        return self.assignee == code
+
+    def with_tag(self, test) -> "np.ndarray":
+        """Rows having a tag for which ``test(tag)`` is truthy.
+
+        ``test`` runs once per distinct tag, not per task.
+        """
+        mask = np.zeros(len(self.id), dtype=bool)
+        for tag, bits in self.tags.items():
+            if test(tag):
+                mask |= bits
+        return mask
+
+    def between(
+        self, column: str, after: Optional[datetime] = None, before: Optional[datetime] = None
+    ) -> "np.ndarray":
+        """Rows whose ``column`` is set and strictly between the bounds."""
+        values = getattr(self, column)
+        mask = ~np.isnat(values)
+        if after is not None:
+            mask &= values > np.datetime64(after, "us")
+        if before is not None:
+            mask &= values < np.datetime64(before, "us")
+        return mask
+
+    def ids(self, mask: "np.ndarray") -> "np.ndarray":
+        """Ids of the live rows selected by ``mask``, ascending."""
+        return np.sort(self.id[mask & self.alive])
+
+    def select(
+        self,
+        priority: Optional[str] = None,
+        completed: Optional[bool] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        tag: Optional[str] = None,
+        assigned_to: Optional[str] = None,
+    ) -> "np.ndarray":
+        """Ids matching every given filter (``tag`` is an exact name)."""
+        mask = self.all()
+        if priority is not None:
+            mask &= self.with_priority(priority)
+        if completed is not None:
+            mask &= self.completed == completed
+        if due_after is not None or due_before is not None:
+            mask &= self.between("due", due_after, due_before)
+        if tag is not None:
+            mask &= self.tags.get(tag, False)
+        if assigned_to is not None:
+            mask &= self.assigned_to(assigned_to)
+        return self.ids(mask)
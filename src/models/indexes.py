@@ -0,0 +1,351 @@
+"""Secondary indexes maintained by `TodoList`.
+
+Every index follows the same small protocol so `TodoList` can keep it in
+sync without knowing what it indexes:
+
+- ``keys(task)`` returns a hashable snapshot of the indexed fields,
+- ``insert(task_id, keys)`` / ``discard(task_id, keys)`` add or remove it,
+- optionally ``build(pairs)`` fills an empty index in one go.
+
+Because ``update_task`` applies an arbitrary function, `TodoList` snapshots
+``keys`` before the update and re-indexes only when the snapshot changed.
+"""
+
+from bisect import bisect_left, insort
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import (
+    Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+)
+from .task import Task, _to_epoch
+from .text_index import TrigramIndex
+
+PRIORITY_RANK = {"high": 0, "medium": 1, "low": 2}
+
+
+def due_moment(task: Task) -> Optional[datetime]:
+    """When ``task`` is due: its ``time`` (date plus clock) or ``due_date``."""
+    return task.time or task.due_date
+
+
+def _due_key(task: Task) -> Tuple:
+    when = due_moment(task)
+    return (when is None, _to_epoch(when), task.id)
+
+
+# Orders tasks can be listed in. Keys are tuples of JSON-friendly values
+# ending in the id, so they are unique and can travel in a cursor; tasks
+# without a date sort last.
+SORT_KEYS: Dict[str, Callable[[Task], Tuple]] = {
+    "id": lambda t: (t.id,),
+    "due": _due_key,
+    "priority": lambda t: (PRIORITY_RANK.get(t.priority, len(PRIORITY_RANK)),) + _due_key(t),
+    "created": lambda t: (_to_epoch(t.created_at), t.id),
+    "updated": lambda t: (_to_epoch(t.updated_at), t.id),
+}
+
+
+class BucketIndex:
+    """Map each key produced by ``key_fn`` to the set of task ids having it."""
+
+    def __init__(self, key_fn: Callable[[Task], Iterable[Hashable]]):
+        self.key_fn = key_fn
+        self.buckets: Dict[Hashable, Set[int]] = {}
+
+    def keys(self, task: Task) -> Tuple[Hashable, ...]:
+        return tuple(dict.fromkeys(self.key_fn(task)))
+
+    def insert(self, task_id: int, keys: Tuple[Hashable, ...]) -> None:
+        for key in keys:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                self.buckets[key] = {task_id}
+            else:
+                bucket.add(task_id)
+
+    def discard(self, task_id: int, keys: Tuple[Hashable, ...]) -> None:
+        for key in keys:
+            bucket = self.buckets.get(key)
+            if bucket is not None:
+                bucket.discard(task_id)
+                if not bucket:
+                    del self.buckets[key]
+
+    def lookup(self, key: Hashable) -> Set[int]:
+        return self.buckets.get(key, set())
+
+
+class TagIndex(BucketIndex):
+    """Inverted index from tag to ids with case-insensitive name lookup."""
+
+    def __init__(self):
+        super().__init__(lambda t: t.tags)
+        self._folded: Dict[str, Set[str]] = {}
+
+    def insert(self, task_id: int, keys: Tuple[Hashable, ...]) -> None:
+        for key in keys:
+            if key not in self.buckets:
+                self._folded.setdefault(key.lower(), set()).add(key)
+        super().insert(task_id, keys)
+
+    def discard(self, task_id: int, keys: Tuple[Hashable, ...]) -> None:
+        super().discard(task_id, keys)
+        for key in keys:
+            if key not in self.buckets:
+                variants = self._folded.get(key.lower())
+                if variants is not None:
+                    variants.discard(key)
+                    if not variants:
+                        del self._folded[key.lower()]
+
+    def lookup_ignorecase(self, name: str) -> Set[int]:
+        """Ids of tasks with a tag equal to ``name`` ignoring case."""
+        ids: Set[int] = set()
+        for key in self._folded.get(name.lower(), ()):
+            ids |= self.buckets[key]
+        return ids
+
+    def tags(self) -> Iterator[str]:
+        """Distinct tag names currently indexed."""
+        return iter(self.buckets)
+
+
+class SortedIndex:
+    """Ordered ``(value, id)`` pairs supporting range queries via bisect.
+
+    Values are due dates for the ``due`` index and `SORT_KEYS` tuples for
+    the ``sort:*`` and ``next`` indexes; tasks whose value is None are left
+    out.
+    """
+
+    def __init__(self, key_fn: Callable[[Task], Optional[Hashable]]):
+        self.key_fn = key_fn
+        self.entries: List[Tuple[datetime, int]] = []
+
+    def keys(self, task: Task) -> Tuple[datetime, ...]:
+        value = self.key_fn(task)
+        return () if value is None else (value,)
+
+    def insert(self, task_id: int, keys: Tuple[datetime, ...]) -> None:
+        for value in keys:
+            insort(self.entries, (value, task_id))
+
+    def build(self, items: Iterable[Tuple[int, Tuple[Hashable, ...]]]) -> None:
+        """Bulk `insert` of ``(task_id, keys)`` pairs with one sort."""
+        self.entries = sorted((value, tid) for tid, keys in items for value in keys)
+
+    def discard(self, task_id: int, keys: Tuple[datetime, ...]) -> None:
+        for value in keys:
+            i = bisect_left(self.entries, (value, task_id))
+            if i < len(self.entries) and self.entries[i] == (value, task_id):
+                del self.entries[i]
+
+    def _bounds(
+        self, start: Optional[datetime], end: Optional[datetime]
+    ) -> Tuple[int, int]:
+        lo = 0
+        if start is not None:
+            # (start, inf) sorts after every (start, id) pair
+            lo = bisect_left(self.entries, (start, float("inf")))
+        hi = len(self.entries)
+        if end is not None:
+            hi = bisect_left(self.entries, (end, float("-inf")))
+        return lo, hi
+
+    def range(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> List[int]:
+        """Ids with ``start < value < end``; either bound may be omitted."""
+        lo, hi = self._bounds(start, end)
+        return [tid for _, tid in self.entries[lo:hi]]
+
+    def count(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> int:
+        """``len(self.range(start, end))`` in O(log n)."""
+        lo, hi = self._bounds(start, end)
+        return max(hi - lo, 0)
+
+    def iter_ids(self, after: Optional[Hashable] = None) -> Iterator[int]:
+        """Ids in value order, starting strictly after value ``after``."""
+        entries = self.entries
+        return (entries[i][1] for i in range(self._bounds(after, None)[0], len(entries)))
+
+    def distinct_values(self) -> Iterator[datetime]:
+        last = None
+        for value, _ in self.entries:
+            if value != last:
+                yield value
+                last = value
+
+    def ids_with(self, value: datetime) -> List[int]:
+        i = bisect_left(self.entries, (value, float("-inf")))
+        ids = []
+        while i < len(self.entries) and self.entries[i][0] == value:
+            ids.append(self.entries[i][1])
+            i += 1
+        return ids
+
+
+class _DayCounts:
+    """Sparse Fenwick tree of counts per day, keyed by `date.toordinal`.
+
+    `add` and `before` touch about 22 nodes whatever the number of tasks
+    or distinct days.
+    """
+
+    _SIZE = 1 << (date.max.toordinal().bit_length())
+
+    def __init__(self):
+        self._tree: Dict[int, int] = {}
+
+    def add(self, day: int, delta: int) -> None:
+        tree = self._tree
+        i = day
+        while i < self._SIZE:
+            n = tree.get(i, 0) + delta
+            if n:
+                tree[i] = n
+            else:
+                tree.pop(i, None)
+            i += i & -i
+
+    def before(self, day: int) -> int:
+        """Total count on days strictly before ``day``."""
+        tree = self._tree
+        total = 0
+        i = day - 1
+        while i > 0:
+            total += tree.get(i, 0)
+            i -= i & -i
+        return total
+
+
+class StatsIndex:
+    """Aggregate counters kept current by every mutation, for `todo stats`.
+
+    Counts by priority, tag and assignee are split into open and completed;
+    open dated tasks are counted per due day in a `_DayCounts`, so overdue
+    and due-soon totals are prefix sums. Tasks created per day are keyed
+    by ``created_at``, completions by ``completed_at``, which completing
+    a task stamps (``updated_at`` for tasks completed before it was
+    recorded). Reading any figure never visits the tasks.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.completed = 0
+        self.priority: Counter = Counter()
+        self.tags: Counter = Counter()
+        self.assignees: Counter = Counter()
+        self.created_per_day: Counter = Counter()
+        self.completed_per_day: Counter = Counter()
+        self._open_due = _DayCounts()
+
+    def keys(self, task: Task) -> Tuple[Hashable, ...]:
+        due = due_moment(task)
+        return (
+            task.completed, task.priority, task.assigned_to, tuple(dict.fromkeys(task.tags)),
+            None if due is None else due.toordinal(),
+            task.created_at.toordinal(),
+            (task.completed_at or task.updated_at).toordinal() if task.completed else None,
+        )
+
+    def _apply(self, keys: Tuple[Hashable, ...], delta: int) -> None:
+        completed, priority, assignee, tags, due, created, completed_day = keys
+        self.total += delta
+        self.priority[priority, completed] += delta
+        self.assignees[assignee, completed] += delta
+        for tag in tags:
+            self.tags[tag, completed] += delta
+        self.created_per_day[created] += delta
+        if completed:
+            self.completed += delta
+            self.completed_per_day[completed_day] += delta
+        elif due is not None:
+            self._open_due.add(due, delta)
+
+    def insert(self, task_id: int, keys: Tuple[Hashable, ...]) -> None:
+        self._apply(keys, 1)
+
+    def discard(self, task_id: int, keys: Tuple[Hashable, ...]) -> None:
+        self._apply(keys, -1)
+
+    def build(self, items: Iterable[Tuple[int, Tuple[Hashable, ...]]]) -> None:
+        """Bulk `insert`: counts column by column, one day-tree update per due day."""
+        keys = [k for _, k in items]
+        if not keys:
+            return
+        completed, priority, assignee, tags, due, created, completed_day = zip(*keys)
+        self.total += len(keys)
+        self.completed += sum(completed)
+        self.priority.update(zip(priority, completed))
+        self.assignees.update(zip(assignee, completed))
+        self.tags.update((tag, done) for names, done in zip(tags, completed) for tag in names)
+        self.created_per_day.update(created)
+        self.completed_per_day.update(day for day in completed_day if day is not None)
+        due_days = Counter(day for day, done in zip(due, completed) if not done and day is not None)
+        for day, n in due_days.items():
+            self._open_due.add(day, n)
+
+    def open_due_before(self, day: date) -> int:
+        """Open tasks due on a day before ``day``."""
+        return self._open_due.before(day.toordinal())
+
+    @staticmethod
+    def _split(counter: Counter, none_label: str) -> Dict[str, Dict[str, int]]:
+        out: Dict[str, Dict[str, int]] = {}
+        for (value, completed), n in counter.items():
+            if n:
+                row = out.setdefault(none_label if value is None else value,
+                                     {"open": 0, "completed": 0})
+                row["completed" if completed else "open"] += n
+        return out
+
+    def summary(self, today: date, days: int = 7) -> dict:
+        """All figures as plain data, relative to ``today``.
+
+        ``due_this_week`` counts open tasks due from ``today`` through the
+        coming Sunday; the per-day series cover the last ``days`` days.
+        """
+        overdue = self.open_due_before(today)
+        week_end = today + timedelta(days=7 - today.weekday())
+        recent = [today - timedelta(days=i) for i in range(days - 1, -1, -1)]
+        return {
+            "tasks": self.total,
+            "completed": self.completed,
+            "open": self.total - self.completed,
+            "overdue": overdue,
+            "due_this_week": self.open_due_before(week_end) - overdue,
+            "priority": self._split(self.priority, "none"),
+            "tags": self._split(self.tags, ""),
+            "assignees": self._split(self.assignees, "unassigned"),
+            "created_per_day": {
+                d.isoformat(): self.created_per_day[d.toordinal()] for d in recent
+            },
+            "completed_per_day": {
+                d.isoformat(): self.completed_per_day[d.toordinal()] for d in recent
+            },
+        }
+
+
+def default_indexes() -> Dict[str, Callable[[], object]]:
+    """Factories for the indexes `TodoList` can build on demand."""
+    return {
+        "tag": TagIndex,
+        "priority": lambda: BucketIndex(lambda t: (t.priority,)),
+        "assignee": lambda: BucketIndex(lambda t: (t.assigned_to,)),
+        "due": lambda: SortedIndex(lambda t: t.due_date),
+        "recurrence": lambda: BucketIndex(lambda t: (t.recurrence,) if t.recurrence else ()),
+        "text": TrigramIndex,
+        "stats": StatsIndex,
+        # Whole-list orders for `list --sort`, and open dated tasks by due
+        # moment for `next`.
+        "sort:due": lambda: SortedIndex(SORT_KEYS["due"]),
+        "sort:priority": lambda: SortedIndex(SORT_KEYS["priority"]),
+        "sort:created": lambda: SortedIndex(SORT_KEYS["created"]),
+        "sort:updated": lambda: SortedIndex(SORT_KEYS["updated"]),
+        "next": lambda: SortedIndex(
+            lambda t: None if t.completed or due_moment(t) is None else _due_key(t)
+        ),
+    }
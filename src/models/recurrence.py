@@ -0,0 +1,176 @@
+"""Recurrence rules for repeating tasks.
+
+A rule is one word, as captured by ``RECURRENCE_PATTERN`` after
+``every``: ``day``, ``week``, ``month``, ``year``, ``weekday`` (Monday to
+Friday) or a day name such as ``monday``. A task stores its rule and its
+current due moment only; further occurrences are computed on demand by
+`first_occurrence`, which jumps straight to a requested start instead of
+stepping through the past, and streamed lazily by `occurrences` and
+`merge_upcoming`.
+"""
+
+import heapq
+from datetime import datetime, timedelta
+from itertools import takewhile
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+DAY_NAMES = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+RULES = ("day", "week", "month", "year", "weekday") + DAY_NAMES
+_ALIASES = {
+    "daily": "day", "days": "day",
+    "weekly": "week", "weeks": "week",
+    "monthly": "month", "months": "month",
+    "yearly": "year", "years": "year", "annually": "year",
+    "weekdays": "weekday",
+}
+_ONE_DAY = timedelta(days=1)
+_ONE_WEEK = timedelta(days=7)
+_TICK = timedelta(microseconds=1)
+
+
+def normalize_rule(word: Optional[str]) -> Optional[str]:
+    """The canonical rule for ``word`` (``"Daily"`` -> ``"day"``), or None."""
+    if not word:
+        return None
+    word = word.lower()
+    word = _ALIASES.get(word, word)
+    return word if word in RULES else None
+
+
+def _add_months(dt: datetime, months: int) -> datetime:
+    """``dt`` moved by ``months``, clamping the day to the month's end."""
+    y, m = divmod(dt.month - 1 + months, 12)
+    year, month = dt.year + y, m + 1
+    nxt = datetime(year + month // 12, month % 12 + 1, 1)
+    last = (nxt - _ONE_DAY).day
+    return dt.replace(year=year, month=month, day=min(dt.day, last))
+
+
+def _ceil_steps(delta: timedelta, step: timedelta) -> int:
+    return max(0, -(-delta // step))
+
+
+def first_occurrence(rule: str, anchor: datetime, start: Optional[datetime] = None) -> datetime:
+    """The first occurrence of ``rule`` from ``anchor`` that is not before ``start``.
+
+    Day-name and ``weekday`` rules first move ``anchor`` forward to a
+    matching day. Month and year steps are counted from ``anchor``, so a
+    rule anchored on the 31st stays on the last day of shorter months
+    without drifting. Computed directly, not by stepping from ``anchor``.
+    """
+    if start is None or start < anchor:
+        start = anchor
+    if rule in DAY_NAMES:
+        anchor += timedelta(days=(DAY_NAMES.index(rule) - anchor.weekday()) % 7)
+        rule = "week"
+        if start < anchor:
+            start = anchor
+    if rule == "day" or rule == "week":
+        step = _ONE_DAY if rule == "day" else _ONE_WEEK
+        return anchor + step * _ceil_steps(start - anchor, step)
+    if rule == "weekday":
+        when = anchor + _ONE_DAY * _ceil_steps(start - anchor, _ONE_DAY)
+        while when.weekday() >= 5:
+            when += _ONE_DAY
+        return when
+    if rule == "month" or rule == "year":
+        months = 1 if rule == "month" else 12
+        k = max(0, ((start.year - anchor.year) * 12 + start.month - anchor.month) // months - 1)
+        while True:
+            when = _add_months(anchor, k * months)
+            if when >= start:
+                return when
+            k += 1
+    raise ValueError(f"unknown recurrence rule {rule!r}")
+
+
+def occurrences(
+    rule: str, anchor: datetime, start: Optional[datetime] = None
+) -> Iterator[datetime]:
+    """Occurrences of ``rule`` from ``anchor`` on, skipping those before ``start``.
+
+    Infinite and lazy; see `first_occurrence` for how ``anchor`` is used.
+    """
+    while True:
+        when = first_occurrence(rule, anchor, start)
+        yield when
+        start = when + _TICK
+
+
+def merge_upcoming(
+    repeating: Iterable[Any], once: Iterable[Any], since: datetime, until: datetime
+) -> Iterator[Tuple[datetime, Any]]:
+    """``(when, task)`` for occurrences in ``[since, until)``, soonest first.
+
+    ``once`` yields one-off tasks in due order from ``since``; each task
+    in ``repeating`` contributes all its occurrences. A heap holds one
+    pending occurrence per recurring task and only the task just popped
+    is advanced, so the cost follows the occurrences yielded plus one
+    `first_occurrence` per recurring task, not the rules times the window.
+    Ties are broken by task id.
+    """
+    heap = []
+    for t in repeating:
+        anchor = t.time or t.due_date or since
+        when = first_occurrence(t.recurrence, anchor, since)
+        if when < until:
+            heap.append((when, t.id, anchor, t))
+    heapq.heapify(heap)
+
+    def repeats() -> Iterator[Tuple[datetime, Any]]:
+        while heap:
+            when, tid, anchor, t = heap[0]
+            yield when, t
+            nxt = first_occurrence(t.recurrence, anchor, when + _TICK)
+            if nxt < until:
+                heapq.heapreplace(heap, (nxt, tid, anchor, t))
+            else:
+                heapq.heappop(heap)
+
+    singles = takewhile(lambda pair: pair[0] < until, ((t.time or t.due_date, t) for t in once))
+    return heapq.merge(singles, repeats(), key=lambda pair: (pair[0], pair[1].id))
+
+
+def next_occurrence(rule: str, after: datetime) -> datetime:
+    """The first occurrence of ``rule`` strictly after ``after``."""
+    return first_occurrence(rule, after, after + _TICK)
+
+
+def _move_to(task, when: datetime) -> None:
+    """Set the due moment of ``task``; a ``due_date`` next to a ``time`` keeps its clock."""
+    if task.time is not None:
+        task.time = when
+        if task.due_date is not None:
+            task.due_date = datetime.combine(when.date(), task.due_date.time())
+    else:
+        task.due_date = when
+
+
+def align(task, today: Optional[datetime] = None) -> None:
+    """Put a recurring ``task``'s due moment on its first occurrence.
+
+    ``"every monday at 9:30"`` parses to today at 9:30 and becomes next
+    Monday at 9:30; a rule without any date starts ``today`` (midnight).
+    """
+    rule = getattr(task, "recurrence", None)
+    if rule is None:
+        return
+    current = task.time or task.due_date
+    if current is None:
+        current = (today or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+    _move_to(task, first_occurrence(rule, current))
+
+
+def roll_forward(task) -> bool:
+    """Move a recurring ``task`` to its next occurrence; False if it has none.
+
+    The due moment (``time``, else ``due_date``) advances and the task
+    stays open.
+    """
+    rule = getattr(task, "recurrence", None)
+    current = task.time or task.due_date
+    if rule is None or current is None:
+        return False
+    _move_to(task, next_occurrence(rule, current))
+    task.completed = False
+    return True
@@ -1,7 +1,9 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+import struct
+import sys
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timedelta
+from typing import List, Optional, Dict, Any, Tuple, Union
 
 
 @dataclass
@@ -10,6 +12,9 @@ class Task:
 
     Fields are intentionally simple to keep persistence straightforward.
     Time- and date-only fields are stored as naive datetimes in local time.
+    ``recurrence`` is a rule word from `models.recurrence` (``"week"``,
+    ``"monday"``...) for tasks that repeat. ``completed_at`` is stamped
+    when the task is completed and cleared when it is reopened.
     """
     id: int
     description: str
@@ -21,6 +26,8 @@ class Task:
     completed: bool = False
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
+    recurrence: Optional[str] = None
+    completed_at: Optional[datetime] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialize the task into a JSON-safe dictionary."""
@@ -39,6 +46,10 @@ class Task:
             "completed": self.completed,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
+            "recurrence": self.recurrence,
+            "completed_at": (
+                self.completed_at.isoformat() if self.completed_at else None
+            ),
         }
 
     @staticmethod
@@ -68,4 +79,349 @@ class Task:
             updated_at=(
                 datetime.fromisoformat(d["updated_at"]) if d.get("updated_at") else datetime.now()
             ),
+            recurrence=d.get("recurrence"),
+            completed_at=(
+                datetime.fromisoformat(d["completed_at"]) if d.get("completed_at") else None
+            ),
+        )
+
+
+_LAZY_FIELDS = ("due_date", "time", "created_at", "updated_at", "completed_at")
+
+
+def _decode_iso(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+class _LazyDatetime:
+    """Data descriptor decoding a value from ``_raw`` on first read.
+
+    The owner's ``_decode`` turns the raw value into a datetime (an ISO
+    string for `LazyTask`). ``_raw`` is never modified, so shallow copies of
+    a task can share it.
+    """
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        self.slot = _LAZY_FIELDS.index(name)
+
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        d = obj.__dict__
+        if self.name in d:
+            return d[self.name]
+        raw = d.get("_raw")
+        decoded = obj._decode(raw[self.slot]) if raw is not None else None
+        d[self.name] = decoded
+        return decoded
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        obj.__dict__[self.name] = value
+
+
+class LazyTask(Task):
+    """`Task` loaded from storage whose datetime fields decode on first access.
+
+    `from_dict` keeps the ISO strings and defers `datetime.fromisoformat`
+    until a field is read, so commands that never look at dates do not pay
+    for decoding them. Assigning a field works exactly as on `Task`.
+    """
+
+    due_date = _LazyDatetime()
+    time = _LazyDatetime()
+    created_at = _LazyDatetime()
+    updated_at = _LazyDatetime()
+    completed_at = _LazyDatetime()
+    _decode = staticmethod(_decode_iso)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> LazyTask:  # type: ignore[override]
+        get = d.get
+        t = cls.__new__(cls)
+        # ISO strings in _LAZY_FIELDS order; decoded values shadow them in
+        # __dict__ once read or assigned.
+        raw = (
+            get("due_date"), get("time"), get("created_at"), get("updated_at"),
+            get("completed_at"),
+        )
+        # Plain attribute stores keep CPython's shared-key instance dicts.
+        t.id = d["id"]
+        t.description = d["description"]
+        t.tags = get("tags", [])
+        t.priority = get("priority")
+        t.assigned_to = get("assigned_to")
+        t.completed = get("completed", False)
+        t.recurrence = get("recurrence")
+        t._raw = raw
+        if not raw[2] or not raw[3]:
+            # Match Task.from_dict, which stamps missing timestamps at load.
+            now = datetime.now()
+            if not raw[2]:
+                t.created_at = now
+            if not raw[3]:
+                t.updated_at = now
+        return t
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Task):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in _FIELD_NAMES)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize, reusing the stored ISO strings of undecoded fields."""
+        raw = self.__dict__.get("_raw")
+        if raw is None:
+            return super().to_dict()
+        d = {}
+        for name in _FIELD_NAMES:
+            if name in _LAZY_FIELDS and name not in self.__dict__:
+                d[name] = raw[_LAZY_FIELDS.index(name)]
+            elif name in _LAZY_FIELDS:
+                value = self.__dict__[name]
+                d[name] = value.isoformat() if value else None
+            else:
+                d[name] = getattr(self, name)
+        return d
+
+
+_FIELD_NAMES = tuple(f.name for f in fields(Task))
+
+
+_PRIORITY_CODES = {None: 0, "high": 1, "medium": 2, "low": 3}
+_PRIORITY_NAMES = {code: name for name, code in _PRIORITY_CODES.items()}
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+# due_date, time, created_at, updated_at, completed_at as microseconds
+# since the epoch
+_STAMPS = struct.Struct("<5q")
+_NO_STAMP = -(1 << 63)
+# Distinct tag combinations are few, so equal tag tuples are shared.
+_TAG_TUPLES: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def _to_epoch(dt: Optional[datetime]) -> int:
+    """Naive datetime -> integer microseconds since 1970-01-01 (exact)."""
+    return _NO_STAMP if dt is None else (dt - _EPOCH) // _MICROSECOND
+
+
+def _from_epoch(us: int) -> Optional[datetime]:
+    return None if us == _NO_STAMP else _EPOCH + timedelta(microseconds=us)
+
+
+def _stamp_property(slot: int, doc: str) -> property:
+    def fget(self: CompactTask) -> Optional[datetime]:
+        return _from_epoch(_STAMPS.unpack(self._stamps)[slot])
+
+    def fset(self: CompactTask, value: Optional[datetime]) -> None:
+        stamps = list(_STAMPS.unpack(self._stamps))
+        stamps[slot] = _to_epoch(value)
+        self._stamps = _STAMPS.pack(*stamps)
+
+    return property(fget, fset, doc=doc)
+
+
+class CompactTask:
+    """Memory-lean drop-in for `Task` when holding millions of tasks.
+
+    Uses ``__slots__`` instead of a per-instance dict, stores tags as a
+    shared tuple of interned strings, priority as a small integer code and
+    the five datetimes as epoch microseconds packed into one ``bytes``
+    value. The public attributes and `to_dict`/`from_dict` behave like
+    `Task`; datetimes are materialized on access. ``tags`` returns a fresh
+    list, so assign to change it.
+    """
+
+    __slots__ = (
+        "id",
+        "description",
+        "_tags",
+        "_priority",
+        "_assigned",
+        "completed",
+        "_stamps",
+        "recurrence",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        description: str,
+        tags: Optional[List[str]] = None,
+        priority: Optional[str] = None,
+        due_date: Optional[datetime] = None,
+        assigned_to: Optional[str] = None,
+        time: Optional[datetime] = None,
+        completed: bool = False,
+        created_at: Optional[datetime] = None,
+        updated_at: Optional[datetime] = None,
+        recurrence: Optional[str] = None,
+        completed_at: Optional[datetime] = None,
+    ):
+        self.id = id
+        self.description = description
+        self.tags = tags or []
+        self.priority = priority
+        self.assigned_to = assigned_to
+        self.completed = completed
+        self.recurrence = recurrence
+        now = datetime.now() if created_at is None or updated_at is None else None
+        self._stamps = _STAMPS.pack(
+            _to_epoch(due_date),
+            _to_epoch(time),
+            _to_epoch(created_at or now),
+            _to_epoch(updated_at or now),
+            _to_epoch(completed_at),
         )
+
+    @property
+    def tags(self) -> List[str]:
+        return list(self._tags)
+
+    @tags.setter
+    def tags(self, value: List[str]) -> None:
+        key = tuple(sys.intern(tag) for tag in value)
+        self._tags = _TAG_TUPLES.setdefault(key, key)
+
+    @property
+    def priority(self) -> Optional[str]:
+        p = self._priority
+        return _PRIORITY_NAMES[p] if isinstance(p, int) else p
+
+    @priority.setter
+    def priority(self, value: Optional[str]) -> None:
+        # Values outside the known set are kept verbatim.
+        self._priority: Union[int, str] = _PRIORITY_CODES.get(value, value)
+
+    @property
+    def assigned_to(self) -> Optional[str]:
+        return self._assigned
+
+    @assigned_to.setter
+    def assigned_to(self, value: Optional[str]) -> None:
+        self._assigned = sys.intern(value) if value is not None else None
+
+    due_date = _stamp_property(0, "Due date, materialized on access.")
+    time = _stamp_property(1, "Due time, materialized on access.")
+    created_at = _stamp_property(2, "Creation timestamp.")
+    updated_at = _stamp_property(3, "Last update timestamp.")
+    completed_at = _stamp_property(4, "Completion timestamp, None while open.")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (Task, CompactTask)):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in _FIELD_NAMES)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        body = ", ".join(f"{f}={getattr(self, f)!r}" for f in _FIELD_NAMES)
+        return f"CompactTask({body})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize into the same JSON-safe dictionary as `Task.to_dict`."""
+        due, time, created, updated, done = (
+            _from_epoch(us) for us in _STAMPS.unpack(self._stamps)
+        )
+        return {
+            "id": self.id,
+            "description": self.description,
+            "tags": list(self._tags),
+            "priority": self.priority,
+            "due_date": due.isoformat() if due else None,
+            "assigned_to": self._assigned,
+            "time": time.isoformat() if time else None,
+            "completed": self.completed,
+            "created_at": created.isoformat(),
+            "updated_at": updated.isoformat(),
+            "recurrence": self.recurrence,
+            "completed_at": done.isoformat() if done else None,
+        }
+
+    @classmethod
+    def from_epochs(
+        cls,
+        id: int,
+        description: str,
+        tags: List[str],
+        priority: Optional[str],
+        assigned_to: Optional[str],
+        completed: bool,
+        stamps: Tuple[int, int, int, int, int],
+        recurrence: Optional[str] = None,
+    ) -> CompactTask:
+        """Build from datetimes already encoded as epoch microseconds.
+
+        ``stamps`` holds due_date, time, created_at, updated_at and
+        completed_at, with missing values as the ``_NO_STAMP`` sentinel.
+        """
+        t = cls.__new__(cls)
+        t.id = id
+        t.description = description
+        t.tags = tags
+        t.priority = priority
+        t.assigned_to = assigned_to
+        t.completed = completed
+        t.recurrence = recurrence
+        t._stamps = _STAMPS.pack(*stamps)
+        return t
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> CompactTask:
+        """Create a CompactTask from a dictionary produced by `to_dict`."""
+        def dt(key: str) -> Optional[datetime]:
+            return datetime.fromisoformat(d[key]) if d.get(key) else None
+
+        return CompactTask(
+            id=d["id"],
+            description=d["description"],
+            tags=d.get("tags", []),
+            priority=d.get("priority"),
+            due_date=dt("due_date"),
+            assigned_to=d.get("assigned_to"),
+            time=dt("time"),
+            completed=d.get("completed", False),
+            created_at=dt("created_at"),
+            updated_at=dt("updated_at"),
+            recurrence=d.get("recurrence"),
+            completed_at=dt("completed_at"),
+        )
+
+
+class EpochTask(LazyTask):
+    """`LazyTask` whose undecoded datetimes are epoch microseconds.
+
+    Produced by `SnapshotStorageService`, which stores datetimes in that
+    form, so loading a snapshot creates no datetime objects up front.
+    """
+
+    _decode = staticmethod(_from_epoch)
+
+    @classmethod
+    def from_epochs(
+        cls,
+        id: int,
+        description: str,
+        tags: List[str],
+        priority: Optional[str],
+        assigned_to: Optional[str],
+        completed: bool,
+        stamps: Tuple[int, int, int, int, int],
+        recurrence: Optional[str] = None,
+    ) -> EpochTask:
+        """Same contract as `CompactTask.from_epochs`."""
+        t = cls.__new__(cls)
+        t.id = id
+        t.description = description
+        t.tags = tags
+        t.priority = priority
+        t.assigned_to = assigned_to
+        t.completed = completed
+        t.recurrence = recurrence
+        t._raw = stamps
+        return t
+
+    def to_dict(self) -> Dict[str, Any]:
+        return Task.to_dict(self)
@@ -0,0 +1,198 @@
+"""Trigram index narrowing regex search over task descriptions and tags.
+
+The index maps every trigram of a task's normalized text (description and
+tags) to the ids containing it. A search regex is reduced to the literal
+fragments any match must contain; only tasks holding all trigrams of those
+fragments are handed to the real regex. Patterns without a usable literal of
+three or more characters fall back to a full scan.
+"""
+
+import re
+from typing import Dict, List, Optional, Set, Tuple
+from .task import Task
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+    from re import _constants as sre_constants
+except ImportError:  # pragma: no cover
+    import sre_parse  # type: ignore
+    import sre_constants  # type: ignore
+
+# Case-insensitive matching lets "i" match these, but casefold() does not
+# map them onto "i"; U+0307 is the combining dot left behind by "İ".
+_FOLD_FIXUPS = str.maketrans({"ı": "i", "̇": None})
+_SEPARATOR = "\x00"
+
+
+def normalize(text: str) -> str:
+    """Fold text so an ASCII literal matched with IGNORECASE appears verbatim."""
+    return text.casefold().translate(_FOLD_FIXUPS)
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def required_literals(pattern: str, flags: int = 0) -> Optional[List[List[str]]]:
+    """Return literal fragments every match of ``pattern`` must contain.
+
+    The result is a disjunction of conjunctions: a match contains all
+    fragments of at least one inner list. ``None`` means no fragment is
+    guaranteed, i.e. the pattern can only be answered by a full scan.
+    Fragments are lowercase ASCII as produced by `normalize`.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except (re.error, TypeError):
+        return None
+    clauses = _sequence(list(parsed))
+    if clauses is None:
+        return None
+    return clauses
+
+
+def _sequence(items) -> Optional[List[List[str]]]:
+    """Conjunction of everything a sequence of parsed items requires."""
+    clauses: List[List[str]] = [[]]
+    run: List[str] = []
+
+    def flush():
+        if run:
+            for clause in clauses:
+                clause.append("".join(run))
+            run.clear()
+
+    def conjoin(sub: Optional[List[List[str]]]):
+        nonlocal clauses
+        if sub is None:
+            return
+        # Distribute: (A or B) and (C or D) -> AC or AD or BC or BD; keep it
+        # bounded since the index only needs a cheap superset.
+        if len(clauses) * len(sub) > 16:
+            return
+        clauses = [c + s for c in clauses for s in sub]
+
+    for op, av in items:
+        if op is sre_constants.LITERAL and av < 128:
+            run.append(chr(av).lower())
+        elif op is sre_constants.AT:
+            continue
+        elif op is sre_constants.SUBPATTERN:
+            flush()
+            conjoin(_sequence(list(av[-1])))
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) or (
+            op is getattr(sre_constants, "POSSESSIVE_REPEAT", None)
+        ):
+            flush()
+            low, _high, body = av
+            if low >= 1:
+                conjoin(_sequence(list(body)))
+        elif op is getattr(sre_constants, "ATOMIC_GROUP", None):
+            flush()
+            conjoin(_sequence(list(av)))
+        elif op is sre_constants.BRANCH:
+            flush()
+            alternatives: List[List[str]] = []
+            for branch in av[1]:
+                sub = _sequence(list(branch))
+                if sub is None:
+                    alternatives = []
+                    break
+                alternatives.extend(sub)
+            conjoin(alternatives or None)
+        else:
+            flush()
+    flush()
+    # A clause without a trigram-sized fragment constrains nothing.
+    if any(all(len(f) < 3 for f in clause) for clause in clauses):
+        return None
+    return clauses
+
+
+class TrigramIndex:
+    """Incrementally maintained trigram postings for `TodoList` tasks."""
+
+    def __init__(self):
+        self.postings: Dict[str, Set[int]] = {}
+        self.documents = 0
+        self.queries = 0
+        self.index_queries = 0
+        self.candidates = 0
+        self.matches = 0
+
+    def keys(self, task: Task) -> Tuple[str, ...]:
+        return (task.description, *task.tags)
+
+    def insert(self, task_id: int, keys: Tuple[str, ...]) -> None:
+        self.documents += 1
+        for gram in self._grams(keys):
+            bucket = self.postings.get(gram)
+            if bucket is None:
+                self.postings[gram] = {task_id}
+            else:
+                bucket.add(task_id)
+
+    def discard(self, task_id: int, keys: Tuple[str, ...]) -> None:
+        self.documents -= 1
+        for gram in self._grams(keys):
+            bucket = self.postings.get(gram)
+            if bucket is not None:
+                bucket.discard(task_id)
+                if not bucket:
+                    del self.postings[gram]
+
+    def candidates_for(self, regex: "re.Pattern[str]") -> Optional[Set[int]]:
+        """Ids that may match ``regex`` or ``None`` when a full scan is needed."""
+        self.queries += 1
+        clauses = required_literals(regex.pattern, regex.flags)
+        if clauses is None:
+            return None
+        ids: Set[int] = set()
+        for clause in clauses:
+            grams: Set[str] = set()
+            for fragment in clause:
+                grams |= trigrams(fragment)
+            if not grams:
+                return None
+            ids |= self._intersect(grams)
+        self.index_queries += 1
+        return ids
+
+    def record(self, candidates: int, matches: int) -> None:
+        """Account for how many candidates a query examined and kept."""
+        self.candidates += candidates
+        self.matches += matches
+
+    def stats(self) -> Dict[str, float]:
+        """Index size and effectiveness counters."""
+        return {
+            "documents": self.documents,
+            "trigrams": len(self.postings),
+            "postings": sum(len(b) for b in self.postings.values()),
+            "queries": self.queries,
+            "index_queries": self.index_queries,
+            "full_scans": self.queries - self.index_queries,
+            "hit_ratio": self.index_queries / self.queries if self.queries else 0.0,
+            "candidates": self.candidates,
+            "matches": self.matches,
+            "precision": self.matches / self.candidates if self.candidates else 0.0,
+        }
+
+    def _intersect(self, grams: Set[str]) -> Set[int]:
+        buckets = []
+        for gram in grams:
+            bucket = self.postings.get(gram)
+            if not bucket:
+                return set()
+            buckets.append(bucket)
+        buckets.sort(key=len)
+        result = set(buckets[0])
+        for bucket in buckets[1:]:
+            result &= bucket
+            if not result:
+                break
+        return result
+
+    @staticmethod
+    def _grams(keys: Tuple[str, ...]) -> Set[str]:
+        return trigrams(normalize(_SEPARATOR.join(keys)))
@@ -1,60 +1,273 @@
-from typing import List, Optional, Callable
-from .task import Task
+import re
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Callable, Set
+from .task import Task, _to_epoch
+from .columns import ColumnIndex
+from .indexes import default_indexes
+from .recurrence import roll_forward
+try:
+    from parsers.regex_patterns import LITERAL_TAG, compile_cached  # type: ignore
+except Exception:  # pragma: no cover
+    from ..parsers.regex_patterns import LITERAL_TAG, compile_cached
 
 
 class TodoList:
-    """In-memory collection of tasks with simple ID management."""
+    """In-memory collection of tasks with simple ID management.
 
-    def __init__(self):
-        self._tasks: List[Task] = []
+    Tasks are kept in an insertion-ordered dict keyed by id, so lookups and
+    deletions are O(1) while `all_tasks` preserves insertion order.
+
+    Secondary indexes (tag, priority, assignee, due date, search trigrams,
+    the ``--sort`` orders and the open-by-due queue of `next_due`) are
+    built on first use and then kept in sync by every mutation, so loading
+    stays cheap for commands that never filter. With ``columnar=True`` a
+    NumPy `ColumnIndex` is kept the same way and `columns` returns it.
+    """
+
+    def __init__(self, columnar: bool = False):
+        self._tasks: Dict[int, Task] = {}
         self._next_id = 1
+        self._index_factories = default_indexes()
+        if columnar:
+            self._index_factories["columns"] = ColumnIndex
+        self._indexes: Dict[str, object] = {}
+        # True while dict order equals ascending id order, which lets index
+        # results be returned in insertion order by sorting their ids.
+        self._id_ordered = True
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    @property
+    def next_id(self) -> int:
+        """Id the next `add_task` will assign."""
+        return self._next_id
 
     def load_tasks(self, tasks: List[Task]) -> None:
         """Replace current tasks with provided list and reset next id."""
-        self._tasks = tasks
+        self._tasks = {t.id: t for t in tasks}
+        self._indexes = {}
+        ids = list(self._tasks)
+        self._id_ordered = all(a < b for a, b in zip(ids, ids[1:]))
         if tasks:
             self._next_id = max(t.id for t in tasks) + 1
 
     def all_tasks(self) -> List[Task]:
         """Return a shallow copy of all tasks to prevent external mutation."""
-        return list(self._tasks)
+        return list(self._tasks.values())
+
+    def iter_tasks(self) -> Iterator[Task]:
+        """Iterate over the tasks in place, without `all_tasks`' copy.
 
-    def add_task(self, task: Task) -> Task:
-        """Append a new task assigning it a unique incremental id."""
-        task.id = self._next_id
-        self._next_id += 1
-        self._tasks.append(task)
+        The list must not be mutated until the iterator is exhausted.
+        """
+        return iter(self._tasks.values())
+
+    @property
+    def id_ordered(self) -> bool:
+        """True while iteration order is ascending id order."""
+        return self._id_ordered
+
+    def add_task(self, task: Task, task_id: Optional[int] = None) -> Task:
+        """Append a new task assigning it a unique incremental id.
+
+        ``task_id``, an id reserved elsewhere that is not in the list,
+        is used instead when given.
+        """
+        if task_id is None:
+            task_id = self._next_id
+        elif task_id < self._next_id:
+            self._id_ordered = False
+        task.id = task_id
+        self._next_id = max(self._next_id, task_id + 1)
+        self._tasks[task.id] = task
+        for ix in self._indexes.values():
+            ix.insert(task.id, ix.keys(task))
         return task
 
     def find_by_id(self, tid: int) -> Optional[Task]:
         """Return the task with id or None if not found."""
-        for t in self._tasks:
-            if t.id == tid:
-                return t
-        return None
+        return self._tasks.get(tid)
 
     def delete_task(self, tid: int) -> bool:
         """Delete a task by id returning True if removed."""
-        t = self.find_by_id(tid)
-        if t:
-            self._tasks.remove(t)
-            return True
-        return False
+        t = self._tasks.pop(tid, None)
+        if t is None:
+            return False
+        for ix in self._indexes.values():
+            ix.discard(tid, ix.keys(t))
+        return True
 
     def update_task(self, tid: int, update_fn: Callable[[Task], None]) -> bool:
         """Apply updater function to task by id returning True if updated."""
         t = self.find_by_id(tid)
         if not t:
             return False
+        before = [(ix, ix.keys(t)) for ix in self._indexes.values()]
         update_fn(t)
+        for ix, old in before:
+            new = ix.keys(t)
+            if new != old:
+                ix.discard(tid, old)
+                ix.insert(tid, new)
+        return True
+
+    def replace_task(self, task: Task) -> bool:
+        """Store ``task`` in place of the task with its id, keeping its position."""
+        old = self._tasks.get(task.id)
+        if old is None:
+            return False
+        for ix in self._indexes.values():
+            before, after = ix.keys(old), ix.keys(task)
+            if after != before:
+                ix.discard(task.id, before)
+                ix.insert(task.id, after)
+        self._tasks[task.id] = task
         return True
 
     def filter_tasks(self, predicate: Callable[[Task], bool]) -> List[Task]:
         """Return tasks matching predicate."""
-        return [t for t in self._tasks if predicate(t)]
+        return [t for t in self._tasks.values() if predicate(t)]
 
     def mark_complete(self, tid: int) -> bool:
-        return self.update_task(tid, lambda t: setattr(t, "completed", True))
+        """Complete a task; a recurring one rolls to its next occurrence instead.
+
+        A task completed here for the first time gets ``completed_at``,
+        which dates the completion for `stats`; later edits leave it be.
+        """
+        def complete(t: Task) -> None:
+            now = datetime.now()
+            if not roll_forward(t) and not t.completed:
+                t.completed = True
+                t.completed_at = now
+            t.updated_at = now
+
+        return self.update_task(tid, complete)
 
     def mark_incomplete(self, tid: int) -> bool:
-        return self.update_task(tid, lambda t: setattr(t, "completed", False))
+        def reopen(t: Task) -> None:
+            t.completed = False
+            t.completed_at = None
+            t.updated_at = datetime.now()
+
+        return self.update_task(tid, reopen)
+
+    def index(self, name: str):
+        """Return the named secondary index, building it on first use."""
+        ix = self._indexes.get(name)
+        if ix is None:
+            ix = self._index_factories[name]()
+            build = getattr(ix, "build", None)
+            if build is not None:
+                build((tid, ix.keys(t)) for tid, t in self._tasks.items())
+            else:
+                for tid, t in self._tasks.items():
+                    ix.insert(tid, ix.keys(t))
+            self._indexes[name] = ix
+        return ix
+
+    def columns(self) -> Optional[ColumnIndex]:
+        """The columnar mirror when the list was created ``columnar``, else None."""
+        if "columns" not in self._index_factories:
+            return None
+        return self.index("columns")
+
+    def tasks_by_ids(self, ids: Iterable[int]) -> List[Task]:
+        """Return the tasks for ``ids`` in insertion order."""
+        if self._id_ordered:
+            return [self._tasks[tid] for tid in sorted(ids)]
+        wanted = set(ids)
+        return [t for tid, t in self._tasks.items() if tid in wanted]
+
+    def with_priority(self, prio: Optional[str]) -> List[Task]:
+        """Tasks whose priority equals ``prio``."""
+        return self.tasks_by_ids(self.index("priority").lookup(prio))
+
+    def assigned_to(self, email: Optional[str]) -> List[Task]:
+        """Tasks assigned to exactly ``email``."""
+        return self.tasks_by_ids(self.index("assignee").lookup(email))
+
+    def with_tag_matching(self, tag_pattern: str) -> List[Task]:
+        """Tasks having a tag that fully matches ``tag_pattern`` ignoring case."""
+        return self.tasks_by_ids(self.ids_with_tag_matching(tag_pattern))
+
+    def ids_with_tag_matching(self, tag_pattern: str) -> Set[int]:
+        """Ids of `with_tag_matching` tasks, unordered.
+
+        Plain tag names are answered from the inverted index directly; other
+        patterns are tested once per distinct tag rather than once per task.
+        """
+        ix = self.index("tag")
+        if LITERAL_TAG.fullmatch(tag_pattern):
+            return ix.lookup_ignorecase(tag_pattern)
+        return self.ids_with_tag(compile_cached(tag_pattern, re.IGNORECASE).fullmatch)
+
+    def ids_with_tag(self, test: Callable[[str], object]) -> Set[int]:
+        """Ids of tasks having a tag for which ``test(tag)`` is truthy."""
+        ix = self.index("tag")
+        ids: Set[int] = set()
+        for tag in ix.tags():
+            if test(tag):
+                ids |= ix.lookup(tag)
+        return ids
+
+    def iter_sorted(self, sort: str, after: Optional[tuple] = None) -> Iterator[Task]:
+        """Tasks in `SORT_KEYS` order ``sort``, strictly after key ``after``.
+
+        Backed by the ``sort:<name>`` index, so after the first call each
+        page costs O(log n + page) instead of a sort.
+        """
+        tasks = self._tasks
+        return (tasks[tid] for tid in self.index(f"sort:{sort}").iter_ids(after))
+
+    def next_due(self, n: int) -> List[Task]:
+        """The ``n`` incomplete tasks due soonest, by `due_moment`."""
+        return [self._tasks[tid] for tid in islice(self.index("next").iter_ids(), n)]
+
+    def open_due_from(self, since: datetime) -> Iterator[Task]:
+        """Open dated tasks in `next_due` order, starting at due moment ``since``."""
+        tasks = self._tasks
+        return (tasks[tid] for tid in self.index("next").iter_ids((False, _to_epoch(since))))
+
+    def recurring(self) -> List[Task]:
+        """Open tasks that have a recurrence rule."""
+        ix = self.index("recurrence")
+        ids = set().union(*ix.buckets.values()) if ix.buckets else set()
+        return [t for t in self.tasks_by_ids(ids) if not t.completed]
+
+    def due_between(
+        self, after: Optional[datetime] = None, before: Optional[datetime] = None
+    ) -> List[Task]:
+        """Tasks due strictly after ``after`` and strictly before ``before``."""
+        return self.tasks_by_ids(self.index("due").range(after, before))
+
+    def due_matching(self, regex: "re.Pattern[str]") -> List[Task]:
+        """Tasks whose ISO due date matches ``regex``."""
+        return self.tasks_by_ids(self.ids_due_matching(regex))
+
+    def ids_due_matching(self, regex: "re.Pattern[str]") -> List[int]:
+        """Ids of `due_matching` tasks, tested once per distinct due date."""
+        ix = self.index("due")
+        ids: List[int] = []
+        for value in ix.distinct_values():
+            if regex.search(value.isoformat()):
+                ids.extend(ix.ids_with(value))
+        return ids
+
+    def search(self, regex: "re.Pattern[str]") -> List[Task]:
+        """Tasks whose description or any tag matches ``regex``.
+
+        The trigram index narrows the candidates when the pattern contains a
+        usable literal; otherwise every task is tested.
+        """
+        ix = self.index("text")
+        ids = ix.candidates_for(regex)
+        pool = self._tasks.values() if ids is None else self.tasks_by_ids(ids)
+        results = [
+            t
+            for t in pool
+            if regex.search(t.description) or any(regex.search(tag) for tag in t.tags)
+        ]
+        ix.record(len(self._tasks) if ids is None else len(ids), len(results))
+        return results
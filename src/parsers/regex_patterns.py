@@ -1,8 +1,13 @@
 import re
+from functools import lru_cache
 
 # Tag: @tagName (alphanumeric + underscores)
 TAG_PATTERN = re.compile(r"@(?P<tag>[A-Za-z0-9_]+)")
 
+# Tags are restricted to [A-Za-z0-9_] by TAG_PATTERN, so a pattern made only
+# of those characters can only fully match a tag with the same name.
+LITERAL_TAG = re.compile(r"[A-Za-z0-9_]+")
+
 # Priority: #high, #medium, #low (case-insensitive)
 PRIORITY_PATTERN = re.compile(r"#(?P<priority>high|medium|low)", re.IGNORECASE)
 
@@ -24,3 +29,9 @@ TIME_PATTERN = re.compile(
 
 # Recurrence (optional): e.g. “every Monday”, “every day”
 RECURRENCE_PATTERN = re.compile(r"every\s+(?P<interval>\w+)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=64)
+def compile_cached(pattern: str, flags: int = 0) -> "re.Pattern[str]":
+    """``re.compile`` for user-supplied filter patterns, cached per (pattern, flags)."""
+    return re.compile(pattern, flags)
@@ -1,4 +1,6 @@
 from datetime import datetime
+from functools import lru_cache
+from typing import Optional
 from .regex_patterns import (
     TAG_PATTERN,
     PRIORITY_PATTERN,
@@ -10,33 +12,43 @@ from .regex_patterns import (
 from .date_parser import parse_due_date
 from .validator import validate_email
 
+# Token patterns in the order they are stripped from the description.
+_TOKEN_PATTERNS = (
+    TAG_PATTERN,
+    PRIORITY_PATTERN,
+    DUE_DATE_PATTERN,
+    ASSIGNED_PATTERN,
+    TIME_PATTERN,
+    RECURRENCE_PATTERN,
+)
+# Un-prefixed due dates, recognised only when there is no ``due:`` token.
+_NATURAL_DUE = ("tomorrow", "next week")
 
-def parse_task_input(text: str) -> dict:
-    """Parse a raw input string into structured task fields.
 
-    Returns a mapping with keys: description, tags, priority, due_date,
-    assigned_to, time, recurrence. Unknown/invalid tokens are ignored.
+def _scan(text: str) -> tuple:
+    """Extract every date-independent field of ``text``.
+
+    Returns ``(description, tags, priority, due_token, assigned_to, clock,
+    recurrence)`` where ``due_token`` still needs `parse_due_date` and
+    ``clock`` is an ``(hour, minute)`` pair. Nothing here depends on the
+    current time, so results can be cached per input string.
     """
-    # Extract tags
-    tags = [m.group("tag") for m in TAG_PATTERN.finditer(text)]
+    tags = tuple(m.group("tag") for m in TAG_PATTERN.finditer(text))
 
-    # Extract priority (take the first)
     pr_match = PRIORITY_PATTERN.search(text)
     priority = pr_match.group("priority").lower() if pr_match else None
 
-    # Extract due date
     due_match = DUE_DATE_PATTERN.search(text)
-    due_date = None
+    due_token = None
     if due_match:
-        due_date = parse_due_date(due_match.group(0))
+        due_token = due_match.group(0)
     else:
-        # Fallback: detect natural tokens without prefix
-        for candidate in ("tomorrow", "next week"):
-            if candidate in text.lower():
-                due_date = parse_due_date(candidate)
+        lowered = text.lower()
+        for candidate in _NATURAL_DUE:
+            if candidate in lowered:
+                due_token = candidate
                 break
 
-    # Extract assigned email
     asn_match = ASSIGNED_PATTERN.search(text)
     assigned_to = None
     if asn_match:
@@ -44,9 +56,8 @@ def parse_task_input(text: str) -> dict:
         if validate_email(email):
             assigned_to = email
 
-    # Extract time
     tm_match = TIME_PATTERN.search(text)
-    time = None
+    clock = None
     if tm_match:
         hour = int(tm_match.group("hour"))
         minute = int(tm_match.group("minute") or 0)
@@ -57,34 +68,64 @@ def parse_task_input(text: str) -> dict:
                 hour += 12
             elif ampm == "am" and hour == 12:
                 hour = 0
-        # combine with date (due_date or today)
-        base_date = due_date or datetime.now()
-        time = base_date.replace(
-            hour=hour, minute=minute, second=0, microsecond=0
-        )
+        clock = (hour, minute)
 
-    # Extract recurrence (optional)
     rec_match = RECURRENCE_PATTERN.search(text)
     recurrence = rec_match.group("interval").lower() if rec_match else None
 
-    # Now strip out parsed tokens to get “clean” description
-    # (very naive: you can refine)
     cleaned = text
-    # remove tag tokens
-    cleaned = TAG_PATTERN.sub("", cleaned)
-    cleaned = PRIORITY_PATTERN.sub("", cleaned)
-    cleaned = DUE_DATE_PATTERN.sub("", cleaned)
-    cleaned = ASSIGNED_PATTERN.sub("", cleaned)
-    cleaned = TIME_PATTERN.sub("", cleaned)
-    cleaned = RECURRENCE_PATTERN.sub("", cleaned)
+    for pattern in _TOKEN_PATTERNS:
+        cleaned = pattern.sub("", cleaned)
     description = cleaned.strip().strip('"').strip()
 
+    return description, tags, priority, due_token, assigned_to, clock, recurrence
+
+
+DEFAULT_PARSE_CACHE_SIZE = 1024
+_cached_scan = lru_cache(maxsize=DEFAULT_PARSE_CACHE_SIZE)(_scan)
+
+
+def configure_parse_cache(maxsize: Optional[int] = DEFAULT_PARSE_CACHE_SIZE) -> None:
+    """Resize the LRU cache of parsed inputs; ``0`` or ``None`` disables it.
+
+    Only date-independent fields are cached, so relative dates such as
+    ``tomorrow`` are still computed from the current time on every call.
+    """
+    global _cached_scan
+    _cached_scan = lru_cache(maxsize=maxsize)(_scan) if maxsize else _scan
+
+
+def parse_cache_info():
+    """Hit/miss statistics of the parse cache, or ``None`` when disabled."""
+    info = getattr(_cached_scan, "cache_info", None)
+    return info() if info else None
+
+
+def parse_task_input(text: str) -> dict:
+    """Parse a raw input string into structured task fields.
+
+    Returns a mapping with keys: description, tags, priority, due_date,
+    assigned_to, time, recurrence. Unknown/invalid tokens are ignored.
+    Repeated inputs are answered from a bounded LRU cache (see
+    `configure_parse_cache`).
+    """
+    description, tags, priority, due_token, assigned_to, clock, recurrence = (
+        _cached_scan(text)
+    )
+    due_date = parse_due_date(due_token) if due_token else None
+    time = None
+    if clock:
+        # combine with date (due_date or today)
+        time = (due_date or datetime.now()).replace(
+            hour=clock[0], minute=clock[1], second=0, microsecond=0
+        )
     return {
         "description": description,
-        "tags": tags,
+        "tags": list(tags),
         "priority": priority,
         "due_date": due_date,
         "assigned_to": assigned_to,
         "time": time,
         "recurrence": recurrence,
     }
+
@@ -0,0 +1,187 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+try:
+    from models.task import Task  # type: ignore
+    from services.storage_service import StorageService, iter_json_array  # type: ignore
+except Exception:  # pragma: no cover
+    from ..models.task import Task
+    from .storage_service import StorageService, iter_json_array
+
+
+def _identity(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns
+
+
+class JournalStorageService(StorageService):
+    """JSON snapshot plus an append-only journal of per-task mutations.
+
+    The snapshot uses the same format as `StorageService`, so an existing
+    `tasks.json` can be opened directly. Each mutation appended through
+    `append` becomes one JSON line in ``<file>.journal``; `load` replays the
+    journal on top of the snapshot. Once the journal grows past
+    ``compact_threshold`` bytes it is rotated to ``<file>.journal.old`` and
+    folded into a fresh snapshot on a background thread. Appends, rotation
+    and snapshot writes all happen under the store lock, so several
+    processes can share one journal.
+    """
+
+    def __init__(
+        self, filepath: Path, compact_threshold: int = 1 << 20, compact: bool = False
+    ):
+        super().__init__(filepath, compact=compact)
+        self.journal_path = self.filepath.with_name(self.filepath.name + ".journal")
+        self.rotated_path = self.filepath.with_name(self.filepath.name + ".journal.old")
+        self.compact_threshold = compact_threshold
+        self._lock = threading.RLock()
+        self._compactor: Optional[threading.Thread] = None
+
+    def load(self) -> List[Task]:
+        """Load the snapshot and replay pending journal records over it.
+
+        Takes no lock: if a rotation or compaction replaced a file while it
+        was being read, the read is retried.
+        """
+        while True:
+            layout = self._layout()
+            try:
+                state = self._read_state(include_live=True)
+            except FileNotFoundError:
+                continue
+            if self._layout() == layout:
+                return [self._from_dict(d) for d in state.values()]
+
+    def save(self, tasks: List[Task]) -> None:
+        """Write a full snapshot and discard the journal it supersedes."""
+        data = [t.to_dict() for t in tasks]
+        with self.locked(), self._lock:
+            self._replace(data)
+            for path in (self.journal_path, self.rotated_path):
+                if path.exists():
+                    path.unlink()
+            self._store_lock.bump()
+
+    def append(self, op: str, task_id: int, task: Optional[Task] = None) -> None:
+        """Record a single mutation.
+
+        ``op`` is ``"put"`` (insert or replace ``task``) or ``"delete"``.
+        """
+        self.append_many([(op, task_id, task)])
+
+    def append_many(self, records: Iterable[Tuple[str, int, Optional[Task]]]) -> None:
+        """Record ``(op, task_id, task)`` mutations with one write and one version bump."""
+        lines = []
+        for op, task_id, task in records:
+            if op == "put":
+                record: Dict[str, Any] = {"op": "put", "task": task.to_dict()}
+            elif op == "delete":
+                record = {"op": "delete", "id": task_id}
+            else:
+                raise ValueError(f"Unknown journal op: {op}")
+            lines.append(json.dumps(record, separators=(",", ":")) + "\n")
+        if not lines:
+            return
+        text = "".join(lines)
+        with self.locked(), self._lock:
+            with self.journal_path.open("a", encoding="utf-8") as f:
+                f.write(text)
+                size = f.tell()
+            self.bytes_written += len(text.encode("utf-8"))
+            self._store_lock.bump()
+            if size >= self.compact_threshold:
+                self._start_compaction()
+
+    def compact(self) -> None:
+        """Fold the journal into the snapshot synchronously."""
+        self.wait_for_compaction()
+        with self.locked(), self._lock:
+            self._start_compaction()
+        self.wait_for_compaction()
+
+    def wait_for_compaction(self) -> None:
+        """Block until a running background compaction has finished."""
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+    def _start_compaction(self) -> None:
+        """Rotate the live journal and compact it on a worker thread.
+
+        Must be called with the store lock held. A no-op while a previous rotation
+        is still being compacted; new records keep going to the live journal.
+        """
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        # A rotated journal left behind by a crash is compacted as-is.
+        if not self.rotated_path.exists():
+            if not self.journal_path.exists():
+                return
+            os.replace(self.journal_path, self.rotated_path)
+        # Non-daemon so interpreter shutdown waits for the snapshot to land.
+        self._compactor = threading.Thread(
+            target=self._compact_rotated, name="journal-compactor"
+        )
+        self._compactor.start()
+
+    def _compact_rotated(self) -> None:
+        """Fold the rotated journal into the snapshot.
+
+        The files are read without the store lock; it is only taken to
+        install the result, and the work is redone if another writer (or
+        another process's compactor) changed them in the meantime.
+        """
+        while True:
+            layout = self._layout()
+            if layout[1] is None:
+                return  # a full save or another compactor superseded it
+            try:
+                state = self._read_state(include_live=False)
+            except FileNotFoundError:
+                continue
+            with self.locked(), self._lock:
+                if self._layout() == layout:
+                    self._replace(list(state.values()))
+                    self.rotated_path.unlink()
+                    return
+
+    def _layout(self) -> Tuple[Optional[Tuple[int, int]], Optional[Tuple[int, int]]]:
+        """Identity of the snapshot and rotated journal; changes when either is replaced."""
+        return _identity(self.filepath), _identity(self.rotated_path)
+
+    def _read_state(self, include_live: bool) -> Dict[int, Dict[str, Any]]:
+        """Return task dicts keyed by id, in snapshot-then-journal order."""
+        state: Dict[int, Dict[str, Any]] = {}
+        if self.filepath.exists():
+            with self.filepath.open("r", encoding="utf-8") as f:
+                for d in iter_json_array(f):
+                    state[d["id"]] = d
+        journals = [self.rotated_path]
+        if include_live:
+            journals.append(self.journal_path)
+        for path in journals:
+            if path.exists():
+                self._replay(path, state)
+        return state
+
+    @staticmethod
+    def _replay(path: Path, state: Dict[int, Dict[str, Any]]) -> None:
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn line from an interrupted append; skip it.
+                    continue
+                if record["op"] == "put":
+                    state[record["task"]["id"]] = record["task"]
+                elif record["op"] == "delete":
+                    state.pop(record["id"], None)
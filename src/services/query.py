@@ -0,0 +1,670 @@
+"""Composable task queries and a small cost-based planner.
+
+A `Query` is a conjunction of predicates, built from the ``list`` options
+with `Query.from_filters` or parsed from a compact string::
+
+    priority:high tag:~ops due<2026-11-01 !completed
+
+Terms are separated by whitespace; quote values that contain spaces.
+
+- ``priority:P`` and ``assigned:EMAIL`` match exactly,
+- ``tag:PATTERN`` fully matches a tag ignoring case (like ``--tag``),
+  ``tag:~REGEX`` only has to match part of one,
+- ``due:REGEX`` searches the ISO due date (like ``--due``); ``due<DATE``,
+  ``due<=DATE``, ``due>DATE`` and ``due>=DATE`` compare it,
+- ``text:REGEX`` or a bare word searches description and tags,
+- ``completed`` keeps finished tasks; a leading ``!`` negates any term.
+
+`Query.plan` asks the `TodoList` indexes how many tasks each predicate
+selects, fetches the candidates of the most selective one and checks all
+other predicates on them in a single pass. Negated terms and ``completed``
+have no index and are checked per task, except on a columnar `TodoList`,
+where priority, assignee, tag, due-range and completion terms (negated or
+not) are evaluated together as one NumPy mask. Storages with a push-down
+``query`` get every predicate they can express through `Query.pushdown_plan`.
+
+`SORT_KEYS` names the orders results can be paged in; `cursor_for` and
+`decode_cursor` turn the sort key of a page's last task into an opaque
+cursor and back.
+"""
+
+import base64
+import binascii
+import json
+import re
+import shlex
+from datetime import datetime, timedelta
+from typing import Callable, Collection, Dict, Iterable, Iterator, List, Optional, Tuple
+try:
+    from models.indexes import PRIORITY_RANK, SORT_KEYS  # type: ignore  # noqa: F401
+    from models.columns import ColumnIndex  # type: ignore
+    from models.task import Task  # type: ignore
+    from models.todo_list import TodoList  # type: ignore
+    from parsers.regex_patterns import compile_cached  # type: ignore
+except Exception:  # pragma: no cover
+    from ..models.columns import ColumnIndex
+    from ..models.indexes import PRIORITY_RANK, SORT_KEYS  # noqa: F401
+    from ..models.task import Task
+    from ..models.todo_list import TodoList
+    from ..parsers.regex_patterns import compile_cached
+
+_EPSILON = timedelta(microseconds=1)
+_TERM = re.compile(r"(?P<field>[A-Za-z_]+)(?P<op>:~|:|<=|>=|<|>)(?P<value>.+)")
+
+
+class QueryError(ValueError):
+    """A query string or filter value that cannot be compiled."""
+
+
+def sort_key(sort: Optional[str]) -> Callable[[Task], Tuple]:
+    """Key function for ``sort`` (default: id order)."""
+    try:
+        return SORT_KEYS[sort or "id"]
+    except KeyError:
+        raise QueryError(f"unknown sort key {sort!r}; use one of {', '.join(SORT_KEYS)}") from None
+
+
+def cursor_for(task: Task, sort: Optional[str] = None) -> str:
+    """Opaque cursor resuming a ``sort``-ordered listing after ``task``."""
+    raw = json.dumps([sort or "id", list(sort_key(sort)(task))], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: Optional[str] = None) -> Tuple:
+    """Sort key stored in ``cursor``; `QueryError` if it is not one for ``sort``."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        name, key = json.loads(raw)
+    except (binascii.Error, ValueError, TypeError):
+        raise QueryError(f"invalid cursor: {cursor!r}") from None
+    if name != (sort or "id"):
+        raise QueryError(f"cursor is for --sort {name}, not {sort or 'id'}")
+    # A key has the element types the sort key gives any task.
+    expected = [type(v) for v in sort_key(sort)(Task(id=0, description=""))]
+    if not isinstance(key, list) or [type(v) for v in key] != expected:
+        raise QueryError(f"invalid cursor: {cursor!r}")
+    return tuple(key)
+
+
+def _compile(pattern: str, flags: int = 0) -> "re.Pattern[str]":
+    try:
+        return compile_cached(pattern, flags)
+    except re.error as exc:
+        raise QueryError(f"invalid regex {pattern!r}: {exc}") from None
+
+
+def _date(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise QueryError(f"invalid date {value!r}, expected YYYY-MM-DD[THH:MM]") from None
+
+
+class Predicate:
+    """One condition on a task, optionally answerable from an index."""
+
+    #: Name of the `TodoList` index consulted by `ids`, if any.
+    index: Optional[str] = None
+    #: False when `ids` may return a superset that `matches` must confirm.
+    exact = True
+
+    def matches(self, task: Task) -> bool:
+        raise NotImplementedError
+
+    def ids(self, todo: TodoList) -> Optional[Collection[int]]:
+        """Candidate ids from the index, or ``None`` when it cannot help."""
+        return None
+
+    def count(self, todo: TodoList) -> Optional[int]:
+        """Cheap ``len(ids(todo))`` when the index can count without listing."""
+        return None
+
+    def pushdown(self) -> Optional[Dict[str, object]]:
+        """Keyword arguments expressing this predicate to a storage `query`."""
+        return None
+
+    def mask(self, columns: ColumnIndex):
+        """Boolean row mask over a `ColumnIndex`, or None if not vectorizable."""
+        return None
+
+
+class Priority(Predicate):
+    index = "priority"
+
+    def __init__(self, value: str):
+        self.value = value
+
+    def matches(self, task: Task) -> bool:
+        return task.priority == self.value
+
+    def ids(self, todo: TodoList) -> Collection[int]:
+        return todo.index("priority").lookup(self.value)
+
+    def pushdown(self) -> Dict[str, object]:
+        return {"priority": self.value}
+
+    def mask(self, columns: ColumnIndex):
+        return columns.with_priority(self.value)
+
+    def __str__(self) -> str:
+        return f"priority:{self.value}"
+
+
+class Assigned(Predicate):
+    index = "assignee"
+
+    def __init__(self, email: str):
+        self.email = email
+
+    def matches(self, task: Task) -> bool:
+        return task.assigned_to == self.email
+
+    def ids(self, todo: TodoList) -> Collection[int]:
+        return todo.index("assignee").lookup(self.email)
+
+    def pushdown(self) -> Dict[str, object]:
+        return {"assigned_to": self.email}
+
+    def mask(self, columns: ColumnIndex):
+        return columns.assigned_to(self.email)
+
+    def __str__(self) -> str:
+        return f"assigned:{self.email}"
+
+
+class Tag(Predicate):
+    """A tag fully matching ``pattern``, or containing it with ``partial``."""
+
+    index = "tag"
+
+    def __init__(self, pattern: str, partial: bool = False):
+        self.pattern = pattern
+        self.partial = partial
+        regex = _compile(pattern, re.IGNORECASE)
+        self._test = regex.search if partial else regex.fullmatch
+
+    def matches(self, task: Task) -> bool:
+        test = self._test
+        return any(test(tag) for tag in task.tags)
+
+    def ids(self, todo: TodoList) -> Collection[int]:
+        if self.partial:
+            return todo.ids_with_tag(self._test)
+        return todo.ids_with_tag_matching(self.pattern)
+
+    def pushdown(self) -> Dict[str, object]:
+        if self.partial:
+            return {"tag_pattern": f".*(?:{self.pattern}).*"}
+        return {"tag_pattern": self.pattern}
+
+    def mask(self, columns: ColumnIndex):
+        return columns.with_tag(self._test)
+
+    def __str__(self) -> str:
+        return f"tag:{'~' if self.partial else ''}{self.pattern}"
+
+
+class DueMatching(Predicate):
+    index = "due"
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self._regex = _compile(pattern)
+
+    def matches(self, task: Task) -> bool:
+        return task.due_date is not None and bool(self._regex.search(task.due_date.isoformat()))
+
+    def ids(self, todo: TodoList) -> Collection[int]:
+        return todo.ids_due_matching(self._regex)
+
+    def pushdown(self) -> Dict[str, object]:
+        return {"due_pattern": self.pattern}
+
+    def __str__(self) -> str:
+        return f"due:{self.pattern}"
+
+
+class DueRange(Predicate):
+    """Due strictly after ``after`` and strictly before ``before``."""
+
+    index = "due"
+
+    def __init__(
+        self,
+        after: Optional[datetime] = None,
+        before: Optional[datetime] = None,
+        label: Optional[str] = None,
+    ):
+        self.after = after
+        self.before = before
+        self.label = label
+
+    def matches(self, task: Task) -> bool:
+        due = task.due_date
+        if due is None:
+            return False
+        if self.after is not None and not due > self.after:
+            return False
+        return self.before is None or due < self.before
+
+    def ids(self, todo: TodoList) -> Collection[int]:
+        return todo.index("due").range(self.after, self.before)
+
+    def count(self, todo: TodoList) -> int:
+        return todo.index("due").count(self.after, self.before)
+
+    def pushdown(self) -> Dict[str, object]:
+        kwargs: Dict[str, object] = {}
+        if self.after is not None:
+            kwargs["due_after"] = self.after
+        if self.before is not None:
+            kwargs["due_before"] = self.before
+        return kwargs
+
+    def mask(self, columns: ColumnIndex):
+        return columns.between("due", self.after, self.before)
+
+    def __str__(self) -> str:
+        if self.label:
+            return self.label
+        parts = []
+        if self.after is not None:
+            parts.append(f"due>{self.after.isoformat()}")
+        if self.before is not None:
+            parts.append(f"due<{self.before.isoformat()}")
+        return " ".join(parts) or "due>*"
+
+
+class Text(Predicate):
+    """Case-insensitive regex search over description and tags."""
+
+    index = "text"
+    exact = False
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self._regex = _compile(pattern, re.IGNORECASE)
+
+    def matches(self, task: Task) -> bool:
+        search = self._regex.search
+        return bool(search(task.description)) or any(search(tag) for tag in task.tags)
+
+    def ids(self, todo: TodoList) -> Optional[Collection[int]]:
+        return todo.index("text").candidates_for(self._regex)
+
+    def pushdown(self) -> Dict[str, object]:
+        return {"search": self.pattern}
+
+    def __str__(self) -> str:
+        return f"text:{self.pattern}"
+
+
+class Completed(Predicate):
+    def matches(self, task: Task) -> bool:
+        return task.completed
+
+    def pushdown(self) -> Dict[str, object]:
+        return {"completed": True}
+
+    def mask(self, columns: ColumnIndex):
+        return columns.completed
+
+    def __str__(self) -> str:
+        return "completed"
+
+
+class Not(Predicate):
+    def __init__(self, inner: Predicate):
+        self.inner = inner
+
+    def matches(self, task: Task) -> bool:
+        return not self.inner.matches(task)
+
+    def pushdown(self) -> Optional[Dict[str, object]]:
+        if isinstance(self.inner, Completed):
+            return {"completed": False}
+        return None
+
+    def mask(self, columns: ColumnIndex):
+        inner = self.inner.mask(columns)
+        return None if inner is None else ~inner
+
+    def __str__(self) -> str:
+        return f"!{self.inner}"
+
+
+class Columnar(Predicate):
+    """Several predicates answered by one vectorized mask over a `ColumnIndex`."""
+
+    index = "columns"
+
+    def __init__(self, predicates: List[Predicate], ids: List[int]):
+        self.predicates = predicates
+        self._ids = ids
+
+    def matches(self, task: Task) -> bool:
+        return all(p.matches(task) for p in self.predicates)
+
+    def ids(self, todo: TodoList) -> List[int]:
+        return self._ids
+
+    def __str__(self) -> str:
+        return " ".join(str(p) for p in self.predicates)
+
+
+def _due_term(op: str, value: str) -> Predicate:
+    if op == ":":
+        return DueMatching(value)
+    when = _date(value)
+    label = f"due{op}{value}"
+    if op == "<":
+        return DueRange(before=when, label=label)
+    if op == "<=":
+        return DueRange(before=when + _EPSILON, label=label)
+    if op == ">":
+        return DueRange(after=when, label=label)
+    return DueRange(after=when - _EPSILON, label=label)
+
+
+_FIELDS: Dict[str, Tuple[Tuple[str, ...], Callable[[str, str], Predicate]]] = {
+    "priority": ((":",), lambda op, v: Priority(v)),
+    "assigned": ((":",), lambda op, v: Assigned(v)),
+    "tag": ((":", ":~"), lambda op, v: Tag(v, partial=op == ":~")),
+    "due": ((":", "<", "<=", ">", ">="), _due_term),
+    "text": ((":",), lambda op, v: Text(v)),
+}
+
+
+def parse_term(term: str) -> Predicate:
+    """Compile a single query term such as ``tag:~ops`` or ``!completed``."""
+    negate = term.startswith("!")
+    body = term[1:] if negate else term
+    if not body:
+        raise QueryError("empty term")
+    m = _TERM.fullmatch(body)
+    if m is None:
+        pred = Completed() if body.lower() == "completed" else Text(body)
+    else:
+        field, op, value = m.group("field").lower(), m.group("op"), m.group("value")
+        if field not in _FIELDS:
+            raise QueryError(f"unknown field {field!r} in {term!r}")
+        ops, build = _FIELDS[field]
+        if op not in ops:
+            raise QueryError(f"{field} does not support {op!r} in {term!r}")
+        pred = build(op, value)
+    return Not(pred) if negate else pred
+
+
+class Query:
+    """Conjunction of predicates; every one must hold for a task to match."""
+
+    def __init__(self, predicates: Iterable[Predicate] = ()):
+        self.predicates: List[Predicate] = list(predicates)
+
+    @classmethod
+    def parse(cls, text: str) -> "Query":
+        """Compile the query language described in the module docstring."""
+        try:
+            terms = shlex.split(text)
+        except ValueError as exc:
+            raise QueryError(str(exc)) from None
+        return cls(parse_term(term) for term in terms)
+
+    @classmethod
+    def from_filters(
+        cls,
+        priority: Optional[str] = None,
+        tag: Optional[str] = None,
+        due: Optional[str] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        assigned: Optional[str] = None,
+        search: Optional[str] = None,
+        completed: Optional[bool] = None,
+    ) -> "Query":
+        """Query equivalent to combining the ``list`` filter options."""
+        preds: List[Predicate] = []
+        if priority:
+            preds.append(Priority(priority))
+        if tag:
+            preds.append(Tag(tag))
+        if due:
+            preds.append(DueMatching(due))
+        if due_after or due_before:
+            preds.append(DueRange(due_after, due_before))
+        if assigned:
+            preds.append(Assigned(assigned))
+        if search:
+            preds.append(Text(search))
+        if completed is not None:
+            preds.append(Completed() if completed else Not(Completed()))
+        return cls(preds)
+
+    def __and__(self, other: "Query") -> "Query":
+        return Query(self.predicates + other.predicates)
+
+    def __bool__(self) -> bool:
+        return bool(self.predicates)
+
+    def __str__(self) -> str:
+        return " ".join(str(p) for p in self.predicates) or "(all tasks)"
+
+    def matches(self, task: Task) -> bool:
+        return all(p.matches(task) for p in self.predicates)
+
+    def plan(self, todo: TodoList) -> "IndexPlan":
+        """Pick the predicate with the fewest index candidates to drive the scan.
+
+        On a columnar list, predicates that vectorize are first folded into
+        one `Columnar` candidate, unless there is just one and it has an
+        index of its own.
+        """
+        best: Optional[Tuple[int, Predicate, Optional[Collection[int]]]] = None
+        estimates: List[Tuple[Predicate, int]] = []
+        predicates = self._vectorized(todo)
+        for pred in predicates:
+            if pred.index is None:
+                continue
+            ids = None
+            n = pred.count(todo)
+            if n is None:
+                ids = pred.ids(todo)
+                if ids is None:
+                    continue
+                n = len(ids)
+            estimates.append((pred, n))
+            if best is None or n < best[0]:
+                best = (n, pred, ids)
+        return IndexPlan(self, todo, best, estimates, predicates)
+
+    def _vectorized(self, todo: TodoList) -> List[Predicate]:
+        columns = todo.columns()
+        if columns is None:
+            return self.predicates
+        masks = [(p, p.mask(columns)) for p in self.predicates]
+        vectorized = [(p, m) for p, m in masks if m is not None]
+        if not vectorized or (len(vectorized) == 1 and vectorized[0][0].index is not None):
+            return self.predicates
+        combined = columns.all()
+        for _, m in vectorized:
+            combined &= m
+        ids = columns.ids(combined).tolist()
+        rest = [p for p, m in masks if m is None]
+        return [Columnar([p for p, _ in vectorized], ids)] + rest
+
+    def pushdown_plan(
+        self,
+        query_fn: Callable[..., List[Task]],
+        describe: Optional[Callable[..., str]] = None,
+    ) -> "PushdownPlan":
+        """Send what a storage ``query`` can express; keep the rest as filters.
+
+        ``describe(**kwargs)``, when the storage offers one, adds its own
+        account of the push-down (e.g. which shards it reads) to `explain`.
+        """
+        kwargs: Dict[str, object] = {}
+        residual: List[Predicate] = []
+        for pred in self.predicates:
+            args = pred.pushdown()
+            if args is None or any(k in kwargs for k in args):
+                residual.append(pred)
+            else:
+                kwargs.update(args)
+        return PushdownPlan(self, query_fn, kwargs, residual, describe)
+
+
+def _filter(tasks: Iterable[Task], preds: List[Predicate]) -> List[Task]:
+    if not preds:
+        return tasks if isinstance(tasks, list) else list(tasks)
+    if len(preds) == 1:
+        return [t for t in tasks if preds[0].matches(t)]
+    checks = [p.matches for p in preds]
+    return [t for t in tasks if all(check(t) for check in checks)]
+
+
+def _matcher(preds: List[Predicate]) -> Optional[Callable[[Task], bool]]:
+    """One test for all of ``preds``, or None when there is nothing to test."""
+    if not preds:
+        return None
+    if len(preds) == 1:
+        return preds[0].matches
+    checks = [p.matches for p in preds]
+    return lambda task: all(check(task) for check in checks)
+
+
+class IndexPlan:
+    """In-memory plan: fetch the driver's candidates, filter the rest."""
+
+    def __init__(
+        self,
+        query: Query,
+        todo: TodoList,
+        driver: Optional[Tuple[int, Predicate, Optional[Collection[int]]]],
+        estimates: List[Tuple[Predicate, int]],
+        predicates: Optional[List[Predicate]] = None,
+    ):
+        self.query = query
+        self.todo = todo
+        self.estimates = estimates
+        self.driver = driver[1] if driver else None
+        self.estimate = driver[0] if driver else len(todo)
+        self._ids = driver[2] if driver else None
+        self.filters = [
+            p for p in (query.predicates if predicates is None else predicates)
+            if p is not self.driver or not p.exact
+        ]
+        self.scanned = 0
+        self.ordered = False
+
+    def execute(self) -> List[Task]:
+        """Run the plan; ``scanned`` then holds the number of tasks examined."""
+        if self.driver is None:
+            pool = self.todo.all_tasks()
+        else:
+            ids = self._ids if self._ids is not None else self.driver.ids(self.todo)
+            pool = self.todo.tasks_by_ids(ids)
+        self.scanned = len(pool)
+        return _filter(pool, self.filters)
+
+    def iter_execute(
+        self, sort: Optional[str] = None, after: Optional[Tuple] = None
+    ) -> Iterator[Task]:
+        """Lazy `execute`: yield matches as they are found, counting ``scanned``.
+
+        Without a driver the tasks are walked in place rather than copied,
+        so the list must not change until the iterator is exhausted. A
+        ``sort`` is then served from the `TodoList` sort index, starting
+        after key ``after``, and ``ordered`` is set; with a driver the
+        caller orders the (few) candidates itself.
+        """
+        self.ordered = self.driver is None and sort not in (None, "id")
+        if self.ordered:
+            pool: Iterable[Task] = self.todo.iter_sorted(sort, after)
+        elif self.driver is None:
+            pool = self.todo.iter_tasks()
+        else:
+            ids = self._ids if self._ids is not None else self.driver.ids(self.todo)
+            pool = self.todo.tasks_by_ids(ids)
+        return self._scan(pool)
+
+    def _scan(self, pool: Iterable[Task]) -> Iterator[Task]:
+        match = _matcher(self.filters)
+        # Feed the text index's hit ratio like `TodoList.search` does when
+        # the scan is the text search's own.
+        text = next((p for p in self.query.predicates if isinstance(p, Text)), None)
+        returned = 0
+        try:
+            for task in pool:
+                self.scanned += 1
+                if match is None or match(task):
+                    returned += 1
+                    yield task
+        finally:
+            if text is not None and self.driver in (None, text):
+                self.todo.index("text").record(self.scanned, returned)
+
+    def explain(self) -> str:
+        total = len(self.todo)
+        lines = [f"query: {self.query}"]
+        for pred, n in sorted(self.estimates, key=lambda e: e[1]):
+            lines.append(f"  estimate: {str(pred):<28} {pred.index} index, ~{n} of {total} tasks")
+        if self.driver is None:
+            lines.append(f"  1. scan all {total} tasks")
+        else:
+            lines.append(
+                f"  1. fetch {self.driver} from the {self.driver.index} index "
+                f"(~{self.estimate} of {total} tasks)"
+            )
+        if self.filters:
+            lines.append(f"  2. filter in one pass: {', '.join(str(p) for p in self.filters)}")
+        return "\n".join(lines)
+
+
+class PushdownPlan:
+    """Storage push-down plan: one ``query`` call, then the residual filters."""
+
+    def __init__(
+        self,
+        query: Query,
+        query_fn: Callable[..., List[Task]],
+        kwargs: Dict[str, object],
+        residual: List[Predicate],
+        describe: Optional[Callable[..., str]] = None,
+    ):
+        self.query = query
+        self.query_fn = query_fn
+        self.kwargs = kwargs
+        self.filters = residual
+        self.describe = describe
+        self.scanned = 0
+        self.ordered = False
+
+    def execute(self) -> List[Task]:
+        rows = self.query_fn(**self.kwargs)
+        self.scanned = len(rows)
+        return _filter(rows, self.filters)
+
+    def iter_execute(
+        self, sort: Optional[str] = None, after: Optional[Tuple] = None
+    ) -> Iterator[Task]:
+        """Lazy `execute` over the storage's rows, in id order (``ordered`` is False)."""
+        return self._scan(self.query_fn(**self.kwargs))
+
+    def _scan(self, rows: Iterable[Task]) -> Iterator[Task]:
+        match = _matcher(self.filters)
+        for task in rows:
+            self.scanned += 1
+            if match is None or match(task):
+                yield task
+
+    def explain(self) -> str:
+        args = ", ".join(
+            f"{k}={v.isoformat() if isinstance(v, datetime) else v!r}"
+            for k, v in self.kwargs.items()
+        )
+        lines = [f"query: {self.query}", f"  1. push down to storage: query({args})"]
+        if self.describe is not None:
+            lines.append(f"     {self.describe(**self.kwargs)}")
+        if self.filters:
+            lines.append(f"  2. filter in one pass: {', '.join(str(p) for p in self.filters)}")
+        return "\n".join(lines)
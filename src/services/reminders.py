@@ -0,0 +1,205 @@
+"""``todo remind``: fire reminders for due tasks from a `TimingWheel`.
+
+`ReminderScheduler` keeps at most one pending reminder per open task
+with a due moment (``time``, else ``due_date``), ``lead`` ahead of it.
+Recurring tasks are reminded of their next occurrence. The scheduler
+listens to its `TaskService`, so every add, update, completion or delete
+in the same process reschedules or cancels just that task. Each `poll`
+calls `TaskService.refresh`, a single version read while the store is
+unchanged; after another process writes, it reloads and reports each
+task that changed, so again only those tasks touch the wheel. The
+storage must keep a ``version`` for that; the scheduler refuses one
+that does not.
+"""
+
+import os
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+try:
+    from models.indexes import due_moment  # type: ignore
+    from models.recurrence import first_occurrence  # type: ignore
+    from models.task import Task  # type: ignore
+    from utils.timing_wheel import TimingWheel  # type: ignore
+    from utils.logger import get_logger  # type: ignore
+except Exception:  # pragma: no cover
+    from ..models.indexes import due_moment
+    from ..models.recurrence import first_occurrence
+    from ..models.task import Task
+    from ..utils.timing_wheel import TimingWheel
+    from ..utils.logger import get_logger
+
+_TICK = timedelta(microseconds=1)
+
+Notifier = Callable[[Task, datetime], None]
+
+
+def print_notifier(task: Task, due: datetime) -> None:
+    """Write one reminder line to stdout."""
+    print(f"{datetime.now():%Y-%m-%d %H:%M} Reminder: #{task.id} {task.description} "
+          f"(due {due:%Y-%m-%d %H:%M})", flush=True)
+
+
+class HookNotifier:
+    """Run a shell-style command per reminder without waiting for it.
+
+    The command gets the reminder text as its last argument and the task
+    in ``TODO_ID``, ``TODO_DESCRIPTION``, ``TODO_DUE`` and ``TODO_TAGS``.
+    Finished children are reaped on the next call.
+    """
+
+    def __init__(self, command: str):
+        self.argv = shlex.split(command)
+        self._running: List[subprocess.Popen] = []
+
+    def __call__(self, task: Task, due: datetime) -> None:
+        self._running = [p for p in self._running if p.poll() is None]
+        env = dict(
+            os.environ,
+            TODO_ID=str(task.id),
+            TODO_DESCRIPTION=task.description,
+            TODO_DUE=due.isoformat(),
+            TODO_TAGS=",".join(task.tags),
+        )
+        text = f"#{task.id} {task.description} (due {due:%Y-%m-%d %H:%M})"
+        try:
+            self._running.append(subprocess.Popen(
+                self.argv + [text], env=env, stdin=subprocess.DEVNULL
+            ))
+        except OSError as exc:
+            print(f"reminder hook failed: {exc}", file=sys.stderr)
+
+
+class ReminderScheduler:
+    """One `TimingWheel` timer per open dated task of ``svc``.
+
+    Raises `ValueError` for a storage without ``version`` (the snapshot
+    backend), whose changes by other processes it could never see.
+    """
+
+    def __init__(
+        self,
+        svc,
+        notify: Notifier = print_notifier,
+        lead: timedelta = timedelta(0),
+        tick: float = 1.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        if getattr(svc.storage, "version", None) is None:
+            raise ValueError(
+                f"{type(svc.storage).__name__} has no version counter, so reminders "
+                "would miss other processes' changes; use the json, journal, sharded "
+                "or sqlite backend"
+            )
+        self.svc = svc
+        self.notify = notify
+        self.lead = lead
+        self.clock = clock
+        self.logger = get_logger(__name__)
+        self.wheel = TimingWheel(tick, clock())
+        # Task id -> due moment of the reminder in the wheel, and of the
+        # last reminder fired (so a reload does not repeat it).
+        self._scheduled: Dict[int, datetime] = {}
+        self._reminded: Dict[int, datetime] = {}
+        self._lock = threading.Lock()
+        svc.add_listener(self._changed)
+
+    def close(self) -> None:
+        self.svc.remove_listener(self._changed)
+
+    def __len__(self) -> int:
+        return len(self._scheduled)
+
+    def reminder_for(self, task: Optional[Task], now: float) -> Optional[Tuple[float, datetime]]:
+        """``(reminder time, due moment)`` of the next reminder for ``task``.
+
+        That is for the first due moment after ``now`` not yet reminded
+        of. Inside the lead window the reminder time is ``now``.
+        """
+        if task is None or task.completed:
+            return None
+        due = due_moment(task)
+        if due is None:
+            return None
+        start = datetime.fromtimestamp(now)
+        reminded = self._reminded.get(task.id)
+        if reminded is not None and reminded >= start:
+            start = reminded
+        start += _TICK
+        if task.recurrence:
+            due = first_occurrence(task.recurrence, due, start)
+        elif due < start:
+            return None
+        return max((due - self.lead).timestamp(), now), due
+
+    def _set(self, task_id: int, task: Optional[Task], now: float) -> None:
+        """Bring ``task_id``'s timer in line with ``task``; caller holds the lock."""
+        if task is None:
+            self._reminded.pop(task_id, None)
+        reminder = self.reminder_for(task, now)
+        if reminder is None:
+            if self._scheduled.pop(task_id, None) is not None:
+                self.wheel.cancel(task_id)
+        elif self._scheduled.get(task_id) != reminder[1]:
+            self._scheduled[task_id] = reminder[1]
+            self.wheel.schedule(task_id, reminder[0], reminder[1])
+
+    def sync(self) -> int:
+        """Reconcile the wheel with every task; returns the number scheduled.
+
+        Run once at start-up, and only otherwise for a None notification.
+        Only tasks whose reminder changed touch the wheel.
+        """
+        now = self.clock()
+        # The loaded list, not a storage query, so `refresh` can track it.
+        tasks = self.svc.todo.all_tasks()
+        with self._lock:
+            seen = set()
+            for t in tasks:
+                seen.add(t.id)
+                self._set(t.id, t, now)
+            for tid in [tid for tid in self._scheduled if tid not in seen]:
+                self._set(tid, None, now)
+            return len(self._scheduled)
+
+    def _changed(self, task_id: Optional[int]) -> None:
+        """`TaskService` listener: reschedule one task, or all when None."""
+        if task_id is None:
+            self.sync()
+            return
+        task = self.svc.get(task_id)
+        with self._lock:
+            self._set(task_id, task, self.clock())
+
+    def poll(self) -> int:
+        """Pick up other processes' changes and fire what is due; returns the count fired.
+
+        `TaskService.refresh` notifies `_changed` of each task it reloaded.
+        """
+        if self.svc.refresh():
+            self.logger.info("Store changed; %s reminders scheduled", len(self))
+        now = self.clock()
+        with self._lock:
+            fired = self.wheel.advance(now)
+            for tid, _, _ in fired:
+                del self._scheduled[tid]
+        for tid, _, due in fired:
+            task = self.svc.get(tid)
+            if task is None:
+                continue
+            self.notify(task, due)
+            with self._lock:
+                self._reminded[tid] = due
+                self._set(tid, task, now)  # the next occurrence, if it recurs
+        return len(fired)
+
+    def run(self, stop: threading.Event, interval: Optional[float] = None) -> None:
+        """`poll` every ``interval`` seconds (default: one tick) until ``stop`` is set."""
+        interval = interval or self.wheel.tick
+        while not stop.wait(interval):
+            self.poll()
+
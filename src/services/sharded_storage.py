@@ -0,0 +1,413 @@
+import heapq
+import json
+import os
+import re
+import struct
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+try:
+    from models.task import Task  # type: ignore
+    from services.query import Query  # type: ignore
+    from services.storage_service import StorageService, iter_json_array  # type: ignore
+except Exception:  # pragma: no cover
+    from ..models.task import Task
+    from .query import Query
+    from .storage_service import StorageService, iter_json_array
+
+FORMAT = "todo-shards"
+_SLOT = struct.Struct("<H")
+_T = TypeVar("_T")
+# A due pattern starting with a literal month can only match that month,
+# unless a quantifier or other metacharacter right after it loosens the
+# month digits (``2026-10?`` also matches ``2026-11``).
+_MONTH_PREFIX = re.compile(r"\^?(\d{4})-(\d{2})(?=\Z|[^\\.^$*+?{}\[\]|()])")
+
+
+def shard_key(task: Task) -> str:
+    """Shard holding ``task``: ``open``/``done`` plus its due month.
+
+    Tasks without a due date are split by creation month instead, as
+    ``open-undated-2025-03``, so they do not pile up in one shard.
+    """
+    state = "done" if task.completed else "open"
+    due = task.due_date
+    if due is not None:
+        return f"{state}-{due:%Y-%m}"
+    return f"{state}-undated-{task.created_at:%Y-%m}"
+
+
+def _month_bounds(key: str) -> Optional[Tuple[datetime, datetime]]:
+    """[start, end) of the due month of shard ``key``; None if undated."""
+    month = key.split("-", 1)[1]
+    if month.startswith("undated"):
+        return None
+    year, mon = int(month[:4]), int(month[5:7])
+    start = datetime(year, mon, 1)
+    end = datetime(year + mon // 12, mon % 12 + 1, 1)
+    return start, end
+
+
+class ShardedStorageService(StorageService):
+    """Tasks partitioned into JSON shards by completion and due month.
+
+    ``<file>`` is a small JSON manifest recording, per shard, its file,
+    slot number, task count and id range, plus the next free id. Each
+    shard under ``<file>.shards/`` (``open-2026-10``, ``done-2024-03``,
+    ``open-undated``, ...) is a `StorageService`-format array sorted by id,
+    and ``ids.map`` holds the slot of each id's shard (two bytes per id).
+
+    `query` reads only the shards that can match: completed or open ones
+    for a ``completed`` filter, and months overlapping a due range or named
+    by a literal ``YYYY-MM`` due pattern. `get` reads the one shard named
+    by ``ids.map`` (falling back to the shards whose id range covers the
+    id should that hint be stale), and `append` rewrites only the one or
+    two shards a change touches.
+
+    Shard files are never modified in place: a write creates new files
+    tagged with the next generation, swaps the manifest atomically and then
+    removes the files it replaced. A reader that loses such a race simply
+    retries with the new manifest, so readers never take the lock.
+    """
+
+    def __init__(self, filepath: Path, compact: bool = False):
+        super().__init__(filepath, compact=compact)
+        self.shard_dir = self.filepath.with_name(self.filepath.name + ".shards")
+        self.id_map = self.shard_dir / "ids.map"
+        self._manifest: Optional[Tuple[Tuple[int, int, int], Dict[str, Any]]] = None
+
+    # -- manifest ----------------------------------------------------------
+
+    def manifest(self) -> Dict[str, Any]:
+        """The current manifest, re-read only when the file was replaced."""
+        try:
+            st = os.stat(self.filepath)
+        except FileNotFoundError:
+            return {"format": FORMAT, "generation": 0, "next_id": 1, "shards": {}}
+        sig = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if self._manifest is None or self._manifest[0] != sig:
+            with self.filepath.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, dict) or data.get("format") != FORMAT:
+                raise ValueError(f"{self.filepath} is not a sharded task store")
+            self._manifest = (sig, data)
+        return self._manifest[1]
+
+    def next_id(self) -> int:
+        """Id for the next new task; call with the lock held when adding."""
+        return self.manifest()["next_id"]
+
+    def reserve_ids(self, count: int = 1, floor: int = 1) -> int:
+        """`StorageService.reserve_ids`, never below the manifest's next id."""
+        with self.locked():
+            return self._store_lock.reserve(count, max(floor, self.next_id()))
+
+    def count(self) -> int:
+        return sum(meta["count"] for meta in self.manifest()["shards"].values())
+
+    # -- reading -----------------------------------------------------------
+
+    def _read_shard(self, meta: Dict[str, Any]) -> List[Dict[str, Any]]:
+        with (self.shard_dir / meta["file"]).open("r", encoding="utf-8") as f:
+            return list(iter_json_array(f))
+
+    def _consistent(self, read: Callable[[Dict[str, Any]], _T]) -> _T:
+        """Run ``read(manifest)``, retrying if a writer removed a shard under it."""
+        while True:
+            manifest = self.manifest()
+            try:
+                return read(manifest)
+            except FileNotFoundError:
+                if self.manifest() is manifest:
+                    raise  # not a race: the shard is really missing
+
+    def _select(
+        self,
+        shards: Dict[str, Dict[str, Any]],
+        completed: Optional[bool],
+        lo: Optional[datetime],
+        hi: Optional[datetime],
+        month: Optional[str],
+        needs_due: bool,
+    ) -> List[str]:
+        keys = []
+        for key in shards:
+            if completed is not None and key.startswith("done") != completed:
+                continue
+            bounds = _month_bounds(key)
+            if bounds is None:
+                if needs_due:
+                    continue
+            else:
+                if month is not None and key.split("-", 1)[1] != month:
+                    continue
+                if lo is not None and bounds[1] <= lo:
+                    continue
+                if hi is not None and bounds[0] >= hi:
+                    continue
+            keys.append(key)
+        return keys
+
+    def describe_query(self, **kwargs: Any) -> str:
+        """Which shards `query` would read for ``kwargs``, for ``--explain``."""
+        manifest = self.manifest()
+        keys = self._plan(manifest, **kwargs)
+        total = len(manifest["shards"])
+        tasks = sum(manifest["shards"][k]["count"] for k in keys)
+        names = ", ".join(keys[:6]) + (", ..." if len(keys) > 6 else "")
+        return f"read {len(keys)} of {total} shards ({tasks} tasks): {names or '-'}"
+
+    def _plan(
+        self,
+        manifest: Dict[str, Any],
+        due_pattern: Optional[str] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        completed: Optional[bool] = None,
+        **_: Any,
+    ) -> List[str]:
+        month = None
+        if due_pattern is not None and "|" not in due_pattern:
+            m = _MONTH_PREFIX.match(due_pattern)
+            if m:
+                month = f"{m.group(1)}-{m.group(2)}"
+        needs_due = due_pattern is not None or due_after is not None or due_before is not None
+        return self._select(manifest["shards"], completed, due_after, due_before, month, needs_due)
+
+    def _merged(self, manifest: Dict[str, Any], keys: Iterable[str]) -> Iterable[Dict[str, Any]]:
+        shards = [self._read_shard(manifest["shards"][k]) for k in keys]
+        if len(shards) == 1:
+            return shards[0]
+        return heapq.merge(*shards, key=lambda d: d["id"])
+
+    def load(self) -> List[Task]:
+        """Load every shard, merged in id order."""
+        return self.query()
+
+    def iter_load(self) -> Iterator[Task]:
+        return iter(self.load())
+
+    def query(
+        self,
+        priority: Optional[str] = None,
+        tag_pattern: Optional[str] = None,
+        due_pattern: Optional[str] = None,
+        search: Optional[str] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        assigned_to: Optional[str] = None,
+        completed: Optional[bool] = None,
+    ) -> List[Task]:
+        """Return tasks matching all given predicates, ordered by id.
+
+        Same semantics as `SqliteStorageService.query`; shards that cannot
+        hold a match are not read at all.
+        """
+        query = Query.from_filters(
+            priority=priority,
+            tag=tag_pattern,
+            due=due_pattern,
+            due_after=due_after,
+            due_before=due_before,
+            assigned=assigned_to,
+            search=search,
+            completed=completed,
+        )
+
+        def read(manifest: Dict[str, Any]) -> List[Task]:
+            keys = self._plan(
+                manifest,
+                due_pattern=due_pattern,
+                due_after=due_after,
+                due_before=due_before,
+                completed=completed,
+            )
+            tasks = (self._from_dict(d) for d in self._merged(manifest, keys))
+            if not query:
+                return list(tasks)
+            return [t for t in tasks if query.matches(t)]
+
+        return self._consistent(read)
+
+    def _slot_of(self, task_id: int) -> int:
+        """Shard slot ``ids.map`` records for ``task_id``; 0 if none."""
+        try:
+            with self.id_map.open("rb") as f:
+                f.seek(task_id * _SLOT.size)
+                raw = f.read(_SLOT.size)
+        except FileNotFoundError:
+            return 0
+        return _SLOT.unpack(raw)[0] if len(raw) == _SLOT.size else 0
+
+    def _locate(
+        self, manifest: Dict[str, Any], task_id: int
+    ) -> Optional[Tuple[str, List[Dict[str, Any]], Dict[str, Any]]]:
+        """Find the shard holding ``task_id``: its key, rows and the task's row."""
+        shards = manifest["shards"]
+        slot = self._slot_of(task_id)
+        hinted = [key for key, meta in shards.items() if meta["slot"] == slot]
+        # The map is updated after the manifest, so a reader can see a hint
+        # that is ahead of (or behind) its manifest; other shards are
+        # searched by id range if the hinted one does not hold the task.
+        candidates = [
+            (meta["count"], key) for key, meta in shards.items()
+            if meta["min_id"] <= task_id <= meta["max_id"] and key not in hinted
+        ]
+        for key in hinted + [key for _, key in sorted(candidates)]:
+            rows = self._read_shard(shards[key])
+            for d in rows:
+                if d["id"] == task_id:
+                    return key, rows, d
+        return None
+
+    def get(self, task_id: int) -> Optional[Task]:
+        """Return one task, reading only shards whose id range covers it."""
+        found = self._consistent(lambda manifest: self._locate(manifest, task_id))
+        return self._from_dict(found[2]) if found is not None else None
+
+    # -- writing -----------------------------------------------------------
+
+    def save(self, tasks: List[Task]) -> None:
+        """Repartition ``tasks`` into fresh shards, replacing the whole store."""
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for t in tasks:
+            groups.setdefault(shard_key(t), []).append(t.to_dict())
+        with self.locked():
+            old = self.manifest()
+            generation = old["generation"] + 1
+            shards = {}
+            slots = bytearray()
+            for slot, key in enumerate(sorted(groups), 1):
+                rows = sorted(groups[key], key=lambda d: d["id"])
+                shards[key] = self._write_shard(key, rows, generation, slot)
+                for d in rows:
+                    offset = d["id"] * _SLOT.size
+                    if len(slots) < offset + _SLOT.size:
+                        slots.extend(bytes(offset + _SLOT.size - len(slots)))
+                    _SLOT.pack_into(slots, offset, slot)
+            next_id = max([old["next_id"]] + [meta["max_id"] + 1 for meta in shards.values()])
+            self._commit(generation, next_id, shards, stale=old["shards"].values())
+            self.shard_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.id_map.with_name(self.id_map.name + ".tmp")
+            tmp.write_bytes(slots)
+            os.replace(tmp, self.id_map)
+            self.bytes_written += len(slots)
+            # Files of crashed writers are not in any manifest.
+            live = {meta["file"] for meta in shards.values()}
+            for path in self.shard_dir.glob("*.json"):
+                if path.name not in live:
+                    path.unlink()
+
+    def append(self, op: str, task_id: int, task: Optional[Task] = None) -> None:
+        """Apply one ``"put"`` or ``"delete"``, rewriting only affected shards."""
+        self.append_many([(op, task_id, task)])
+
+    def append_many(self, records: Iterable[Tuple[str, int, Optional[Task]]]) -> None:
+        """Apply ``(op, task_id, task)`` records in order as one commit.
+
+        Every shard the records touch is read and rewritten once, and the
+        manifest and id map are updated once.
+        """
+        records = list(records)
+        for op, _, _ in records:
+            if op not in ("put", "delete"):
+                raise ValueError(f"Unknown storage op: {op}")
+        if not records:
+            return
+        with self.locked():
+            old = self.manifest()
+            shards = dict(old["shards"])
+            # Current rows of every shard read so far, and where each
+            # record's task is once the records before it are applied.
+            rows: Dict[str, Dict[int, Dict[str, Any]]] = {}
+            where: Dict[int, Optional[str]] = {}
+            dirty = set()
+            slots: Dict[str, int] = {k: m["slot"] for k, m in shards.items()}
+            next_id = old["next_id"]
+
+            def shard_rows(key: str) -> Dict[int, Dict[str, Any]]:
+                if key not in rows:
+                    meta = shards.get(key)
+                    rows[key] = {} if meta is None else {d["id"]: d for d in self._read_shard(meta)}
+                return rows[key]
+
+            def locate(task_id: int) -> Optional[str]:
+                if task_id in where:
+                    return where[task_id]
+                slot = self._slot_of(task_id)
+                hinted = [key for key, meta in shards.items() if meta["slot"] == slot]
+                candidates = sorted(
+                    (meta["count"], key) for key, meta in shards.items()
+                    if meta["min_id"] <= task_id <= meta["max_id"] and key not in hinted
+                )
+                for key in hinted + [key for _, key in candidates]:
+                    if task_id in shard_rows(key):
+                        return key
+                return None
+
+            for op, task_id, task in records:
+                current = locate(task_id)
+                if current is not None:
+                    del shard_rows(current)[task_id]
+                    dirty.add(current)
+                if op == "put":
+                    key = shard_key(task)
+                    dirty.add(key)
+                    if key not in slots:
+                        slots[key] = 1 + max(slots.values(), default=0)
+                    shard_rows(key)[task_id] = task.to_dict()
+                    where[task_id] = key
+                    next_id = max(next_id, task_id + 1)
+                else:
+                    where[task_id] = None
+
+            generation = old["generation"] + 1
+            for key in dirty:
+                by_id = rows[key]
+                if by_id:
+                    shards[key] = self._write_shard(
+                        key, [by_id[i] for i in sorted(by_id)], generation, slots[key]
+                    )
+                else:
+                    shards.pop(key, None)
+            self._commit(
+                generation, next_id, shards,
+                stale=[old["shards"][k] for k in dirty if k in old["shards"]],
+            )
+            with self.id_map.open("r+b" if self.id_map.exists() else "wb") as f:
+                for task_id, key in where.items():
+                    f.seek(task_id * _SLOT.size)
+                    f.write(_SLOT.pack(0 if key is None else slots[key]))
+            self.bytes_written += _SLOT.size * len(where)
+
+    def _write_shard(
+        self, key: str, rows: List[Dict[str, Any]], generation: int, slot: int
+    ) -> Dict[str, Any]:
+        """Write a new shard file (invisible until the manifest names it)."""
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        name = f"{key}.{generation}.json"
+        with (self.shard_dir / name).open("w", encoding="utf-8") as f:
+            # Compact separators keep json on its C encoder; shards are
+            # rewritten on every change, so this dominates write cost.
+            json.dump(rows, f, separators=(",", ":"))
+            self.bytes_written += f.tell()
+        return {
+            "file": name, "slot": slot, "count": len(rows),
+            "min_id": rows[0]["id"], "max_id": rows[-1]["id"],
+        }
+
+    def _commit(
+        self,
+        generation: int,
+        next_id: int,
+        shards: Dict[str, Dict[str, Any]],
+        stale: Iterable[Dict[str, Any]],
+    ) -> None:
+        """Publish a new manifest, then drop the shard files it superseded."""
+        self._replace({
+            "format": FORMAT, "generation": generation, "next_id": next_id,
+            "shards": dict(sorted(shards.items())),
+        })
+        self._store_lock.bump()
+        for meta in stale:
+            (self.shard_dir / meta["file"]).unlink(missing_ok=True)
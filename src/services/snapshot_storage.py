@@ -0,0 +1,315 @@
+"""Binary, memory-mapped task snapshots.
+
+Layout (little-endian)::
+
+    header   magic "TODOSNAP", version, record size, task count, heap offset
+    records  one fixed-width record per task, in list order
+    heap     UTF-8 strings referenced by the records
+
+A record holds the id, a flag byte (completed / has tags / has assignee),
+the priority as a small code, the four datetimes as epoch microseconds,
+one heap offset followed by the lengths of the description, the
+NUL-joined tags, the assignee and (for priorities outside the known
+codes) the priority text, which are stored back to back, the
+recurrence rule as a one-byte code (0 for none) and the completion time
+as epoch microseconds.
+
+Older files are still read. Version 2 records are 8 bytes shorter, with
+no completion time, and read as tasks without one. Version 1 files,
+written before recurrence rules were stored, have the version 2 record
+size with zeros where the rule code is and read as tasks without a rule.
+
+The file is memory-mapped, so opening a store only reads the header; the
+push-down `query` walks the record region and decodes strings and
+datetimes only for the records a predicate needs or that are returned.
+"""
+
+import mmap
+import os
+import re
+import struct
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+try:
+    from models.recurrence import RULES  # type: ignore
+    from models.task import (  # type: ignore
+        Task, CompactTask, EpochTask, _NO_STAMP, _from_epoch, _to_epoch,
+    )
+    from parsers.regex_patterns import compile_cached  # type: ignore
+except Exception:  # pragma: no cover
+    from ..models.recurrence import RULES
+    from ..models.task import Task, CompactTask, EpochTask, _NO_STAMP, _from_epoch, _to_epoch
+    from ..parsers.regex_patterns import compile_cached
+
+MAGIC = b"TODOSNAP"
+VERSION = 3
+# Versions `_Mapping` reads; version 1 lacks the recurrence code and
+# versions 1 and 2 the completion time.
+READABLE_VERSIONS = (1, 2, 3)
+_HEADER = struct.Struct("<8sHHIQQ")
+# id, flags, priority code, priority length, due_date, time, created_at,
+# updated_at, heap offset, description/tags/assignee lengths, recurrence,
+# completed_at
+_RECORD = struct.Struct("<qBBB4qQIIHB2xq")
+_RECORD_V2 = struct.Struct("<qBBB4qQIIHB2x")
+
+_COMPLETED = 1
+_HAS_TAGS = 2
+_HAS_ASSIGNEE = 4
+
+_PRIORITY_CODES = {None: 0, "high": 1, "medium": 2, "low": 3}
+_PRIORITY_NAMES = {code: name for name, code in _PRIORITY_CODES.items()}
+_OTHER_PRIORITY = 255
+_RULE_CODES = {rule: code for code, rule in enumerate(RULES, 1)}
+_RULE_NAMES = {code: rule for rule, code in _RULE_CODES.items()}
+
+
+class _Mapping:
+    """An open, memory-mapped snapshot file."""
+
+    def __init__(self, path: Path):
+        self.file = path.open("rb")
+        self.signature = _signature(os.fstat(self.file.fileno()))
+        try:
+            self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise ValueError(f"{path} is not a task snapshot") from None
+        if len(self.mm) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not a task snapshot")
+        magic, version, _, record_size, self.count, self.heap = _HEADER.unpack_from(self.mm)
+        self.record = _RECORD if version == VERSION else _RECORD_V2
+        if magic != MAGIC or version not in READABLE_VERSIONS or record_size != self.record.size:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} task snapshot")
+
+    def close(self) -> None:
+        self.mm.close()
+        self.file.close()
+
+    def records(self) -> Iterator[Tuple]:
+        """Unpack the records in place, without copying the record region.
+
+        The view is released once iteration ends, as the map cannot be
+        closed while it is exported. Records of older versions are padded
+        to the current field count.
+        """
+        start = _HEADER.size
+        view = memoryview(self.mm)[start:start + self.count * self.record.size]
+        it = self.record.iter_unpack(view)
+        unpacked = it if self.record is _RECORD else (rec + (_NO_STAMP,) for rec in it)
+        try:
+            yield from unpacked
+        finally:
+            del unpacked, it
+            view.release()
+
+    def text(self, rec: Tuple) -> Tuple[str, List[str], Optional[str], Optional[str]]:
+        """Decode the description, tags, assignee and priority of ``rec``."""
+        mm = self.mm
+        flags = rec[1]
+        pos = self.heap + rec[8]
+        end = pos + rec[9]
+        desc = mm[pos:end].decode()
+        tags = []
+        if flags & _HAS_TAGS:
+            tags = mm[end:end + rec[10]].decode().split("\0")
+        end += rec[10]
+        assigned = None
+        if flags & _HAS_ASSIGNEE:
+            assigned = mm[end:end + rec[11]].decode()
+        code = rec[2]
+        if code == _OTHER_PRIORITY:
+            end += rec[11]
+            priority = mm[end:end + rec[3]].decode()
+        else:
+            priority = _PRIORITY_NAMES[code]
+        return desc, tags, assigned, priority
+
+
+def _signature(st: os.stat_result) -> Tuple[int, int, int]:
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+class SnapshotStorageService:
+    """Task storage in a compact binary snapshot read through ``mmap``.
+
+    Every `save` writes a whole new snapshot (there is no `append`), so it
+    suits stores that are read far more often than written. Opening is
+    constant time; `count` reads the header and `query` answers the
+    `TaskService` filters from the mapped records without building a
+    `TodoList`. Convert to and from JSON with ``todo migrate``.
+    """
+
+    def __init__(self, filepath: Path, compact: bool = False):
+        if not isinstance(filepath, Path):
+            filepath = Path(filepath)
+        self.filepath = filepath
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        self.task_cls = CompactTask if compact else Task
+        self._from_epochs = CompactTask.from_epochs if compact else EpochTask.from_epochs
+        self.bytes_written = 0
+        self._mapping: Optional[_Mapping] = None
+
+    def close(self) -> None:
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+
+    def _mapped(self) -> Optional[_Mapping]:
+        """The current file's mapping, re-opened if the file was replaced."""
+        try:
+            st = self.filepath.stat()
+        except FileNotFoundError:
+            self.close()
+            return None
+        if st.st_size == 0:
+            self.close()
+            return None
+        if self._mapping is None or self._mapping.signature != _signature(st):
+            self.close()
+            self._mapping = _Mapping(self.filepath)
+        return self._mapping
+
+    def count(self) -> int:
+        """Number of stored tasks, read from the header."""
+        m = self._mapped()
+        return m.count if m is not None else 0
+
+    def load(self) -> List[Task]:
+        """Decode every record in stored order.
+
+        This builds one task per record up front (their datetimes still
+        decode on access), so a full load costs time proportional to the
+        store; `count` and `query` are the fast paths.
+        """
+        return self.query()
+
+    def save(self, tasks: List[Task]) -> None:
+        """Write ``tasks`` as a new snapshot and atomically replace the file."""
+        records = bytearray()
+        heap = bytearray()
+        pack = _RECORD.pack
+        for t in tasks:
+            desc = t.description.encode("utf-8")
+            tags = t.tags
+            tag_bytes = "\0".join(tags).encode("utf-8")
+            assigned = t.assigned_to
+            asn = assigned.encode("utf-8") if assigned is not None else b""
+            code = _PRIORITY_CODES.get(t.priority, _OTHER_PRIORITY)
+            prio = t.priority.encode("utf-8") if code == _OTHER_PRIORITY else b""
+            flags = (
+                (_COMPLETED if t.completed else 0)
+                | (_HAS_TAGS if tags else 0)
+                | (_HAS_ASSIGNEE if assigned is not None else 0)
+            )
+            records += pack(
+                t.id, flags, code, len(prio),
+                _to_epoch(t.due_date), _to_epoch(t.time),
+                _to_epoch(t.created_at), _to_epoch(t.updated_at),
+                len(heap), len(desc), len(tag_bytes), len(asn),
+                _RULE_CODES.get(t.recurrence, 0), _to_epoch(t.completed_at),
+            )
+            heap += desc
+            heap += tag_bytes
+            heap += asn
+            heap += prio
+        header = _HEADER.pack(
+            MAGIC, VERSION, 0, _RECORD.size, len(tasks), _HEADER.size + len(records)
+        )
+        tmp = self.filepath.with_name(self.filepath.name + ".tmp")
+        with tmp.open("wb") as f:
+            f.write(header)
+            f.write(records)
+            f.write(heap)
+        # Unmap first: some platforms refuse to replace a mapped file.
+        self.close()
+        os.replace(tmp, self.filepath)
+        self.bytes_written += len(header) + len(records) + len(heap)
+
+    def query(
+        self,
+        priority: Optional[str] = None,
+        tag_pattern: Optional[str] = None,
+        due_pattern: Optional[str] = None,
+        search: Optional[str] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        assigned_to: Optional[str] = None,
+        completed: Optional[bool] = None,
+    ) -> List[Task]:
+        """Return tasks matching all given predicates, in stored order.
+
+        Same semantics as `SqliteStorageService.query`. Priority, completion
+        and due range tests compare record integers; tag, assignee and search tests
+        decode only the strings of records that passed the cheaper checks.
+        """
+        m = self._mapped()
+        if m is None:
+            return []
+        int_checks: List[Callable[[Tuple], bool]] = []
+        text_checks: List[Callable[[str, List[str], Optional[str]], bool]] = []
+        if priority is not None:
+            code = _PRIORITY_CODES.get(priority)
+            if code is None:
+                text_checks.append(lambda d, tags, a, p: p == priority)
+            else:
+                int_checks.append(lambda rec: rec[2] == code)
+        if completed is not None:
+            int_checks.append(lambda rec: bool(rec[1] & _COMPLETED) == completed)
+        if due_after is not None or due_before is not None:
+            lo = _to_epoch(due_after) if due_after is not None else _NO_STAMP
+            hi = _to_epoch(due_before) if due_before is not None else (1 << 63) - 1
+            int_checks.append(lambda rec: rec[4] != _NO_STAMP and lo < rec[4] < hi)
+        if due_pattern is not None:
+            regex = compile_cached(due_pattern, 0)
+            seen = {}
+
+            def due_matches(rec: Tuple) -> bool:
+                us = rec[4]
+                hit = seen.get(us)
+                if hit is None:
+                    hit = seen[us] = us != _NO_STAMP and bool(
+                        regex.search(_from_epoch(us).isoformat())
+                    )
+                return hit
+
+            int_checks.append(due_matches)
+        if assigned_to is not None:
+            target = assigned_to.encode("utf-8")
+
+            def assigned_matches(rec: Tuple) -> bool:
+                if not rec[1] & _HAS_ASSIGNEE or rec[11] != len(target):
+                    return False
+                pos = m.heap + rec[8] + rec[9] + rec[10]
+                return m.mm[pos:pos + len(target)] == target
+
+            int_checks.append(assigned_matches)
+        if tag_pattern is not None:
+            tag_re = compile_cached(tag_pattern, re.IGNORECASE)
+            text_checks.append(lambda d, tags, a, p: any(tag_re.fullmatch(t) for t in tags))
+        if search is not None:
+            search_re = compile_cached(search, re.IGNORECASE)
+            text_checks.append(
+                lambda d, tags, a, p: bool(search_re.search(d))
+                or any(search_re.search(t) for t in tags)
+            )
+        results = []
+        make = self._from_epochs
+        text = m.text
+        for rec in m.records():
+            if int_checks and not all(check(rec) for check in int_checks):
+                continue
+            desc, tags, assigned, prio = text(rec)
+            if text_checks and not all(check(desc, tags, assigned, prio) for check in text_checks):
+                continue
+            results.append(
+                make(
+                    rec[0], desc, tags, prio, assigned, bool(rec[1] & _COMPLETED),
+                    rec[4:8] + (rec[13],),
+                    _RULE_NAMES.get(rec[12]),
+                )
+            )
+        return results
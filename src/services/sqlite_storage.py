@@ -0,0 +1,360 @@
+import json
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+try:
+    from models.task import Task, LazyTask, CompactTask  # type: ignore
+    from parsers.regex_patterns import LITERAL_TAG, compile_cached  # type: ignore
+except Exception:  # pragma: no cover
+    from ..models.task import Task, LazyTask, CompactTask
+    from ..parsers.regex_patterns import LITERAL_TAG, compile_cached
+
+
+# AUTOINCREMENT keeps ids of deleted tasks from being handed out again.
+_TASKS_TABLE = """
+CREATE TABLE IF NOT EXISTS {name} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    description TEXT NOT NULL,
+    tags TEXT NOT NULL DEFAULT '[]',
+    priority TEXT,
+    due_date TEXT,
+    assigned_to TEXT,
+    time TEXT,
+    completed INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    recurrence TEXT,
+    completed_at TEXT
+);
+"""
+
+_SCHEMA = _TASKS_TABLE.format(name="tasks") + """
+CREATE TABLE IF NOT EXISTS task_tags (
+    task_id INTEGER NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (task_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority);
+CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks(due_date);
+CREATE INDEX IF NOT EXISTS idx_tasks_completed ON tasks(completed);
+CREATE INDEX IF NOT EXISTS idx_tasks_assigned_to ON tasks(assigned_to);
+CREATE INDEX IF NOT EXISTS idx_task_tags_tag ON task_tags(tag COLLATE NOCASE);
+"""
+
+_FIELDS = (
+    "description, tags, priority, due_date, assigned_to, time, "
+    "completed, created_at, updated_at, recurrence, completed_at"
+)
+_COLUMNS = "id, " + _FIELDS
+_MARKS = ", ".join("?" * _FIELDS.count(","))
+_INSERT = f"INSERT INTO tasks ({_FIELDS}) VALUES (?, {_MARKS})"
+_INSERT_WITH_ID = f"INSERT INTO tasks ({_COLUMNS}) VALUES (?, ?, {_MARKS})"
+_UPSERT = (
+    _INSERT_WITH_ID + " "
+    "ON CONFLICT(id) DO UPDATE SET "
+    + ", ".join(f"{c.strip()} = excluded.{c.strip()}" for c in _FIELDS.split(","))
+)
+
+def _regexp(pattern: str, value: Optional[str]) -> bool:
+    """SQL ``REGEXP`` operator: case-sensitive search."""
+    return value is not None and compile_cached(pattern, 0).search(value) is not None
+
+
+def _regexp_i(pattern: str, value: Optional[str]) -> bool:
+    """Case-insensitive regex search."""
+    return value is not None and compile_cached(pattern, re.IGNORECASE).search(value) is not None
+
+
+def _fullmatch_i(pattern: str, value: Optional[str]) -> bool:
+    """Case-insensitive regex full match."""
+    return value is not None and compile_cached(pattern, re.IGNORECASE).fullmatch(value) is not None
+
+
+class SqliteStorageService:
+    """SQLite-backed task storage with filter push-down.
+
+    Tasks live in an indexed ``tasks`` table with a ``task_tags`` join table.
+    Besides the `load`/`save` contract of `StorageService` it accepts
+    single-task `append` records and answers `query` directly in SQL, which
+    lets `TaskService` filter without loading every task into memory.
+    `insert` lets SQLite assign the id of a new task and `get` reads one
+    row, so `TaskService` mutates single rows without loading the table,
+    and processes sharing the database never hand out the same id.
+    `version` lets a loaded list notice other processes' commits.
+
+    The one connection is shared by every thread (a write-behind flusher
+    included), so each use of it holds ``_lock`` and transactions from
+    different threads never interleave.
+    """
+
+    def __init__(self, filepath: Path, compact: bool = False):
+        if not isinstance(filepath, Path):
+            filepath = Path(filepath)
+        self.filepath = filepath
+        self.task_cls = CompactTask if compact else Task
+        self._from_dict = CompactTask.from_dict if compact else LazyTask.from_dict
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(filepath), check_same_thread=False)
+        self._lock = threading.RLock()
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.create_function("REGEXP", 2, _regexp, deterministic=True)
+        self.conn.create_function("regexp_i", 2, _regexp_i, deterministic=True)
+        self.conn.create_function("fullmatch_i", 2, _fullmatch_i, deterministic=True)
+        self.conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(tasks)")}
+        # Stores created before tasks could recur or recorded when they
+        # were completed.
+        for column in ("recurrence", "completed_at"):
+            if column not in columns:
+                with self.conn:
+                    self.conn.execute(f"ALTER TABLE tasks ADD COLUMN {column} TEXT")
+        if not self._autoincrement():
+            self._migrate_autoincrement()
+
+    def _autoincrement(self) -> bool:
+        row = self.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'tasks'"
+        ).fetchone()
+        return "AUTOINCREMENT" in row[0].upper()
+
+    @contextmanager
+    def _immediate(self) -> Iterator[None]:
+        """A transaction holding the write lock from its first statement."""
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self.conn.rollback()
+                raise
+            self.conn.commit()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """``with self.conn`` for this thread alone."""
+        with self._lock, self.conn:
+            yield
+
+    def _migrate_autoincrement(self) -> None:
+        """Rebuild a ``tasks`` table created before ids were AUTOINCREMENT."""
+        # Dropping the old table must not cascade to task_tags.
+        self.conn.execute("PRAGMA foreign_keys = OFF")
+        try:
+            with self._immediate():
+                if not self._autoincrement():  # another process may have won
+                    self.conn.execute(_TASKS_TABLE.format(name="tasks_new"))
+                    self.conn.execute(
+                        f"INSERT INTO tasks_new ({_COLUMNS}) SELECT {_COLUMNS} FROM tasks"
+                    )
+                    self.conn.execute("DROP TABLE tasks")
+                    self.conn.execute("ALTER TABLE tasks_new RENAME TO tasks")
+        finally:
+            self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(_SCHEMA)  # indexes dropped with the old table
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    def load(self) -> List[Task]:
+        """Load every task ordered by id."""
+        return self.query()
+
+    def save(self, tasks: List[Task]) -> None:
+        """Replace the stored tasks with `tasks` in a single transaction."""
+        with self._transaction():
+            self.conn.execute("DELETE FROM task_tags")
+            self.conn.execute("DELETE FROM tasks")
+            self._insert(tasks)
+
+    def get(self, task_id: int) -> Optional[Task]:
+        """The task with ``task_id``, or None; reads just that row."""
+        with self._lock:
+            row = self.conn.execute(
+                f"SELECT {_COLUMNS} FROM tasks WHERE id = ?", (task_id,)
+            ).fetchone()
+        return self._row_to_task(row) if row is not None else None
+
+    def version(self) -> int:
+        """Counter that moves whenever another connection commits.
+
+        SQLite's ``PRAGMA data_version``: commits made through this
+        connection leave it alone, as `TaskService` expects of a store
+        version read after its own writes.
+        """
+        with self._lock:
+            return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def next_id(self) -> int:
+        """Id SQLite would give the next inserted task."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'tasks'), 0),"
+                " COALESCE((SELECT MAX(id) FROM tasks), 0))"
+            ).fetchone()
+        return row[0] + 1
+
+    def reserve_ids(self, count: int = 1, floor: int = 1) -> int:
+        """Reserve ``count`` consecutive ids for tasks added in memory.
+
+        The AUTOINCREMENT counter is moved past them, so `insert` in any
+        process never hands them out; returns the first.
+        """
+        with self._immediate():
+            start = max(self.next_id(), floor)
+            last = start + count - 1
+            cur = self.conn.execute(
+                "UPDATE sqlite_sequence SET seq = ? WHERE name = 'tasks'", (last,)
+            )
+            if cur.rowcount == 0:
+                self.conn.execute(
+                    "INSERT INTO sqlite_sequence (name, seq) VALUES ('tasks', ?)", (last,)
+                )
+        return start
+
+    def insert(self, task: Task) -> Task:
+        """Store a new task under an id SQLite assigns, set on ``task``."""
+        with self._transaction():
+            cur = self.conn.execute(_INSERT, self._values(task.to_dict()))
+            task.id = cur.lastrowid
+            self._insert_tags(task.id, task.tags)
+        return task
+
+    def append(self, op: str, task_id: int, task: Optional[Task] = None) -> None:
+        """Apply a single ``"put"`` or ``"delete"`` mutation."""
+        self.append_many([(op, task_id, task)])
+
+    def append_many(self, records: Iterable[Tuple[str, int, Optional[Task]]]) -> None:
+        """Apply ``(op, task_id, task)`` mutations in one transaction.
+
+        A ``"put"`` updates the row in place, or inserts it under its id.
+        """
+        with self._transaction():
+            for op, task_id, task in records:
+                if op == "delete":
+                    self.conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+                elif op == "put":
+                    d = task.to_dict()
+                    self.conn.execute(_UPSERT, (d["id"],) + self._values(d))
+                    self.conn.execute("DELETE FROM task_tags WHERE task_id = ?", (task_id,))
+                    self._insert_tags(task_id, d["tags"])
+                else:
+                    raise ValueError(f"Unknown storage op: {op}")
+
+    def query(
+        self,
+        priority: Optional[str] = None,
+        tag_pattern: Optional[str] = None,
+        due_pattern: Optional[str] = None,
+        search: Optional[str] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        assigned_to: Optional[str] = None,
+        completed: Optional[bool] = None,
+    ) -> List[Task]:
+        """Return tasks matching all given predicates, ordered by id.
+
+        Predicates mirror the `TaskService` filters: exact priority,
+        assignee and completion state, tag
+        regex full match, due-date ISO regex search and case-insensitive
+        regex search over description and tags, plus an exclusive due-date
+        range answered from the ``due_date`` index. Invalid regexes raise
+        `re.error` before any SQL runs.
+        """
+        where: List[str] = []
+        params: List[Any] = []
+        if priority is not None:
+            where.append("priority = ?")
+            params.append(priority)
+        if assigned_to is not None:
+            where.append("assigned_to = ?")
+            params.append(assigned_to)
+        if completed is not None:
+            where.append("completed = ?")
+            params.append(int(completed))
+        if tag_pattern is not None:
+            if LITERAL_TAG.fullmatch(tag_pattern):
+                cond = "tt.tag = ? COLLATE NOCASE"
+            else:
+                compile_cached(tag_pattern, re.IGNORECASE)
+                cond = "fullmatch_i(?, tt.tag)"
+            where.append(
+                "EXISTS (SELECT 1 FROM task_tags tt "
+                f"WHERE tt.task_id = tasks.id AND {cond})"
+            )
+            params.append(tag_pattern)
+        if due_pattern is not None:
+            compile_cached(due_pattern, 0)
+            where.append("due_date IS NOT NULL AND due_date REGEXP ?")
+            params.append(due_pattern)
+        if due_after is not None:
+            where.append("due_date > ?")
+            params.append(due_after.isoformat())
+        if due_before is not None:
+            where.append("due_date < ?")
+            params.append(due_before.isoformat())
+        if search is not None:
+            compile_cached(search, re.IGNORECASE)
+            where.append(
+                "(regexp_i(?, description) OR EXISTS (SELECT 1 FROM task_tags tt "
+                "WHERE tt.task_id = tasks.id AND regexp_i(?, tt.tag)))"
+            )
+            params.extend([search, search])
+        sql = f"SELECT {_COLUMNS} FROM tasks"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id"
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [self._row_to_task(r) for r in rows]
+
+    @staticmethod
+    def _values(d: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Column values of task dict ``d``, in `_FIELDS` order."""
+        return (
+            d["description"], json.dumps(d["tags"]), d["priority"],
+            d["due_date"], d["assigned_to"], d["time"], int(d["completed"]),
+            d["created_at"], d["updated_at"], d["recurrence"], d["completed_at"],
+        )
+
+    def _insert_tags(self, task_id: int, tags: List[str]) -> None:
+        self.conn.executemany(
+            "INSERT INTO task_tags (task_id, position, tag) VALUES (?, ?, ?)",
+            [(task_id, i, tag) for i, tag in enumerate(tags)],
+        )
+
+    def _insert(self, tasks: Iterable[Task]) -> None:
+        rows: List[Tuple[Any, ...]] = []
+        tag_rows: List[Tuple[int, int, str]] = []
+        for t in tasks:
+            d = t.to_dict()
+            rows.append((d["id"],) + self._values(d))
+            tag_rows.extend((d["id"], i, tag) for i, tag in enumerate(d["tags"]))
+        self.conn.executemany(_INSERT_WITH_ID, rows)
+        self.conn.executemany(
+            "INSERT INTO task_tags (task_id, position, tag) VALUES (?, ?, ?)",
+            tag_rows,
+        )
+
+    def _row_to_task(self, row: Tuple[Any, ...]) -> Task:
+        d: Dict[str, Any] = {
+            "id": row[0],
+            "description": row[1],
+            "tags": json.loads(row[2]),
+            "priority": row[3],
+            "due_date": row[4],
+            "assigned_to": row[5],
+            "time": row[6],
+            "completed": bool(row[7]),
+            "created_at": row[8],
+            "updated_at": row[9],
+            "recurrence": row[10],
+            "completed_at": row[11],
+        }
+        return self._from_dict(d)
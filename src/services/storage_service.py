@@ -1,38 +1,240 @@
+"""Application services for task orchestration and storage."""
+
+
 import json
+import os
+import re
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List
+from typing import Any, BinaryIO, Iterator, List, Optional, TextIO
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
 try:
     # When imported as top-level module with PYTHONPATH=src
-    from models.task import Task  # type: ignore
+    from models.task import Task, LazyTask, CompactTask  # type: ignore
 except Exception:  # pragma: no cover
     # When imported as part of the src package (python -m src.main)
-    from ..models.task import Task
+    from ..models.task import Task, LazyTask, CompactTask
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_SEPARATORS = re.compile(r"[ \t\n\r,]*")
+
+
+def iter_json_array(f: TextIO, chunk_size: int = 1 << 20) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array read incrementally.
+
+    Only about one chunk of text and its decoded elements are held in memory,
+    instead of the whole file and every decoded element at once. Elements
+    ending in ``}`` are decoded a chunk at a time in a single `json.loads`
+    call; anything that does not split cleanly falls back to decoding one
+    element at a time.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+    batch_ok = True
+
+    def more() -> bool:
+        nonlocal buf, pos, eof, batch_ok
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        batch_ok = True
+        return True
+
+    def skip(pattern: "re.Pattern[str]") -> None:
+        nonlocal pos
+        while True:
+            pos = pattern.match(buf, pos).end()
+            if pos < len(buf) or not more():
+                return
+
+    skip(_WHITESPACE)
+    if pos >= len(buf):
+        return  # empty file
+    if buf[pos] != "[":
+        raise json.JSONDecodeError("Expected a JSON array", buf, pos)
+    pos += 1
+    while True:
+        skip(_SEPARATORS)
+        if pos >= len(buf):
+            raise json.JSONDecodeError("Unterminated JSON array", buf, pos)
+        if buf[pos] == "]":
+            return
+        if batch_ok:
+            # Everything up to the last "}" is a run of whole elements unless
+            # that brace is nested or inside a string, in which case the
+            # bracketed text is not valid JSON and we fall back below.
+            cut = buf.rfind("}", pos) + 1
+            if cut > pos:
+                try:
+                    values = json.loads("[" + buf[pos:cut] + "]")
+                except json.JSONDecodeError:
+                    batch_ok = False
+                else:
+                    pos = cut
+                    yield from values
+                    continue
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if more():
+                continue
+            raise
+        if end == len(buf) and not eof and more():
+            # A scalar may continue in the next chunk; decode it again.
+            continue
+        pos = end
+        yield value
+
+
+class StoreLock:
+    """Advisory inter-process write lock and version counter for one store.
+
+    Writers hold an exclusive `fcntl.flock` on the ``<file>.lock`` sidecar
+    while they commit, and `bump` the version kept in its first bytes after
+    each write. The next bytes hold the id high-water mark `reserve` hands
+    new task ids out from. Readers never take the lock: they call
+    `version` before loading, and a store replaced atomically is never
+    seen half-written.
+    The lock is re-entrant within a process. Where `fcntl` is missing
+    (Windows) only threads of one process are serialized.
+    """
+
+    _WIDTH = 20
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._file: Optional[BinaryIO] = None
+
+    def _fd(self) -> int:
+        if self._file is None:
+            # Kept open for the life of the store so each commit costs only
+            # a flock call; it is closed (and any flock dropped) on collection.
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            self._file = os.fdopen(fd, "r+b", buffering=0)
+        return self._file.fileno()
+
+    def version(self) -> int:
+        """Number of commits made to the store; 0 for a new store."""
+        if self._file is None and not self.path.exists():
+            return 0
+        try:
+            return int(os.pread(self._fd(), self._WIDTH, 0))
+        except ValueError:
+            return 0
+
+    @contextmanager
+    def held(self) -> Iterator[None]:
+        with self._thread_lock:
+            if self._depth == 0 and fcntl is not None:
+                fcntl.flock(self._fd(), fcntl.LOCK_EX)
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0 and fcntl is not None:
+                    fcntl.flock(self._fd(), fcntl.LOCK_UN)
+
+    def bump(self) -> int:
+        """Increment the version; call with the lock held, after writing."""
+        version = self.version() + 1
+        os.pwrite(self._fd(), b"%0*d" % (self._WIDTH, version), 0)
+        return version
+
+    def reserve(self, count: int, floor: int) -> int:
+        """Hand out ``count`` consecutive ids, the first at least ``floor``.
+
+        Call with the lock held. Ids handed out once are never handed out
+        again, whether or not their tasks were written yet.
+        """
+        try:
+            mark = int(os.pread(self._fd(), self._WIDTH, self._WIDTH))
+        except ValueError:
+            mark = 0
+        start = max(mark, floor)
+        os.pwrite(self._fd(), b"%0*d" % (self._WIDTH, start + count), self._WIDTH)
+        return start
 
 
 class StorageService:
-    """Simple JSON file-backed storage for tasks."""
+    """Simple JSON file-backed storage for tasks.
+
+    With ``compact=True`` tasks are loaded (and, via `task_cls`, created by
+    `TaskService`) as `CompactTask` to reduce memory on very large stores.
+
+    Saves replace the file atomically under a `StoreLock`, so concurrent
+    processes never read a torn file; `TaskService` uses `version` and
+    `locked` to detect and merge writes made by other processes.
+    """
 
-    def __init__(self, filepath: Path):
+    def __init__(self, filepath: Path, compact: bool = False):
         # Accept both string and Path inputs for convenience in tests and CLI
         if not isinstance(filepath, Path):
             filepath = Path(filepath)
         self.filepath = filepath
         self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        self.task_cls = CompactTask if compact else Task
+        self._from_dict = CompactTask.from_dict if compact else LazyTask.from_dict
+        # Running total of bytes written, reported by `TaskService` metrics.
+        self.bytes_written = 0
+        self._store_lock = StoreLock(self.filepath.with_name(self.filepath.name + ".lock"))
+
+    def version(self) -> int:
+        """Store version, bumped by every write from any process."""
+        return self._store_lock.version()
+
+    def locked(self):
+        """Context manager holding the store's inter-process write lock."""
+        return self._store_lock.held()
+
+    def reserve_ids(self, count: int = 1, floor: int = 1) -> int:
+        """Reserve ``count`` consecutive ids for new tasks; returns the first.
+
+        ``floor`` is one past the highest id the caller knows of. Processes
+        sharing the store get disjoint ids even before either has written,
+        so an id assigned in memory is the id the task is stored under.
+        """
+        with self.locked():
+            return self._store_lock.reserve(count, floor)
 
     def load(self) -> List[Task]:
         """Load tasks list from JSON; return empty list if file missing."""
+        return list(self.iter_load())
+
+    def iter_load(self) -> Iterator[Task]:
+        """Stream tasks from the JSON file, decoding dates lazily."""
         if not self.filepath.exists():
-            return []
+            return
         with self.filepath.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-        try:
-            from models.task import Task as T  # type: ignore
-        except Exception:  # pragma: no cover
-            from ..models.task import Task as T
-        return [T.from_dict(d) for d in data]
+            for d in iter_json_array(f):
+                yield self._from_dict(d)
 
     def save(self, tasks: List[Task]) -> None:
         """Persist tasks to disk in a stable JSON representation."""
         data = [t.to_dict() for t in tasks]
-        with self.filepath.open("w", encoding="utf-8") as f:
+        with self.locked():
+            self._replace(data)
+            self._store_lock.bump()
+
+    def _replace(self, data: List[Any]) -> None:
+        """Write ``data`` to a temporary file and rename it over the store.
+
+        Call with the lock held; the temporary name is shared by writers.
+        """
+        tmp = self.filepath.with_name(self.filepath.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
             json.dump(data, f, indent=2)
+            self.bytes_written += f.tell()
+        os.replace(tmp, self.filepath)
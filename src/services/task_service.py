@@ -1,17 +1,87 @@
-from typing import List
+import atexit
+import copy
+import heapq
+import os
+import threading
+from collections import deque
+from contextlib import ExitStack, nullcontext
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 try:
+    from models.columns import HAVE_NUMPY  # type: ignore
+    from models.indexes import SORT_KEYS, due_moment  # type: ignore
+    from models.recurrence import align, merge_upcoming, normalize_rule  # type: ignore
     from models.todo_list import TodoList  # type: ignore
     from models.task import Task  # type: ignore
     from parsers.task_parser import parse_task_input  # type: ignore
 except Exception:  # pragma: no cover
+    from ..models.columns import HAVE_NUMPY
+    from ..models.indexes import SORT_KEYS, due_moment
+    from ..models.recurrence import align, merge_upcoming, normalize_rule
     from ..models.todo_list import TodoList
     from ..models.task import Task
     from ..parsers.task_parser import parse_task_input
-from datetime import datetime
+from datetime import date, datetime
 try:
     from utils.logger import get_logger  # type: ignore
+    from utils.metrics import Metrics, OpTrace, NULL_TRACE  # type: ignore
+    from services.query import Query, decode_cursor, sort_key  # type: ignore
 except Exception:  # pragma: no cover
     from ..utils.logger import get_logger
+    from ..utils.metrics import Metrics, OpTrace, NULL_TRACE
+    from .query import Query, decode_cursor, sort_key
+
+
+def _changed_ids(old: TodoList, new: TodoList) -> List[int]:
+    """Ids of tasks added, changed or deleted going from ``old`` to ``new``."""
+    changed = [t.id for t in new.iter_tasks() if old.find_by_id(t.id) != t]
+    changed += [t.id for t in old.iter_tasks() if new.find_by_id(t.id) is None]
+    return changed
+
+
+def _parse_chunk(lines: List[str]) -> List[dict]:
+    """Parse a chunk of raw lines; module-level so worker processes can pickle it."""
+    return [parse_task_input(line) for line in lines]
+
+
+def _chunked(lines: Iterable[str], size: int) -> Iterator[List[str]]:
+    """Yield lists of up to `size` non-blank, stripped lines."""
+    it = (line.strip() for line in lines)
+    it = (line for line in it if line)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _parse_chunks(chunks: Iterator[List[str]], workers: int) -> Iterator[List[dict]]:
+    """Parse chunks in a process pool, yielding results in input order.
+
+    At most ``2 * workers`` chunks are in flight, so arbitrarily long inputs
+    are streamed rather than read up front. A single chunk or a single
+    worker is parsed inline to skip the pool start-up cost.
+    """
+    first = next(chunks, None)
+    if first is None:
+        return
+    second = next(chunks, None)
+    if workers <= 1 or second is None:
+        yield _parse_chunk(first)
+        if second is not None:
+            yield _parse_chunk(second)
+            for chunk in chunks:
+                yield _parse_chunk(chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque([pool.submit(_parse_chunk, first), pool.submit(_parse_chunk, second)])
+        for chunk in chunks:
+            pending.append(pool.submit(_parse_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
 
 
 class TaskService:
@@ -19,22 +89,417 @@ class TaskService:
 
     This class is the orchestrator between the CLI-facing parsing utilities
     and the storage layer. It exposes high-level operations in a cohesive API.
+
+    By default every mutation is written through to storage before the call
+    returns. Passing ``flush_interval`` (seconds) enables write-behind mode:
+    mutations only mark the store dirty and a background thread coalesces
+    them into one write every ``flush_interval`` seconds or as soon as
+    ``flush_every`` mutations are pending. `close` (also run at interpreter
+    exit) performs the final flush.
+
+    Several processes may share a store whose storage offers ``version`` and
+    ``locked`` (the JSON, journal and sharded backends; SQLite has a
+    ``version`` and locks itself). Each write takes the store lock only to
+    commit; if another process wrote since this one loaded, the store is
+    reloaded and this process's unsaved per-task changes are re-applied on
+    top before writing. New tasks get ids the
+    storage reserves for this process (``reserve_ids``) as they are added,
+    so the id `add` returns is the id the task is stored under, even when
+    the write happens later. Readers never take the lock.
+
+    Passing a `Metrics` registry, or registering callbacks with `add_hook`,
+    times every operation split into ``parse``, ``load``, ``index`` and
+    ``persist`` phases and counts tasks scanned/returned and bytes written.
+
+    ``columnar=True`` (needs NumPy) keeps a `ColumnIndex` mirror of the
+    loaded list, so multi-term queries filter with vectorized masks.
     """
 
-    def __init__(self, storage):
+    def __init__(
+        self,
+        storage,
+        flush_interval: Optional[float] = None,
+        flush_every: int = 100,
+        metrics: Optional[Metrics] = None,
+        columnar: bool = False,
+    ):
+        if columnar and not HAVE_NUMPY:
+            raise RuntimeError("the columnar store needs NumPy: pip install numpy")
         self.logger = get_logger(__name__)
         self.storage = storage
-        self.todo = TodoList()
-        self._load()
+        self.metrics = metrics
+        self.columnar = columnar
+        self._hooks: List[Callable[[OpTrace], None]] = []
+        self._listeners: List[Callable[[Optional[int]], None]] = []
+        self._todo: Optional[TodoList] = None
+        self._lock = threading.RLock()
+        # Write-behind state: ids with their last pending op, or a full save.
+        self._pending: Dict[int, str] = {}
+        self._pending_full = False
+        self._flush_lock = threading.Lock()
+        # Store version the in-memory list reflects.
+        self._version: Optional[int] = None
+        self._flush_every = flush_every
+        self._wake = threading.Event()
+        self._closed = False
+        self._flusher: Optional[threading.Thread] = None
+        if flush_interval is not None:
+            self._flusher = threading.Thread(
+                target=self._flush_loop,
+                args=(flush_interval,),
+                name="task-flusher",
+                daemon=True,
+            )
+            self._flusher.start()
+            atexit.register(self.close)
+
+    @property
+    def todo(self) -> TodoList:
+        """In-memory task list, loaded from storage on first use."""
+        if self._todo is None:
+            self._load()
+        return self._todo
 
     def _load(self):
         """Load tasks from storage into the in-memory list."""
+        version = getattr(self.storage, "version", None)
+        # Read the version first: a write landing in between only makes
+        # the next commit merge needlessly, never skip a merge.
+        self._version = version() if version is not None else None
         tasks = self.storage.load()
-        self.todo.load_tasks(tasks)
+        todo = TodoList(self.columnar)
+        todo.load_tasks(tasks)
+        self._todo = todo
+
+    def _loaded(self, trace) -> TodoList:
+        """`todo`, attributing a first-use load to ``trace``'s load phase."""
+        if self._todo is None:
+            with trace.phase("load"):
+                self._load()
+        return self._todo
+
+    @classmethod
+    def reading(cls, todo: TodoList) -> "TaskService":
+        """A service with no storage answering reads from ``todo`` alone.
+
+        `TaskAPI` serves its published copies of the list through one;
+        it must not be mutated through.
+        """
+        svc = cls(None)
+        svc._todo = todo
+        return svc
+
+    def copy_list(self) -> TodoList:
+        """A new list of copies of the loaded tasks, which later mutations leave alone."""
+        with self._lock:
+            tasks = [copy.copy(t) for t in self.todo.iter_tasks()]
+        todo = TodoList(self.columnar)
+        todo.load_tasks(tasks)
+        return todo
+
+    def copy_tasks(self, ids: Iterable[int]) -> Dict[int, Optional[Task]]:
+        """Copies of the loaded tasks with ``ids``, None for those that are gone."""
+        with self._lock:
+            todo = self.todo
+            return {
+                tid: None if t is None else copy.copy(t)
+                for tid, t in ((tid, todo.find_by_id(tid)) for tid in sorted(ids))
+            }
+
+    def add_hook(self, hook: Callable[[OpTrace], None]) -> Callable[[OpTrace], None]:
+        """Call ``hook(trace)`` with the `OpTrace` of every finished operation."""
+        self._hooks.append(hook)
+        return hook
+
+    def remove_hook(self, hook: Callable[[OpTrace], None]) -> None:
+        self._hooks.remove(hook)
+
+    def add_listener(
+        self, listener: Callable[[Optional[int]], None]
+    ) -> Callable[[Optional[int]], None]:
+        """Call ``listener(task_id)`` after every change to the task list.
+
+        ``task_id`` is the task added, updated, completed or deleted. A
+        merge or `refresh` picking up another process's writes reports
+        each task that differs from the list it replaces. None means any
+        task may have changed; the service itself no longer sends it, but
+        listeners should treat it as a full rescan. Listeners may run with
+        the service lock held and must not block.
+        """
+        self._listeners.append(listener)
+        return listener
+
+    def remove_listener(self, listener: Callable[[Optional[int]], None]) -> None:
+        self._listeners.remove(listener)
+
+    def _notify(self, task_id: Optional[int]) -> None:
+        for listener in list(self._listeners):
+            listener(task_id)
+
+    def _trace(self, op: str):
+        if self.metrics is None and not self._hooks:
+            return NULL_TRACE
+        return OpTrace(op, self._finish_trace)
+
+    def _finish_trace(self, trace: OpTrace) -> None:
+        if self.metrics is not None:
+            self.metrics.record(trace)
+        for hook in list(self._hooks):
+            hook(trace)
+
+    def _query(self):
+        """Return the storage's push-down `query` callable, if it has one.
+
+        Pending write-behind mutations are flushed first so push-down reads
+        see them.
+        """
+        query = getattr(self.storage, "query", None)
+        if query is not None and self.has_pending():
+            self.flush()
+        return query
+
+    def _persist(
+        self, op: Optional[str] = None, task_id: Optional[int] = None, trace=NULL_TRACE
+    ):
+        """Persist a mutation of ``task_id`` to storage (everything if ``op`` is None)."""
+        self._persist_changes(None if op is None else {task_id: op}, trace)
+
+    def _persist_changes(self, changes: Optional[Dict[int, str]], trace=NULL_TRACE) -> None:
+        """Persist ``{task_id: op}`` mutations, or all tasks if None, in one write.
+
+        Storages exposing ``append_many`` or ``append`` (e.g.
+        `JournalStorageService`) receive ``"put"``/``"delete"`` records;
+        others rewrite all tasks. In write-behind mode the mutations are
+        only queued for the flusher.
+        """
+        if self._flusher is not None:
+            with self._lock:
+                if changes is None:
+                    self._pending_full = True
+                else:
+                    self._pending.update(changes)
+                if self._pending_full or len(self._pending) >= self._flush_every:
+                    self._wake.set()
+        else:
+            with trace.phase("persist"):
+                written = getattr(self.storage, "bytes_written", 0)
+                with self._store_lock():
+                    merged = self._catch_up(changes or {}, trace)
+                    self._write(None if changes is None else merged)
+                    self._synced()
+                trace.count("bytes_written", getattr(self.storage, "bytes_written", 0) - written)
+        if changes is None:
+            self._notify(None)
+        else:
+            for task_id in changes:
+                self._notify(task_id)
+
+    def _direct(self) -> bool:
+        """True when single-task mutations can skip loading the whole list.
+
+        That is the case for storages with point lookups (``get`` and
+        ``next_id``, e.g. `ShardedStorageService` and
+        `SqliteStorageService`) as long as nothing is loaded yet and no
+        write-behind flusher owns the writes.
+        """
+        return (
+            self._todo is None
+            and self._flusher is None
+            and all(hasattr(self.storage, a) for a in ("get", "next_id", "append"))
+        )
+
+    def _write_direct(self, op: str, task: Task, trace=NULL_TRACE) -> None:
+        """Append ``op`` for ``task`` straight to storage (see `_direct`).
+
+        ``"insert"`` stores a new task under an id the storage assigns.
+        """
+        with trace.phase("persist"):
+            written = getattr(self.storage, "bytes_written", 0)
+            if op == "delete":
+                self.storage.append(op, task.id)
+            elif op == "insert":
+                self.storage.insert(task)
+            else:
+                self.storage.append(op, task.id, task)
+            trace.count("bytes_written", getattr(self.storage, "bytes_written", 0) - written)
+        self._notify(task.id)
+
+    def _store_lock(self):
+        locked = getattr(self.storage, "locked", None)
+        return locked() if locked is not None else nullcontext()
+
+    def _synced(self) -> None:
+        """Record that the store now holds everything in memory."""
+        if self._version is not None:
+            self._version = self.storage.version()
+
+    def _new_ids(self, count: int, floor: int) -> int:
+        """First of ``count`` consecutive ids for new tasks, at least ``floor``.
+
+        They are reserved in the storage when it supports that, so no
+        other process sharing it can hand them out.
+        """
+        reserve = getattr(self.storage, "reserve_ids", None)
+        return reserve(count, floor) if reserve is not None else floor
+
+    def _catch_up(self, changes: Dict[int, str], trace=NULL_TRACE) -> Dict[int, str]:
+        """Merge writes other processes made to the store since we loaded it.
+
+        Called with both locks held. ``changes`` maps ids to this process's
+        unsaved ops, tasks it added included. If the store moved on, it is
+        reloaded and the changes are re-applied to it (the last writer of a
+        task wins). Ids never change: added tasks hold ids reserved for
+        this process. Returns the changes still to write.
+        """
+        if self._version is None or self._todo is None:
+            return changes
+        version = self.storage.version()
+        if version == self._version:
+            return changes
+        mine = self._todo
+        state = {t.id: t for t in self.storage.load()}
+        rebased: Dict[int, str] = {}
+        for tid, op in changes.items():
+            if op == "delete":
+                if state.pop(tid, None) is not None:
+                    rebased[tid] = op
+            else:
+                state[tid] = mine.find_by_id(tid)
+                rebased[tid] = op
+        todo = TodoList(self.columnar)
+        todo.load_tasks(sorted(state.values(), key=lambda t: t.id))
+        self._todo = todo
+        self._version = version
+        trace.count("merges", 1)
+        self.logger.info(
+            "Merged %s local changes into a store updated by another process", len(rebased)
+        )
+        for tid in _changed_ids(mine, todo):
+            self._notify(tid)
+        return rebased
+
+    def refresh(self) -> bool:
+        """Pick up writes other processes made since the list was loaded.
+
+        Only for storages with a ``version`` and a loaded list; pending
+        write-behind changes are merged and flushed first. Listeners are
+        told about each task the reload changed; checking costs one version
+        read while the store is unchanged. Returns True if anything was
+        reloaded.
+        """
+        version = getattr(self.storage, "version", None)
+        if version is None:
+            return False
+        with self._lock:
+            if self._todo is None or self._version is None or version() == self._version:
+                return False
+            if self.has_pending():
+                self.flush()  # merges, and notifies, under the store lock
+                return True
+            old = self._todo
+            self._load()
+            changed = _changed_ids(old, self._todo)
+        self.logger.info("Reloaded %s tasks changed by another process", len(changed))
+        for tid in changed:
+            self._notify(tid)
+        return True
+
+    def _write(self, changes: Optional[Dict[int, str]]):
+        """Write ``changes`` as append records, or everything if None."""
+        append = getattr(self.storage, "append", None)
+        if changes is None or append is None:
+            self.storage.save(self.todo.all_tasks())
+            return
+        records = [
+            (op, tid, None if op == "delete" else self.todo.find_by_id(tid))
+            for tid, op in changes.items()
+        ]
+        self._append(records)
+
+    def _append(self, records: List[Tuple[str, int, Optional[Task]]]) -> None:
+        """Hand ``records`` to the storage's ``append_many``, else one ``append`` each."""
+        append_many = getattr(self.storage, "append_many", None)
+        if append_many is not None:
+            append_many(records)
+            return
+        for op, tid, task in records:
+            if op == "delete":
+                self.storage.append(op, tid)
+            else:
+                self.storage.append(op, tid, task)
+
+    def has_pending(self) -> bool:
+        """True while write-behind mutations have not reached storage."""
+        return self._pending_full or bool(self._pending)
+
+    def flush(self) -> None:
+        """Write all pending mutations to storage now.
+
+        The pending set is swapped out under the lock and tasks are copied,
+        so callers may keep mutating while the write is in progress. The
+        store lock is held from the version check until the write is done.
+        """
+        swapped = None
+        try:
+            with ExitStack() as held:
+                with self._lock:
+                    if not self.has_pending():
+                        return
+                    # Taken after self._lock, like every other path, and kept
+                    # once it is released so flushes write one at a time.
+                    held.enter_context(self._flush_lock)
+                    held.enter_context(self._store_lock())
+                    trace = held.enter_context(self._trace("flush"))
+                    self._pending = self._catch_up(self._pending, trace)
+                    swapped = self._pending_full, self._pending
+                    self._pending_full, self._pending = False, {}
+                    append = getattr(self.storage, "append", None)
+                    if swapped[0] or append is None:
+                        tasks = [copy.copy(t) for t in self.todo.all_tasks()]
+                        records = None
+                    else:
+                        records = [
+                            (op, tid, copy.copy(self.todo.find_by_id(tid)) if op == "put" else None)
+                            for tid, op in swapped[1].items()
+                        ]
+                with trace.phase("persist"):
+                    written = getattr(self.storage, "bytes_written", 0)
+                    if records is None:
+                        self.storage.save(tasks)
+                    else:
+                        self._append(records)
+                    trace.count(
+                        "bytes_written", getattr(self.storage, "bytes_written", 0) - written
+                    )
+                if self._version is not None:
+                    self._version = self.storage.version()
+        except Exception:
+            if swapped is not None:
+                # Re-queue so the next flush retries with the newest state.
+                with self._lock:
+                    self._pending_full = self._pending_full or swapped[0]
+                    for tid, op in swapped[1].items():
+                        self._pending.setdefault(tid, op)
+            raise
+
+    def close(self) -> None:
+        """Stop the background flusher and flush whatever is pending."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._flusher is not None:
+            self._wake.set()
+            self._flusher.join()
+        self.flush()
 
-    def _persist(self):
-        """Persist the in-memory tasks to storage."""
-        self.storage.save(self.todo.all_tasks())
+    def _flush_loop(self, interval: float) -> None:
+        while not self._closed:
+            self._wake.wait(interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as exc:
+                self.logger.error("Background flush failed: %s", exc)
 
     def add(self, raw_input: str) -> Task:
         """Create a new `Task` from raw input and persist it.
@@ -43,8 +508,64 @@ class TaskService:
         - Empty description results in a minimal task with just an id.
         - Invalid fields in the raw input are ignored by the parser.
         """
-        parsed = parse_task_input(raw_input)
-        task = Task(
+        with self._trace("add") as trace:
+            with trace.phase("parse"):
+                parsed = parse_task_input(raw_input)
+            with self._lock:
+                if self._direct():
+                    task = self._task_from_parsed(parsed)
+                    with self._store_lock():
+                        if hasattr(self.storage, "insert"):
+                            self._write_direct("insert", task, trace)
+                        else:
+                            task.id = self._new_ids(1, self.storage.next_id())
+                            self._write_direct("put", task, trace)
+                else:
+                    todo = self._loaded(trace)
+                    task_id = self._new_ids(1, todo.next_id)
+                    with trace.phase("index"):
+                        task = todo.add_task(self._task_from_parsed(parsed), task_id)
+                    self._persist("put", task.id, trace)
+        self.logger.info("Added task id=%s description=%s", task.id, task.description)
+        return task
+
+    def add_many(
+        self,
+        raw_lines: Iterable[str],
+        workers: Optional[int] = None,
+        chunk_size: int = 1000,
+    ) -> List[Task]:
+        """Create tasks from many raw lines and persist once at the end.
+
+        Blank lines are skipped. Lines are parsed in chunks across
+        ``workers`` processes (default: CPU count) and ids are assigned in
+        input order, reserved a chunk at a time.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        added: List[Task] = []
+        chunks = _parse_chunks(_chunked(raw_lines, chunk_size), workers)
+        with self._trace("add_many") as trace:
+            while True:
+                with trace.phase("parse"):
+                    parsed_chunk = next(chunks, None)
+                if parsed_chunk is None:
+                    break
+                with self._lock:
+                    todo = self._loaded(trace)
+                    first = self._new_ids(len(parsed_chunk), todo.next_id)
+                    with trace.phase("index"):
+                        for i, parsed in enumerate(parsed_chunk):
+                            added.append(todo.add_task(self._task_from_parsed(parsed), first + i))
+            if added:
+                with self._lock:
+                    self._persist_changes({t.id: "put" for t in added}, trace)
+        self.logger.info("Imported %s tasks", len(added))
+        return added
+
+    def _task_from_parsed(self, parsed: dict) -> Task:
+        task_cls = getattr(self.storage, "task_cls", Task)
+        task = task_cls(
             id=0,
             description=parsed["description"],
             tags=parsed["tags"],
@@ -52,25 +573,68 @@ class TaskService:
             due_date=parsed["due_date"],
             assigned_to=parsed["assigned_to"],
             time=parsed["time"],
+            recurrence=normalize_rule(parsed["recurrence"]),
         )
-        task = self.todo.add_task(task)
-        self._persist()
-        self.logger.info("Added task id=%s description=%s", task.id, task.description)
+        align(task)
         return task
 
+    def _mutate(
+        self, trace, op: str, task_id: int, change: Callable[[TodoList], bool]
+    ) -> bool:
+        """Apply ``change`` to the list under the lock; persist ``op`` if it did."""
+        with self._lock:
+            if self._direct():
+                with self._store_lock():
+                    # Only the one task is fetched; the change runs on a
+                    # scratch list holding just it.
+                    with trace.phase("load"):
+                        task = self.storage.get(task_id)
+                    if task is None:
+                        return False
+                    todo = TodoList()
+                    todo.load_tasks([task])
+                    with trace.phase("index"):
+                        ok = change(todo)
+                    if ok:
+                        self._write_direct(op, task, trace)
+                return ok
+            todo = self._loaded(trace)
+            with trace.phase("index"):
+                ok = change(todo)
+            if ok:
+                self._persist(op, task_id, trace)
+        return ok
+
     def delete(self, task_id: int) -> bool:
         """Delete a task; returns False if the id does not exist."""
-        ok = self.todo.delete_task(task_id)
+        with self._trace("delete") as trace:
+            ok = self._mutate(trace, "delete", task_id, lambda todo: todo.delete_task(task_id))
         if ok:
-            self._persist()
             self.logger.info("Deleted task id=%s", task_id)
         return ok
 
     def update(self, task_id: int, raw_input: str) -> bool:
         """Update an existing task with non-null fields from raw input."""
+        with self._trace("update") as trace:
+            with trace.phase("parse"):
+                updater = self.updater(raw_input)
+            ok = self._mutate(
+                trace, "put", task_id, lambda todo: todo.update_task(task_id, updater)
+            )
+        if ok:
+            self.logger.info("Updated task id=%s", task_id)
+        return ok
+
+    @staticmethod
+    def updater(raw_input: str) -> Callable[[Task], None]:
+        """Parse ``raw_input`` once into a function applying it to a task.
+
+        Only fields present in the input are overwritten, as in `update`.
+        """
         parsed = parse_task_input(raw_input)
+        rule = normalize_rule(parsed["recurrence"])
 
-        def updater(t: Task):
+        def apply(t: Task) -> None:
             # maybe only override non-null fields
             if parsed["description"]:
                 t.description = parsed["description"]
@@ -84,34 +648,267 @@ class TaskService:
                 t.assigned_to = parsed["assigned_to"]
             if parsed["time"] is not None:
                 t.time = parsed["time"]
+            if rule is not None:
+                t.recurrence = rule
+                align(t)
             t.updated_at = datetime.now()
 
-        ok = self.todo.update_task(task_id, updater)
-        if ok:
-            self._persist()
-            self.logger.info("Updated task id=%s", task_id)
-        return ok
+        return apply
+
+    def apply_bulk(
+        self, query: Union[Query, str], mutation: Union[str, Callable[[Task], None]]
+    ) -> List[int]:
+        """Apply ``mutation`` to every task matching ``query``; persist once.
+
+        ``mutation`` is ``"complete"``, ``"incomplete"``, ``"delete"`` or a
+        function changing a task in place (see `updater`). Tasks are
+        selected like `find`, all changes are made under the lock and
+        written in a single commit: one batch of append records, or one
+        full save for storages without ``append``. Returns the affected ids.
+        """
+        if isinstance(query, str):
+            query = Query.parse(query)
+        if mutation == "complete":
+            op, change = "put", TodoList.mark_complete
+        elif mutation == "incomplete":
+            op, change = "put", TodoList.mark_incomplete
+        elif mutation == "delete":
+            op, change = "delete", TodoList.delete_task
+        elif callable(mutation):
+            op, change = "put", lambda todo, tid: todo.update_task(tid, mutation)
+        else:
+            raise ValueError(f"unknown bulk mutation {mutation!r}")
+        with self._trace("apply_bulk") as trace:
+            with self._lock:
+                if self._direct() and hasattr(self.storage, "query"):
+                    # Select through the storage and change scratch copies,
+                    # as single-task mutations do, without loading the store.
+                    with self._store_lock():
+                        with trace.phase("load"):
+                            todo = TodoList()
+                            todo.load_tasks(query.pushdown_plan(self.storage.query).execute())
+                        with trace.phase("index"):
+                            ids = [t.id for t in todo.all_tasks() if change(todo, t.id)]
+                        with trace.phase("persist"):
+                            written = getattr(self.storage, "bytes_written", 0)
+                            if ids:
+                                self._append([
+                                    (op, tid, None if op == "delete" else todo.find_by_id(tid))
+                                    for tid in ids
+                                ])
+                            trace.count(
+                                "bytes_written",
+                                getattr(self.storage, "bytes_written", 0) - written,
+                            )
+                    for tid in ids:
+                        self._notify(tid)
+                else:
+                    todo = self._loaded(trace)
+                    with trace.phase("index"):
+                        ids = [t.id for t in query.plan(todo).execute()]
+                        ids = [tid for tid in ids if change(todo, tid)]
+                    if ids:
+                        self._persist_changes({tid: op for tid in ids}, trace)
+            trace.count("tasks_returned", len(ids))
+        self.logger.info(
+            "Applied %s to %s tasks matching %s",
+            mutation if isinstance(mutation, str) else "update", len(ids), query,
+        )
+        return ids
+
+    def get(self, task_id: int) -> Optional[Task]:
+        """Return the task with ``task_id``, or None if it does not exist."""
+        if self._todo is None and hasattr(self.storage, "get"):
+            return self.storage.get(task_id)
+        return self.todo.find_by_id(task_id)
 
     def list_all(self) -> List[Task]:
         """Return all tasks."""
-        return self.todo.all_tasks()
+        return self._run_query("list_all", {}, lambda todo: todo.all_tasks())
 
     def mark_complete(self, task_id: int) -> bool:
-        """Mark a task complete and persist."""
-        ok = self.todo.mark_complete(task_id)
+        """Mark a task complete and persist.
+
+        A recurring task is rolled to its next occurrence and stays open.
+        """
+        with self._trace("mark_complete") as trace:
+            ok = self._mutate(trace, "put", task_id, lambda todo: todo.mark_complete(task_id))
         if ok:
-            self._persist()
             self.logger.info("Marked complete id=%s", task_id)
         return ok
 
     def mark_incomplete(self, task_id: int) -> bool:
         """Mark a task incomplete and persist."""
-        ok = self.todo.mark_incomplete(task_id)
+        with self._trace("mark_incomplete") as trace:
+            ok = self._mutate(trace, "put", task_id, lambda todo: todo.mark_incomplete(task_id))
         if ok:
-            self._persist()
             self.logger.info("Marked incomplete id=%s", task_id)
         return ok
 
+    def _run_query(
+        self, name: str, pushdown: dict, in_memory: Callable[[TodoList], List[Task]]
+    ) -> List[Task]:
+        """Answer a read via storage push-down when available, else in memory.
+
+        In-memory answers come from an index, so every task examined is
+        returned; push-down answers only count what was returned.
+        """
+        with self._trace(name) as trace:
+            query = self._query()
+            if query is not None:
+                with trace.phase("index"):
+                    results = query(**pushdown)
+            else:
+                todo = self._loaded(trace)
+                with trace.phase("index"):
+                    results = in_memory(todo)
+                trace.count("tasks_scanned", len(results))
+            trace.count("tasks_returned", len(results))
+        return results
+
+    def _plan(self, query, trace=NULL_TRACE):
+        if isinstance(query, str):
+            query = Query.parse(query)
+        pushdown = self._query()
+        if pushdown is not None:
+            return query.pushdown_plan(pushdown, getattr(self.storage, "describe_query", None))
+        todo = self._loaded(trace)
+        with trace.phase("index"):
+            return query.plan(todo)
+
+    def find(self, query: Union[Query, str]) -> List[Task]:
+        """Return tasks matching every predicate of ``query``.
+
+        ``query`` is a `Query` or a query string such as
+        ``"priority:high tag:~ops due<2026-11-01 !completed"``. The most
+        selective indexed predicate is evaluated first and the others are
+        checked on its candidates in one pass; malformed queries raise
+        `QueryError`.
+        """
+        with self._trace("find") as trace:
+            with self._lock:
+                plan = self._plan(query, trace)
+                with trace.phase("index"):
+                    results = plan.execute()
+            trace.count("tasks_scanned", plan.scanned)
+            trace.count("tasks_returned", len(results))
+        return results
+
+    def stream(
+        self,
+        query: Union[Query, str, None] = None,
+        sort: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> Iterator[Task]:
+        """Yield the tasks matching ``query`` one page at a time.
+
+        ``sort`` names a `SORT_KEYS` order; ``cursor`` (from `cursor_for`
+        on the last task of the previous page) resumes strictly after it,
+        which stays stable when tasks are added or deleted meanwhile, and
+        ``offset``/``limit`` slice what is left. Unsorted pages stop
+        scanning once ``limit`` rows are out, and so do sorted scans of
+        the loaded list, which walk its maintained sort index; sorted
+        index-driven or pushed-down results keep only the best
+        ``offset + limit`` rows in a heap instead of sorting every match.
+        Bad arguments raise `QueryError` here, not on iteration. Consume
+        the iterator before the next mutation.
+        """
+        if isinstance(query, str):
+            query = Query.parse(query)
+        key = sort_key(sort)
+        after = decode_cursor(cursor, sort) if cursor else None
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError("limit and offset must not be negative")
+        return self._stream(query or Query(), sort, key, after, limit, offset)
+
+    def _stream(self, query, sort, key, after, limit, offset) -> Iterator[Task]:
+        stop = None if limit is None else offset + limit
+        with self._trace("stream") as trace:
+            with self._lock:
+                plan = self._plan(query, trace)
+                rows = plan.iter_execute(sort, after)
+                # Natural order is id order for in-memory lists loaded in
+                # order, so id cursors need no sort there.
+                natural = plan.ordered or sort is None and (
+                    after is None or (self._todo is not None and self._todo.id_ordered)
+                )
+                if after is not None and not plan.ordered:
+                    rows = (t for t in rows if key(t) > after)
+                if not natural:
+                    with trace.phase("index"):
+                        if stop is not None:
+                            rows = heapq.nsmallest(stop, rows, key=key)
+                        else:
+                            rows = sorted(rows, key=key)
+            returned = 0
+            for task in islice(rows, offset, stop):
+                returned += 1
+                yield task
+            trace.count("tasks_scanned", plan.scanned)
+            trace.count("tasks_returned", returned)
+
+    def next_due(self, n: int) -> List[Task]:
+        """The ``n`` incomplete tasks due soonest, by ``time`` else ``due_date``.
+
+        The loaded list answers from its maintained ``next`` index in O(n)
+        once built; push-down storages return only open tasks and a heap
+        keeps the best ``n`` of them.
+        """
+        with self._trace("next") as trace:
+            query = self._query()
+            if query is not None:
+                with trace.phase("index"):
+                    rows = query(completed=False)
+                    results = heapq.nsmallest(
+                        n, (t for t in rows if due_moment(t) is not None), key=SORT_KEYS["due"]
+                    )
+                trace.count("tasks_scanned", len(rows))
+            else:
+                with self._lock:
+                    todo = self._loaded(trace)
+                    with trace.phase("index"):
+                        results = todo.next_due(n)
+                trace.count("tasks_scanned", len(results))
+            trace.count("tasks_returned", len(results))
+        return results
+
+    def upcoming(
+        self,
+        until: datetime,
+        since: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Tuple[datetime, Task]]:
+        """Yield ``(when, task)`` for open tasks due in ``[since, until)``, soonest first.
+
+        One-off tasks contribute their due moment and recurring ones every
+        occurrence in the window, merged lazily by `merge_upcoming`.
+        ``since`` defaults to now. Consume before the next mutation.
+        """
+        since = since or datetime.now()
+        with self._lock:
+            query = self._query()
+            if query is not None:
+                rows = query(completed=False)
+                repeating = [t for t in rows if t.recurrence]
+                once: Iterable[Task] = sorted(
+                    (t for t in rows
+                     if not t.recurrence and due_moment(t) is not None and due_moment(t) >= since),
+                    key=SORT_KEYS["due"],
+                )
+            else:
+                todo = self.todo
+                repeating = todo.recurring()
+                once = (t for t in todo.open_due_from(since) if not t.recurrence)
+            merged = merge_upcoming(repeating, once, since, until)
+        return islice(merged, limit)
+
+    def explain(self, query: Union[Query, str]) -> str:
+        """Describe the plan `find` would use for ``query`` without running it."""
+        with self._lock:
+            return self._plan(query).explain()
+
     def search(self, pattern: str) -> List[Task]:
         """Case-insensitive regex search across description and tags.
 
@@ -122,37 +919,76 @@ class TaskService:
             regex = re.compile(pattern, re.IGNORECASE)
         except re.error:
             return []
-        return [
-            t
-            for t in self.todo.all_tasks()
-            if (
-                regex.search(t.description)
-                or any(regex.search(tag) for tag in t.tags)
-            )
-        ]
+        with self._trace("search") as trace:
+            query = self._query()
+            if query is not None:
+                with trace.phase("index"):
+                    results = query(search=pattern)
+            else:
+                todo = self._loaded(trace)
+                with trace.phase("index"):
+                    ix = todo.index("text")
+                    examined = ix.candidates
+                    results = todo.search(regex)
+                trace.count("tasks_scanned", ix.candidates - examined)
+            trace.count("tasks_returned", len(results))
+        return results
+
+    def stats(self, today: Optional[date] = None, days: int = 7) -> dict:
+        """Task counts for dashboards, read from incrementally kept counters.
+
+        Totals, open/completed counts by priority, tag and assignee,
+        overdue and due-this-week counts relative to ``today`` and tasks
+        created and completed on each of the last ``days`` days (see
+        `StatsIndex.summary`). The counters are built once per loaded list
+        and then updated by every mutation, so a call costs the same on
+        any store size.
+        """
+        with self._trace("stats") as trace:
+            with self._lock:
+                todo = self._loaded(trace)
+                with trace.phase("index"):
+                    return todo.index("stats").summary(today or date.today(), days)
+
+    def search_stats(self) -> dict:
+        """Size and hit-ratio counters of the in-memory search index."""
+        return self.todo.index("text").stats()
 
     def filter_by_tag(self, tag_pattern: str) -> List[Task]:
         """Return tasks whose tags fully match the given regex pattern."""
-        import re
-        regex = re.compile(tag_pattern, re.IGNORECASE)
-        return [
-            t
-            for t in self.todo.all_tasks()
-            if any(regex.fullmatch(tag) for tag in t.tags)
-        ]
+        return self._run_query(
+            "filter_by_tag",
+            {"tag_pattern": tag_pattern},
+            lambda todo: todo.with_tag_matching(tag_pattern),
+        )
 
     def filter_by_priority(self, prio: str) -> List[Task]:
         """Return tasks with exact priority value."""
-        return [t for t in self.todo.all_tasks() if t.priority == prio]
+        return self._run_query(
+            "filter_by_priority", {"priority": prio}, lambda todo: todo.with_priority(prio)
+        )
+
+    def filter_by_assignee(self, email: str) -> List[Task]:
+        """Return tasks assigned to exactly `email`."""
+        return self._run_query(
+            "filter_by_assignee", {"assigned_to": email}, lambda todo: todo.assigned_to(email)
+        )
 
     def filter_by_due(self, date_pattern: str) -> List[Task]:
         """Return tasks whose ISO due date string matches the regex pattern."""
         import re
-        regex = re.compile(date_pattern)
-        results = []
-        for t in self.todo.all_tasks():
-            if t.due_date:
-                ds = t.due_date.isoformat()
-                if regex.search(ds):
-                    results.append(t)
-        return results
+        return self._run_query(
+            "filter_by_due",
+            {"due_pattern": date_pattern},
+            lambda todo: todo.due_matching(re.compile(date_pattern)),
+        )
+
+    def filter_by_due_range(
+        self, after: Optional[datetime] = None, before: Optional[datetime] = None
+    ) -> List[Task]:
+        """Return tasks due strictly after `after` and strictly before `before`."""
+        return self._run_query(
+            "filter_by_due_range",
+            {"due_after": after, "due_before": before},
+            lambda todo: todo.due_between(after, before),
+        )
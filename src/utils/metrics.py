@@ -0,0 +1,294 @@
+"""Lightweight latency histograms and counters for `TaskService` operations.
+
+A `Metrics` registry keeps one `Histogram` per ``(operation, phase)`` pair
+(phases are ``parse``, ``load``, ``index``, ``persist`` plus ``total`` for
+the whole call) and integer counters per ``(operation, name)`` such as
+``tasks_scanned``, ``tasks_returned`` and ``bytes_written``. Registries can
+be merged, saved as JSON and rendered in the Prometheus text format.
+
+`OpTrace` measures one operation; `NULL_TRACE` stands in for it when
+nothing is listening so instrumented code costs a couple of attribute
+lookups.
+"""
+
+import json
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Upper bounds in seconds: 1us doubling up to ~67s, then +Inf.
+BUCKETS: Tuple[float, ...] = tuple(1e-6 * 2 ** i for i in range(27))
+
+
+class Histogram:
+    """Fixed exponential-bucket latency histogram."""
+
+    __slots__ = ("counts", "count", "sum", "min", "max")
+
+    def __init__(self):
+        self.counts: List[int] = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile (capped at max)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                bound = BUCKETS[i] if i < len(BUCKETS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def merge(self, other: "Histogram") -> None:
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def to_dict(self) -> dict:
+        return {
+            "counts": self.counts,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Histogram":
+        h = cls()
+        if len(d["counts"]) == len(h.counts):
+            h.counts = list(d["counts"])
+        h.count = d["count"]
+        h.sum = d["sum"]
+        h.min = d["min"] if d["count"] else float("inf")
+        h.max = d["max"]
+        return h
+
+
+class Metrics:
+    """Thread-safe registry of per-operation phase histograms and counters."""
+
+    def __init__(self):
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}
+        self.counters: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, op: str, phase: str, seconds: float) -> None:
+        with self._lock:
+            h = self.histograms.get((op, phase))
+            if h is None:
+                h = self.histograms[(op, phase)] = Histogram()
+            h.observe(seconds)
+
+    def incr(self, op: str, name: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[(op, name)] = self.counters.get((op, name), 0) + value
+
+    def record(self, trace: "OpTrace") -> None:
+        """Add a finished trace: its phases, total time and counters."""
+        self.observe(trace.op, "total", trace.total)
+        for phase, seconds in trace.phases.items():
+            self.observe(trace.op, phase, seconds)
+        for name, value in trace.counters.items():
+            self.incr(trace.op, name, value)
+
+    def merge(self, other: "Metrics") -> None:
+        with self._lock:
+            for key, h in other.histograms.items():
+                mine = self.histograms.get(key)
+                if mine is None:
+                    mine = self.histograms[key] = Histogram()
+                mine.merge(h)
+            for key, value in other.counters.items():
+                self.counters[key] = self.counters.get(key, 0) + value
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "buckets": list(BUCKETS),
+                "histograms": {
+                    f"{op}/{phase}": h.to_dict()
+                    for (op, phase), h in sorted(self.histograms.items())
+                },
+                "counters": {
+                    f"{op}/{name}": value
+                    for (op, name), value in sorted(self.counters.items())
+                },
+            }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Metrics":
+        m = cls()
+        for key, h in d.get("histograms", {}).items():
+            op, _, phase = key.partition("/")
+            m.histograms[(op, phase)] = Histogram.from_dict(h)
+        for key, value in d.get("counters", {}).items():
+            op, _, name = key.partition("/")
+            m.counters[(op, name)] = value
+        return m
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self, prefix: str = "todo") -> str:
+        """Render every histogram and counter in the Prometheus text format."""
+        data = self.to_dict()
+        name = f"{prefix}_operation_seconds"
+        lines = [
+            f"# HELP {name} TaskService operation latency by phase.",
+            f"# TYPE {name} histogram",
+        ]
+        for key, h in data["histograms"].items():
+            op, _, phase = key.partition("/")
+            labels = f'op="{op}",phase="{phase}"'
+            cumulative = 0
+            for bound, n in zip(list(BUCKETS) + ["+Inf"], h["counts"]):
+                cumulative += n
+                le = bound if isinstance(bound, str) else f"{bound:.6g}"
+                lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {h['sum']:.9g}")
+            lines.append(f"{name}_count{{{labels}}} {h['count']}")
+        by_counter: Dict[str, List[Tuple[str, int]]] = {}
+        for key, value in data["counters"].items():
+            op, _, counter = key.partition("/")
+            by_counter.setdefault(counter, []).append((op, value))
+        for counter, values in sorted(by_counter.items()):
+            metric = f"{prefix}_{counter}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.extend(f'{metric}{{op="{op}"}} {value}' for op, value in values)
+        return "\n".join(lines) + "\n"
+
+    def to_table(self) -> str:
+        """Human-readable latency percentiles per phase, then the counters."""
+        with self._lock:
+            hists = sorted(self.histograms.items())
+            counters = sorted(self.counters.items())
+        if not hists:
+            return "No performance data recorded."
+        lines = [
+            f"{'operation':<20} {'phase':<8} {'count':>7} {'p50 ms':>9} "
+            f"{'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'total s':>9}"
+        ]
+        for (op, phase), h in hists:
+            lines.append(
+                f"{op:<20} {phase:<8} {h.count:>7} {h.quantile(0.5) * 1e3:>9.3f} "
+                f"{h.quantile(0.95) * 1e3:>9.3f} {h.quantile(0.99) * 1e3:>9.3f} "
+                f"{h.max * 1e3:>9.3f} {h.sum:>9.3f}"
+            )
+        if counters:
+            lines.append("")
+            lines.extend(f"{op:<20} {name:<16} {value:>12}" for (op, name), value in counters)
+        return "\n".join(lines)
+
+
+def load_metrics(path: Path) -> Metrics:
+    """Read metrics saved by `save_metrics`; empty when the file is missing."""
+    try:
+        return Metrics.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+    except FileNotFoundError:
+        return Metrics()
+
+
+def save_metrics(path: Path, metrics: Metrics, merge: bool = True) -> None:
+    """Write ``metrics`` to ``path``, adding to what is already stored there."""
+    path = Path(path)
+    if merge:
+        stored = load_metrics(path)
+        stored.merge(metrics)
+        metrics = stored
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(metrics.to_json(), encoding="utf-8")
+    tmp.replace(path)
+
+
+class _Phase:
+    __slots__ = ("trace", "name", "start")
+
+    def __init__(self, trace: "OpTrace", name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        phases = self.trace.phases
+        phases[self.name] = phases.get(self.name, 0.0) + time.perf_counter() - self.start
+        return False
+
+
+class OpTrace:
+    """Timing of one operation, split into named phases.
+
+    Used as a context manager; on exit the total is computed and the trace
+    is handed to ``on_finish``.
+    """
+
+    __slots__ = ("op", "phases", "counters", "total", "_start", "_on_finish")
+
+    def __init__(self, op: str, on_finish: Optional[Callable[["OpTrace"], None]] = None):
+        self.op = op
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self.total = 0.0
+        self._on_finish = on_finish
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.total = time.perf_counter() - self._start
+        if self._on_finish is not None:
+            self._on_finish(self)
+        return False
+
+    def phase(self, name: str) -> _Phase:
+        """Context manager adding its elapsed time to phase ``name``."""
+        return _Phase(self, name)
+
+    def count(self, name: str, value: int) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+
+class _NullTrace:
+    """Do-nothing `OpTrace` used while no metrics or hooks are installed."""
+
+    __slots__ = ()
+    op = ""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def phase(self, name: str) -> "_NullTrace":
+        return self
+
+    def count(self, name: str, value: int) -> None:
+        pass
+
+
+NULL_TRACE = _NullTrace()
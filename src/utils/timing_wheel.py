@@ -0,0 +1,126 @@
+"""Hierarchical timing wheel for large numbers of pending timers.
+
+Level 0 has ``slots`` buckets of one tick each; every level above covers
+``slots`` times the span of the one below. A timer goes into the lowest
+level whose span holds its distance from now, so `schedule` and `cancel`
+are O(1) dict operations. `advance` visits one level-0 bucket per tick
+and, each time a level wraps, spreads the next bucket of the level above
+over the lower ones. Every timer therefore moves at most once per level,
+and there is no scan of all timers per tick. Stretches where the lower
+levels are empty are skipped up to the next wrap of the lowest occupied
+level, so idle hours cost a handful of steps, not one per tick.
+"""
+
+import math
+from typing import Any, Dict, Hashable, List, Tuple
+
+# key -> (deadline tick, deadline, payload)
+_Bucket = Dict[Hashable, Tuple[int, float, Any]]
+
+
+class TimingWheel:
+    """Timers keyed by a hashable, firing once the clock passes their deadline.
+
+    Times are plain floats (e.g. `time.time`). Deadlines are rounded up to
+    whole ``tick``s, so a timer fires within one tick after it is due.
+    Deadlines beyond the top level's span wait in its buckets and are
+    re-placed on every rotation until they come within range.
+    """
+
+    def __init__(self, tick: float = 1.0, now: float = 0.0, slots: int = 64, levels: int = 6):
+        self.tick = tick
+        self.slots = slots
+        self._spans = [slots ** level for level in range(levels + 1)]
+        self._wheels: List[List[_Bucket]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        self._where: Dict[Hashable, Tuple[int, int]] = {}
+        self._counts = [0] * levels
+        self._now = math.floor(now / tick)
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._where
+
+    def _place(self, key: Hashable, entry: Tuple[int, float, Any]) -> None:
+        due = entry[0]
+        delta = due - self._now
+        spans = self._spans
+        level = 0
+        top = len(self._wheels) - 1
+        while level < top and delta >= spans[level + 1]:
+            level += 1
+        slot = (due // spans[level]) % self.slots
+        self._wheels[level][slot][key] = entry
+        self._where[key] = (level, slot)
+        self._counts[level] += 1
+
+    def schedule(self, key: Hashable, when: float, payload: Any = None) -> None:
+        """Fire ``key`` at ``when``, replacing any timer it already has.
+
+        Deadlines already passed fire on the next `advance`.
+        """
+        self.cancel(key)
+        due = max(math.ceil(when / self.tick), self._now + 1)
+        self._place(key, (due, when, payload))
+
+    def cancel(self, key: Hashable) -> bool:
+        """Drop the timer of ``key``; False if it had none."""
+        where = self._where.pop(key, None)
+        if where is None:
+            return False
+        del self._wheels[where[0]][where[1]][key]
+        self._counts[where[0]] -= 1
+        return True
+
+    def advance(self, now: float) -> List[Tuple[Hashable, float, Any]]:
+        """Move the clock to ``now``; return the expired ``(key, when, payload)``.
+
+        Results are in deadline order; the timers are removed.
+        """
+        target = math.floor(now / self.tick)
+        fired: List[Tuple[Hashable, float, Any]] = []
+        if not self._where:
+            self._now = max(self._now, target)
+            return fired
+        wheel0 = self._wheels[0]
+        counts = self._counts
+        while self._now < target:
+            if not counts[0]:
+                # Nothing can fire before the lowest occupied level wraps.
+                level = 1
+                while not counts[level]:
+                    level += 1
+                span = self._spans[level]
+                self._now = min((self._now // span + 1) * span, target + 1) - 1
+                if self._now >= target:
+                    break
+            self._now += 1
+            n = self._now
+            if n % self.slots == 0:
+                self._cascade(n)
+            bucket = wheel0[n % self.slots]
+            if bucket:
+                wheel0[n % self.slots] = {}
+                counts[0] -= len(bucket)
+                for key, (_, when, payload) in sorted(bucket.items(), key=lambda kv: kv[1][1]):
+                    del self._where[key]
+                    fired.append((key, when, payload))
+            if not self._where:
+                self._now = target
+        return fired
+
+    def _cascade(self, n: int) -> None:
+        """Re-place the buckets of the levels that wrap at tick ``n``."""
+        for level in range(1, len(self._wheels)):
+            index = (n // self._spans[level]) % self.slots
+            bucket = self._wheels[level][index]
+            if bucket:
+                self._wheels[level][index] = {}
+                self._counts[level] -= len(bucket)
+                for key, entry in bucket.items():
+                    self._place(key, entry)
+            if index:
+                break
@@ -0,0 +1,108 @@
+import asyncio
+import json
+import threading
+
+from src.cli.http_api import TaskAPI
+from src.cli.interface import make_storage
+from src.services.task_service import TaskService
+
+
+async def _call(port, method, path, body=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = json.dumps(body).encode() if body is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: x\r\nConnection: close\r\n"
+        f"Content-Length: {len(data)}\r\n\r\n".encode() + data
+    )
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+def test_api_serializes_writes_and_serves_reads(tmp_path):
+    """Concurrent adds get distinct ids; reads and errors map to HTTP codes."""
+    svc = TaskService(make_storage(tmp_path / "tasks.json"), flush_interval=60)
+    api = TaskAPI(svc)
+
+    async def scenario():
+        server = await api.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            adds = [_call(port, "POST", "/tasks", {"raw": f"Task {i} @bulk #high"}) for i in range(20)]
+            reads = [_call(port, "GET", "/tasks?tag=bulk") for _ in range(20)]
+            results = await asyncio.gather(*adds, *reads)
+            assert sorted(p["id"] for s, p in results[:20]) == list(range(1, 21))
+            assert all(s == 201 for s, _ in results[:20])
+            assert all(s == 200 for s, _ in results[20:])
+
+            assert await _call(port, "POST", "/tasks/3/complete") == (200, {"ok": True, "id": 3})
+            status, page = await _call(port, "GET", "/tasks?q=completed")
+            assert [t["id"] for t in page["tasks"]] == [3]
+            assert (await _call(port, "PATCH", "/tasks/4", {"raw": "Renamed"}))[0] == 200
+            assert (await _call(port, "GET", "/tasks/4"))[1]["description"] == "Renamed"
+            assert (await _call(port, "DELETE", "/tasks/5"))[0] == 200
+            assert (await _call(port, "DELETE", "/tasks/5"))[0] == 404
+            stats = (await _call(port, "GET", "/stats"))[1]
+            assert (stats["tasks"], stats["completed"], stats["open"]) == (19, 1, 18)
+            assert (await _call(port, "GET", "/search?pattern=renamed"))[1]["tasks"][0]["id"] == 4
+            page = (await _call(port, "GET", "/search?pattern=task&limit=5"))[1]
+            assert [t["id"] for t in page["tasks"]] == [1, 2, 3, 6, 7] and page["next"]
+            assert (await _call(port, "GET", "/search?pattern=(&limit=5"))[0] == 400
+            assert (await _call(port, "GET", "/search?pattern=task&limit=0"))[0] == 400
+            assert (await _call(port, "GET", "/tasks?q=bogus:1"))[0] == 400
+            assert (await _call(port, "POST", "/tasks", {"nope": 1}))[0] == 400
+            assert (await _call(port, "PUT", "/tasks"))[0] == 405
+            assert (await _call(port, "GET", "/nowhere"))[0] == 404
+            assert api.version == 23
+        finally:
+            server.close()
+            await server.wait_closed()
+            await api.stop()
+
+    asyncio.run(scenario())
+    svc.close()
+    assert len(TaskService(make_storage(tmp_path / "tasks.json")).list_all()) == 19
+
+
+def test_api_pages_lists_and_reads_a_published_copy(tmp_path):
+    """GET /tasks pages by cursor; reads neither wait for a write nor flush."""
+    svc = TaskService(make_storage(tmp_path / "tasks.db", "sqlite"), flush_interval=60)
+    api = TaskAPI(svc)
+    gate = threading.Event()
+
+    def blocked():
+        gate.wait(5)
+
+    async def scenario():
+        server = await api.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            for i in range(7):
+                await _call(port, "POST", "/tasks", {"raw": f"Task {i} #{('low', 'high')[i % 2]}"})
+            ids, cursor = [], None
+            while True:
+                path = "/tasks?limit=3&sort=priority" + (f"&cursor={cursor}" if cursor else "")
+                status, page = await _call(port, "GET", path)
+                ids += [t["id"] for t in page["tasks"]]
+                cursor = page["next"]
+                if cursor is None:
+                    break
+            assert ids == [2, 4, 6, 1, 3, 5, 7]
+            assert (await _call(port, "GET", "/tasks?limit=2000"))[0] == 400
+            assert (await _call(port, "GET", "/tasks?cursor=bogus"))[0] == 400
+
+            slow = asyncio.ensure_future(api.mutate(blocked))
+            await asyncio.sleep(0.05)
+            assert (await _call(port, "GET", "/tasks/7"))[0] == 200
+            assert svc.has_pending()  # the reads did not flush
+            gate.set()
+            await slow
+        finally:
+            gate.set()
+            server.close()
+            await server.wait_closed()
+            await api.stop()
+
+    asyncio.run(scenario())
+    svc.close()
@@ -0,0 +1,66 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.task import Task
+from models.todo_list import TodoList
+from services.query import Query
+
+np = pytest.importorskip("numpy")
+
+QUERIES = [
+    "priority:high !completed",
+    "tag:ops due>2026-03-01 due<2026-09-01",
+    "assigned:ann@example.com !tag:home completed",
+    "!priority:low tag:~o text:fix",
+    "tag:OPS",
+    "completed",
+]
+
+
+def _task(i, rng):
+    return Task(
+        id=i, description=rng.choice(["Fix server", "Buy milk", "Write docs"]),
+        tags=rng.sample(["ops", "home", "docs"], rng.randint(0, 2)),
+        priority=rng.choice(["high", "medium", "low", None]),
+        due_date=datetime(2026, 1, 1) + timedelta(days=rng.randrange(365))
+        if rng.random() < 0.8 else None,
+        assigned_to=rng.choice(["ann@example.com", "bob@example.com", None]),
+        completed=rng.random() < 0.3,
+    )
+
+
+def test_columnar_plans_match_row_scans_through_mutations():
+    """Vectorized masks agree with per-task predicates as tasks change."""
+    rng = random.Random(3)
+    tasks = [_task(i, rng) for i in range(1, 301)]
+    columnar, plain = TodoList(columnar=True), TodoList()
+    columnar.load_tasks(tasks)
+    plain.load_tasks([Task.from_dict(t.to_dict()) for t in tasks])
+
+    def check():
+        for text in QUERIES:
+            query = Query.parse(text)
+            expected = [t.id for t in plain.all_tasks() if query.matches(t)]
+            assert [t.id for t in query.plan(columnar).execute()] == expected, text
+
+    check()
+    assert "columns index" in Query.parse(QUERIES[0]).plan(columnar).explain()
+    for _ in range(200):
+        tid = rng.randrange(1, 320)
+        op = rng.random()
+        for todo in (columnar, plain):
+            if op < 0.3:
+                todo.add_task(_task(0, random.Random(tid)))
+            elif op < 0.5:
+                todo.delete_task(tid)
+            else:
+                todo.update_task(tid, lambda t: (
+                    setattr(t, "priority", "high"), setattr(t, "tags", ["ops"])
+                ) if op < 0.75 else setattr(t, "completed", not t.completed))
+    check()
+    cols = columnar.columns()
+    assert len(cols) == len(plain)
+    expected = [t.id for t in plain.all_tasks() if t.priority == "high" and "ops" in t.tags]
+    assert cols.select(priority="high", tag="ops").tolist() == expected
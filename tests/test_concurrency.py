@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.cli.interface import make_storage
+from src.services.task_service import TaskService
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+@pytest.mark.parametrize("backend", ["json", "journal", "sharded"])
+def test_parallel_cli_processes_lose_no_updates(tmp_path, backend):
+    """N processes adding and N completing at once all land in the store."""
+    n = 8
+    data = tmp_path / "tasks.json"
+    svc = TaskService(make_storage(data, backend))
+    for i in range(n):
+        svc.add(f"Seed {i}")
+
+    env = dict(os.environ, TODO_NO_DAEMON="1", LOG_LEVEL="WARNING")
+    base = [sys.executable, "-m", "src.main", "--backend", backend]
+    commands = [base + ["add", f"Worker {i} @stress", "--data", str(data)] for i in range(n)]
+    commands += [base + ["complete", str(i + 1), "--data", str(data)] for i in range(n)]
+    procs = [subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.PIPE) for cmd in commands]
+    for proc in procs:
+        proc.communicate(timeout=60)
+        assert proc.returncode == 0
+
+    tasks = TaskService(make_storage(data, backend)).list_all()
+    assert len(tasks) == 2 * n
+    assert len({t.id for t in tasks}) == 2 * n
+    assert sorted(t.description for t in tasks if "stress" in t.tags) == [
+        f"Worker {i}" for i in range(n)
+    ]
+    assert all(t.completed for t in tasks if t.description.startswith("Seed"))
@@ -0,0 +1,46 @@
+from services.journal_storage import JournalStorageService
+from services.task_service import TaskService
+
+
+def test_mutations_append_and_replay(tmp_path):
+    """Each mutation appends one journal line and is replayed on reload."""
+    filepath = tmp_path / "tasks.json"
+    svc = TaskService(JournalStorageService(filepath))
+    a = svc.add("First @one")
+    b = svc.add("Second #high")
+    svc.mark_complete(a.id)
+    svc.delete(b.id)
+
+    assert not filepath.exists()
+    lines = (tmp_path / "tasks.json.journal").read_text().splitlines()
+    assert len(lines) == 4
+
+    reloaded = TaskService(JournalStorageService(filepath)).list_all()
+    assert [t.id for t in reloaded] == [a.id]
+    assert reloaded[0].completed
+
+
+def test_compaction_folds_journal_into_snapshot(tmp_path):
+    """Crossing the threshold compacts into a snapshot that still loads."""
+    filepath = tmp_path / "tasks.json"
+    storage = JournalStorageService(filepath, compact_threshold=256)
+    svc = TaskService(storage)
+    for i in range(10):
+        svc.add(f"Task {i} @bulk")
+    storage.compact()
+
+    assert filepath.exists()
+    assert not storage.rotated_path.exists()
+    assert not storage.journal_path.exists()
+    tasks = TaskService(JournalStorageService(filepath)).list_all()
+    assert [t.description for t in tasks] == [f"Task {i}" for i in range(10)]
+
+
+def test_torn_last_record_is_ignored(tmp_path):
+    """A partially written final journal line does not break loading."""
+    filepath = tmp_path / "tasks.json"
+    storage = JournalStorageService(filepath)
+    TaskService(storage).add("Kept")
+    with storage.journal_path.open("a") as f:
+        f.write('{"op":"put","task":{"id":')
+    assert [t.description for t in JournalStorageService(filepath).load()] == ["Kept"]
@@ -0,0 +1,42 @@
+from services.storage_service import StorageService
+from services.task_service import TaskService
+from utils.metrics import Metrics, load_metrics, save_metrics
+
+
+def test_hooks_receive_phase_timings(tmp_path):
+    """Each operation reports its phases and counters to hooks and metrics."""
+    metrics = Metrics()
+    svc = TaskService(StorageService(tmp_path / "tasks.json"), metrics=metrics)
+    traces = []
+    svc.add_hook(traces.append)
+
+    svc.add("Write report @work #high")
+    svc.add("Buy milk @home")
+    assert [t.op for t in traces] == ["add", "add"]
+    assert {"parse", "load", "index", "persist"} <= set(traces[0].phases)
+    assert traces[1].counters["bytes_written"] == (tmp_path / "tasks.json").stat().st_size
+
+    svc.filter_by_tag("work")
+    svc.search("milk|report")
+    assert traces[-2].counters == {"tasks_scanned": 1, "tasks_returned": 1}
+    assert traces[-1].counters["tasks_returned"] == 2
+    assert metrics.histograms[("add", "total")].count == 2
+    assert metrics.counters[("search", "tasks_returned")] == 2
+
+
+def test_metrics_round_trip_and_export(tmp_path):
+    """Saved metrics merge across runs and render as Prometheus text."""
+    path = tmp_path / "perf.json"
+    for seconds in (0.002, 0.004):
+        m = Metrics()
+        m.observe("add", "parse", seconds)
+        m.incr("add", "bytes_written", 100)
+        save_metrics(path, m)
+
+    merged = load_metrics(path)
+    hist = merged.histograms[("add", "parse")]
+    assert hist.count == 2 and abs(hist.sum - 0.006) < 1e-12
+    assert merged.counters[("add", "bytes_written")] == 200
+    text = merged.to_prometheus()
+    assert 'todo_operation_seconds_bucket{op="add",phase="parse",le="+Inf"} 2' in text
+    assert 'todo_bytes_written_total{op="add"} 200' in text
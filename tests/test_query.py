@@ -0,0 +1,126 @@
+from datetime import datetime
+
+import pytest
+
+from models.task import Task
+from services.query import Query, QueryError, cursor_for
+from services.sqlite_storage import SqliteStorageService
+from services.storage_service import StorageService
+from services.task_service import TaskService
+
+QUERIES = [
+    "priority:high tag:~ops due<2026-11-01 !completed",
+    "tag:ops priority:high",
+    "due>=2026-10-20 due<=2026-10-25",
+    "due:2026-1[01] !tag:home",
+    "assigned:ann@example.com completed",
+    "server",
+    "!priority:high text:'^(fix|buy)'",
+]
+
+
+def _tasks():
+    rows = [
+        ("Buy milk", ["home"], "high", datetime(2026, 10, 20), None, True),
+        ("Fix server", ["ops"], "high", datetime(2026, 12, 1), None, False),
+        ("Deploy", ["devops"], "high", datetime(2026, 10, 25), "ann@example.com", False),
+        ("Write docs", ["ops", "Docs"], "low", None, "ann@example.com", True),
+        ("Fix printer", [], None, datetime(2026, 11, 3), None, False),
+    ]
+    return [
+        Task(id=i, description=d, tags=tags, priority=p, due_date=due,
+             assigned_to=who, completed=done)
+        for i, (d, tags, p, due, who, done) in enumerate(rows, 1)
+    ]
+
+
+def test_plan_matches_naive_filter_and_pushdown(tmp_path):
+    """Planned results equal a full scan, in memory and pushed down to SQLite."""
+    tasks = _tasks()
+    StorageService(tmp_path / "t.json").save(tasks)
+    SqliteStorageService(tmp_path / "t.db").save(tasks)
+    memory = TaskService(StorageService(tmp_path / "t.json"))
+    sqlite = TaskService(SqliteStorageService(tmp_path / "t.db"))
+    for text in QUERIES:
+        query = Query.parse(text)
+        expected = [t.id for t in tasks if query.matches(t)]
+        assert [t.id for t in memory.find(text)] == expected, text
+        assert [t.id for t in sqlite.find(text)] == expected, text
+    assert [t.id for t in memory.find("priority:high tag:~ops due<2026-11-01 !completed")] == [3]
+
+
+def test_plan_starts_from_most_selective_index(tmp_path):
+    """The cheapest indexed predicate drives; the rest are filters."""
+    svc = TaskService(StorageService(tmp_path / "t.json"))
+    svc.todo.load_tasks(_tasks())
+    plan = Query.parse("priority:high assigned:ann@example.com !completed").plan(svc.todo)
+    assert str(plan.driver) == "assigned:ann@example.com"
+    assert [str(p) for p in plan.filters] == ["priority:high", "!completed"]
+    assert [t.id for t in plan.execute()] == [3] and plan.scanned == 2
+    text = svc.explain("priority:high assigned:ann@example.com !completed")
+    assert "fetch assigned:ann@example.com from the assignee index" in text
+    assert "scan all 5 tasks" in svc.explain("!completed")
+    combined = Query.from_filters(priority="high", tag="ops") & Query.parse("completed")
+    assert str(combined) == "priority:high tag:ops completed"
+    assert svc.find(combined) == []
+    for bad in ["foo:bar", "due<tomorrowish", "tag:(", "priority<high", "'unclosed"]:
+        with pytest.raises(QueryError):
+            Query.parse(bad)
+
+
+@pytest.mark.parametrize("backend", [StorageService, SqliteStorageService])
+def test_stream_pages_with_cursor_and_top_k(tmp_path, backend):
+    """Cursor pages cover a sorted listing exactly once, even across inserts."""
+    backend(tmp_path / "t.db").save(_tasks())
+    svc = TaskService(backend(tmp_path / "t.db"))
+    by_due = [1, 3, 5, 2, 4]
+    assert [t.id for t in svc.stream(sort="due", limit=2, offset=1)] == by_due[1:3]
+    assert [t.id for t in svc.stream("!completed", sort="priority", limit=2)] == [3, 2]
+
+    seen, cursor = [], None
+    while True:
+        page = list(svc.stream(sort="due", limit=2, cursor=cursor))
+        if not page:
+            break
+        seen += [t.id for t in page]
+        cursor = cursor_for(page[-1], "due")
+        if len(seen) == 2:
+            svc.add("Sooner than everything due:2020-01-01")  # sorts before the cursor
+    assert seen == by_due
+    assert [t.id for t in svc.stream(limit=2, cursor=cursor_for(svc.get(2)))] == [3, 4]
+    with pytest.raises(QueryError):
+        svc.stream(sort="due", cursor=cursor_for(svc.get(2)))
+    with pytest.raises(QueryError):
+        svc.stream(sort="colour")
+
+
+
+def test_malformed_cursors_raise_query_error():
+    """Cursors round-trip for every sort; well-formed JSON of the wrong shape is rejected."""
+    import base64
+    import json
+    from services.query import SORT_KEYS, decode_cursor
+
+    for task in _tasks():
+        for sort in SORT_KEYS:
+            assert decode_cursor(cursor_for(task, sort), sort) == SORT_KEYS[sort](task)
+
+    def encode(value):
+        return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+    for bad, sort in (
+        (["id", 5], None), (["id", ["x"]], None), (["id", [1, 2]], None),
+        (["due", [1, 2, 3]], "due"), ([1, 2, 3], None), ("x", None),
+    ):
+        with pytest.raises(QueryError):
+            decode_cursor(encode(bad), sort)
+
+def test_list_rejects_empty_pages():
+    """``--limit`` below 1 (or a negative ``--offset``) is a usage error."""
+    from src.cli.interface import make_parser
+
+    parser = make_parser()
+    assert parser.parse_args(["list", "--limit", "1"]).limit == 1
+    for argv in (["list", "--limit", "0"], ["list", "--offset", "-1"]):
+        with pytest.raises(SystemExit):
+            parser.parse_args(argv)
@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+from itertools import islice
+
+import pytest
+
+from models.recurrence import RULES, align, normalize_rule, occurrences
+from models.task import Task
+from services.snapshot_storage import SnapshotStorageService
+from services.sqlite_storage import SqliteStorageService
+from services.storage_service import StorageService
+from services.task_service import TaskService
+
+
+def test_occurrences_jump_to_start_like_stepping_through():
+    """Starting mid-stream yields what stepping from the anchor would."""
+    anchor = datetime(2024, 1, 31, 9, 30)
+    start = datetime(2025, 3, 15)
+    for rule in RULES:
+        stepped = [w for w in islice(occurrences(rule, anchor), 2000) if w >= start][:10]
+        assert list(islice(occurrences(rule, anchor, start), 10)) == stepped, rule
+    months = list(islice(occurrences("month", anchor), 4))
+    assert [w.day for w in months] == [31, 29, 31, 30]  # clamped, no drift
+    assert all(w.weekday() < 5 for w in islice(occurrences("weekday", anchor), 20))
+    assert normalize_rule("Weekly") == "week" and normalize_rule("2") is None
+
+
+def test_completing_rolls_forward_and_round_trips(tmp_path):
+    """Recurring tasks persist their rule and roll on completion in every backend."""
+    for backend in (StorageService, SqliteStorageService, SnapshotStorageService):
+        path = tmp_path / f"t.{backend.__name__}"
+        svc = TaskService(backend(path))
+        svc.add("Pay rent every month due:2026-01-31")
+        svc.add("Standup every monday at 9:30am")
+        assert svc.get(2).time.weekday() == 0
+        assert svc.mark_complete(1)
+        reloaded = TaskService(backend(path))
+        rent = reloaded.get(1)
+        assert (rent.recurrence, rent.due_date, rent.completed) == (
+            "month", datetime(2026, 2, 28), False
+        ), backend.__name__
+        assert reloaded.get(2).recurrence == "monday"
+
+
+def test_upcoming_merges_occurrences_in_window(tmp_path):
+    """The heap merge equals expanding every rule and sorting."""
+    since, until = datetime(2026, 3, 1), datetime(2026, 5, 1)
+    tasks = []
+    for i in range(1, 301):
+        t = Task(id=i, description=f"t{i}", completed=i % 25 == 0,
+                 due_date=datetime(2026, 1, 1) + timedelta(hours=7 * i),
+                 recurrence=RULES[i % len(RULES)] if i % 4 else None)
+        align(t)
+        tasks.append(t)
+    StorageService(tmp_path / "t.json").save(tasks)
+    svc = TaskService(StorageService(tmp_path / "t.json"))
+    expected = sorted(
+        ((w, t.id) for t in tasks if not t.completed
+         for w in (islice(occurrences(t.recurrence, t.due_date), 400) if t.recurrence
+                   else [t.due_date])
+         if since <= w < until),
+    )
+    got = [(w, t.id) for w, t in svc.upcoming(until, since)]
+    assert got == expected and len(got) > 1000
+    assert [(w, t.id) for w, t in svc.upcoming(until, since, limit=5)] == got[:5]
+    with pytest.raises(ValueError):
+        list(occurrences("fortnight", since))
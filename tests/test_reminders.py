@@ -0,0 +1,110 @@
+import math
+import random
+from datetime import datetime, timedelta
+
+from services.reminders import ReminderScheduler
+from services.storage_service import StorageService
+from services.task_service import TaskService
+from utils.timing_wheel import TimingWheel
+
+
+def test_timing_wheel_matches_brute_force():
+    """Random schedules and cancels across all levels fire like a sorted scan."""
+    rng = random.Random(7)
+    wheel = TimingWheel(tick=1.0, now=0.0, slots=8, levels=3)
+    pending = {}
+    now = 0.0
+    for _ in range(300):
+        for _ in range(rng.randint(0, 5)):
+            key = rng.randrange(200)
+            when = now + rng.choice([0.5, 3, 40, 300, 5000]) * rng.random()
+            wheel.schedule(key, when, key)
+            pending[key] = when
+        for key in rng.sample(sorted(pending), min(2, len(pending))):
+            assert wheel.cancel(key)
+            del pending[key]
+        now += rng.choice([0.3, 1, 7, 90])
+        fired = wheel.advance(now)
+        # Deadlines round up to whole ticks.
+        expected = sorted(
+            (w, k) for k, w in pending.items() if math.ceil(w) <= math.floor(now)
+        )
+        assert [(w, k) for k, w, _ in fired] == expected
+        for _, k in expected:
+            del pending[k]
+        assert len(wheel) == len(pending)
+        # Nothing fires more than a tick late.
+        assert all(w > now - 1 for w in pending.values())
+
+
+def test_scheduler_follows_service_changes(tmp_path):
+    """Mutations and other processes' writes reschedule reminders incrementally."""
+    clock = [datetime(2025, 3, 3, 8, 0).timestamp()]
+    svc = TaskService(StorageService(tmp_path / "tasks.json"))
+    svc.add("Standup due:2025-03-03 every day at 9:00")
+    svc.add("Report due:2025-03-03 at 10:00")
+    svc.add("Someday")
+    fired = []
+    sched = ReminderScheduler(
+        svc, lambda t, due: fired.append((t.id, due)),
+        lead=timedelta(minutes=15), clock=lambda: clock[0],
+    )
+
+    def at(day, hour, minute=0):
+        clock[0] = datetime(2025, 3, day, hour, minute).timestamp()
+        return sched.poll()
+
+    assert sched.sync() == 2
+    assert at(3, 8, 44) == 0
+    assert at(3, 8, 46) == 1
+    assert fired == [(1, datetime(2025, 3, 3, 9, 0))]
+    assert len(sched) == 2  # the standup waits for tomorrow
+
+    assert svc.update(2, "due:2025-03-03 at 11:00")
+    assert at(3, 9, 50) == 0
+    svc.add("Call due:2025-03-03 at 10:30")
+    assert at(3, 10, 20) == 1 and fired[-1] == (4, datetime(2025, 3, 3, 10, 30))
+    assert svc.mark_complete(2)
+    assert svc.delete(1)
+    assert at(4, 12) == 0 and len(sched) == 0
+
+    other = TaskService(StorageService(tmp_path / "tasks.json"))
+    other.add("Dentist due:2025-03-05 at 14:00")
+    assert at(5, 13, 40) == 0 and len(sched) == 1
+    assert at(5, 13, 50) == 1 and fired[-1] == (5, datetime(2025, 3, 5, 14, 0))
+    # Already inside the lead window: reminded at once, and only once.
+    svc.add("Memo due:2025-03-05 at 14:00")
+    assert at(5, 13, 51) == 1 and fired[-1][0] == 6
+    sched.sync()
+    assert at(5, 13, 55) == 0 and len(sched) == 0
+    sched.close()
+
+
+def test_poll_reschedules_only_other_processes_changes(tmp_path):
+    """A poll reports just the tasks another process changed, SQLite included."""
+    import pytest
+    from services.snapshot_storage import SnapshotStorageService
+    from services.sqlite_storage import SqliteStorageService
+
+    clock = datetime(2025, 3, 3, 8, 0).timestamp()
+    for storage_cls, name in ((StorageService, "tasks.json"), (SqliteStorageService, "tasks.db")):
+        svc = TaskService(storage_cls(tmp_path / name))
+        for hour in (9, 10, 11):
+            svc.add(f"Task due:2025-03-03 at {hour}:00")
+        sched = ReminderScheduler(svc, lambda t, due: None, clock=lambda: clock)
+        assert sched.sync() == 3
+        seen, syncs = [], []
+        svc.add_listener(seen.append)
+        sched.sync = lambda: syncs.append(1)
+        assert sched.poll() == 0 and seen == []
+
+        other = TaskService(storage_cls(tmp_path / name))
+        other.add("Dentist due:2025-03-05 at 14:00")
+        other.delete(1)
+        assert sched.poll() == 0
+        assert sorted(seen) == [1, 4] and syncs == [], name
+        assert len(sched) == 3
+        sched.close()
+
+    with pytest.raises(ValueError):
+        ReminderScheduler(TaskService(SnapshotStorageService(tmp_path / "t.snap")))
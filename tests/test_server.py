@@ -0,0 +1,68 @@
+import socket
+import threading
+
+import pytest
+
+from src.cli import client
+from src.cli.interface import make_storage
+from src.cli.server import CommandServer
+from src.services.task_service import TaskService
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+def test_daemon_runs_forwarded_commands(tmp_path, capsys, monkeypatch):
+    """Forwarded commands run in the daemon; others fall back to the client."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("TODO_NO_DAEMON", raising=False)
+    data = tmp_path / "tasks.json"
+    svc = TaskService(make_storage(data))
+    server = CommandServer(client.socket_path(data), svc, data)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        assert client.forward(["add", "Buy milk @home", "--data", "tasks.json"]) == 0
+        assert client.forward(["list", "--tag", "home", "--data=tasks.json"]) == 0
+        assert client.forward(["list", "--nope", "--data", "tasks.json"]) == 2
+        assert client.forward(["import", "-", "--data", "tasks.json"]) is None
+        assert client.forward(["list", "--data", "other.json"]) is None
+        out = capsys.readouterr()
+        assert "Added task #1: Buy milk" in out.out
+        assert "1: Buy milk (tags: ['home'])" in out.out
+        assert "unrecognized arguments: --nope" in out.err
+        assert [t.description for t in svc.list_all()] == ["Buy milk"]
+    finally:
+        server.shutdown()
+        server.server_close()
+        svc.close()
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+def test_daemon_sees_other_writers_and_prints_stored_ids(tmp_path, capsys, monkeypatch):
+    """Writes from other processes are picked up; printed ids stay valid."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("TODO_NO_DAEMON", raising=False)
+    data = tmp_path / "tasks.json"
+    svc = TaskService(make_storage(data), flush_interval=60)  # writes behind, as `serve` does
+    server = CommandServer(client.socket_path(data), svc, data)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        assert client.forward(["add", "From the daemon", "--data", "tasks.json"]) == 0
+        TaskService(make_storage(data)).add("From another process")
+        assert client.forward(["list", "--data", "tasks.json"]) == 0
+        assert client.forward(["add", "Third", "--data", "tasks.json"]) == 0
+        assert client.forward(["complete", "2", "--data", "tasks.json"]) == 0
+        assert client.forward(["--backend", "sharded", "list", "--data", "tasks.json"]) is None
+        assert client.forward(["--profile", "list", "--data", "tasks.json"]) is None
+        out = capsys.readouterr().out
+        assert "Added task #1: From the daemon" in out
+        assert "2: From another process" in out
+        assert "Added task #3: Third" in out
+        svc.flush()
+        stored = {t.id: t for t in TaskService(make_storage(data)).list_all()}
+        assert [stored[i].description for i in (1, 2, 3)] == [
+            "From the daemon", "From another process", "Third",
+        ]
+        assert stored[2].completed and not stored[3].completed
+    finally:
+        server.shutdown()
+        server.server_close()
+        svc.close()
@@ -0,0 +1,93 @@
+from datetime import datetime
+
+from models.task import Task
+from services.sharded_storage import ShardedStorageService
+from services.storage_service import StorageService
+from services.task_service import TaskService
+
+
+def _tasks():
+    return [
+        Task(id=i, description=f"Task {i}", tags=["ops"] if i % 3 == 0 else [],
+             priority="high" if i % 2 else "low", completed=i <= 20,
+             due_date=datetime(2025, 1 + i % 12, 1 + i % 28) if i % 5 else None)
+        for i in range(1, 41)
+    ]
+
+
+def test_queries_read_only_matching_shards(tmp_path):
+    """Open/due filters skip other shards and agree with an in-memory scan."""
+    sharded = ShardedStorageService(tmp_path / "tasks.json")
+    sharded.save(_tasks())
+    StorageService(tmp_path / "plain.json").save(_tasks())
+    plain = TaskService(StorageService(tmp_path / "plain.json"))
+    assert [t.id for t in sharded.load()] == list(range(1, 41))
+
+    read = []
+    original = sharded._read_shard
+    sharded._read_shard = lambda meta: read.append(meta["file"]) or original(meta)
+    cases = [
+        ("!completed", {"completed": False}),
+        ("due:2025-03", {"due_pattern": "2025-03"}),
+        ("due>2025-10-01 !completed tag:ops", {
+            "due_after": datetime(2025, 10, 1), "completed": False, "tag_pattern": "ops",
+        }),
+        ("completed priority:high", {"completed": True, "priority": "high"}),
+    ]
+    for text, kwargs in cases:
+        read.clear()
+        assert [t.id for t in sharded.query(**kwargs)] == [t.id for t in plain.find(text)], text
+        # "read N of M shards ..."
+        described, total = sharded.describe_query(**kwargs).split()[1:4:2]
+        assert len(read) == int(described) < int(total)
+    read.clear()
+    sharded.query(completed=False)
+    assert read and all(name.startswith("open") for name in read)
+
+
+def test_service_mutations_rewrite_only_affected_shards(tmp_path):
+    """Id-based mutations skip the full load and leave other shards untouched."""
+    storage = ShardedStorageService(tmp_path / "tasks.json")
+    storage.save(_tasks())
+    before = {k: m["file"] for k, m in storage.manifest()["shards"].items()}
+    svc = TaskService(storage)
+
+    added = svc.add("New thing due:2025-06-15")
+    assert added.id == 41
+    assert svc.mark_complete(22)  # open-2025-11 -> done-2025-11
+    assert svc.update(41, "#high")
+    assert svc.delete(7)
+    assert not svc.delete(7)
+    assert svc._todo is None
+
+    after = {k: m["file"] for k, m in storage.manifest()["shards"].items()}
+    changed = {k for k in before.keys() | after.keys() if before.get(k) != after.get(k)}
+    assert changed == {"open-2025-06", "open-2025-11", "done-2025-11", "done-2025-08"}
+    assert {p.name for p in storage.shard_dir.glob("*.json")} == set(after.values())
+
+    reloaded = TaskService(ShardedStorageService(tmp_path / "tasks.json"))
+    assert reloaded.get(22).completed
+    assert reloaded.get(41).priority == "high"
+    assert reloaded.get(7) is None
+    assert len(reloaded.list_all()) == 40
+
+
+def test_due_patterns_prune_only_exact_months(tmp_path):
+    """Patterns that loosen the month after its digits read every due shard."""
+    tasks = [
+        Task(id=1, description="October", due_date=datetime(2026, 10, 5)),
+        Task(id=2, description="November", due_date=datetime(2026, 11, 5)),
+        Task(id=3, description="January", due_date=datetime(2026, 1, 5)),
+    ]
+    sharded = ShardedStorageService(tmp_path / "tasks.json")
+    sharded.save(tasks)
+    StorageService(tmp_path / "plain.json").save(tasks)
+    plain = TaskService(StorageService(tmp_path / "plain.json"))
+    patterns = [
+        "2026-10", "^2026-10", "2026-10-05", "2026-10?", "2026-10*", "2026-10+",
+        "2026-10{0,1}", "2026-10|2026-11", "2026-1", "2026-1[01]", "2026-10.",
+    ]
+    for pattern in patterns:
+        got = [t.id for t in sharded.query(due_pattern=pattern)]
+        assert got == [t.id for t in plain.filter_by_due(pattern)], pattern
+    assert sharded.describe_query(due_pattern="2026-10-05").startswith("read 1 ")
@@ -0,0 +1,99 @@
+from datetime import datetime
+
+import pytest
+
+from models.task import Task
+from services.snapshot_storage import SnapshotStorageService
+from services.storage_service import StorageService
+from services.task_service import TaskService
+
+
+def _tasks():
+    return [
+        Task(id=1, description="Write report ünïcode", tags=["work", "Docs"], priority="high",
+             due_date=datetime(2025, 10, 20), time=datetime(2025, 10, 20, 15, 30),
+             created_at=datetime(2025, 1, 1, 9, 0, 0, 123456), updated_at=datetime(2025, 1, 2)),
+        Task(id=2, description="Buy milk", tags=[], priority="someday",
+             assigned_to="bob@example.com", completed=True,
+             created_at=datetime(2025, 1, 3), updated_at=datetime(2025, 1, 4),
+             completed_at=datetime(2025, 1, 3, 18)),
+        Task(id=5, description="", tags=["ops"], due_date=datetime(2025, 11, 2),
+             created_at=datetime(2025, 1, 4), updated_at=datetime(2025, 1, 5)),
+    ]
+
+
+def test_json_round_trip_is_exact(tmp_path):
+    """JSON -> snapshot -> JSON reproduces the original file byte for byte."""
+    StorageService(tmp_path / "a.json").save(_tasks())
+    snap = SnapshotStorageService(tmp_path / "t.snap")
+    snap.save(StorageService(tmp_path / "a.json").load())
+    assert snap.count() == 3
+    assert snap.load() == _tasks()
+    assert SnapshotStorageService(tmp_path / "t.snap", compact=True).load() == _tasks()
+    StorageService(tmp_path / "b.json").save(SnapshotStorageService(tmp_path / "t.snap").load())
+    assert (tmp_path / "a.json").read_bytes() == (tmp_path / "b.json").read_bytes()
+
+    # Replacing the file is picked up by an already open store.
+    SnapshotStorageService(tmp_path / "t.snap").save(_tasks()[:1])
+    assert snap.count() == 1
+    (tmp_path / "bad.snap").write_bytes(b"[]" * 20)
+    with pytest.raises(ValueError):
+        SnapshotStorageService(tmp_path / "bad.snap").load()
+
+
+def test_queries_are_answered_from_the_mapping(tmp_path):
+    """Push-down filters match the in-memory results without a TodoList."""
+    SnapshotStorageService(tmp_path / "t.snap").save(_tasks())
+    StorageService(tmp_path / "t.json").save(_tasks())
+    snap = TaskService(SnapshotStorageService(tmp_path / "t.snap"))
+    mem = TaskService(StorageService(tmp_path / "t.json"))
+    cases = [
+        lambda s: s.filter_by_priority("high"),
+        lambda s: s.filter_by_priority("someday"),
+        lambda s: s.filter_by_tag("docs"),
+        lambda s: s.filter_by_due("2025-1[01]"),
+        lambda s: s.search("MILK|ünï"),
+        lambda s: s.filter_by_due_range(after=datetime(2025, 10, 20)),
+        lambda s: s.filter_by_assignee("bob@example.com"),
+        lambda s: s.find("tag:~o !completed due<2025-11-01"),
+        lambda s: s.list_all(),
+    ]
+    for case in cases:
+        assert [t.to_dict() for t in case(snap)] == [t.to_dict() for t in case(mem)]
+    assert snap._todo is None
+    assert snap.mark_complete(5)
+    assert [t.id for t in snap.find("completed")] == [2, 5]
+
+
+def test_older_snapshots_still_load(tmp_path):
+    """Version 2 files read without completion times, version 1 also without rules."""
+    import struct
+    from services import snapshot_storage as ss
+
+    store = SnapshotStorageService(tmp_path / "t.snap")
+    tasks = _tasks()
+    tasks[0].recurrence = "week"
+    store.save(tasks)
+    assert store.load() == tasks
+    assert struct.unpack_from("<H", (tmp_path / "t.snap").read_bytes(), 8) == (3,)
+
+    def downgrade(version, tasks):
+        store.save(tasks)
+        data = (tmp_path / "t.snap").read_bytes()
+        magic, _, pad, _, count, heap = ss._HEADER.unpack_from(data)
+        records = b"".join(
+            ss._RECORD_V2.pack(*rec[:13])
+            for rec in ss._RECORD.iter_unpack(data[ss._HEADER.size:heap])
+        )
+        header = ss._HEADER.pack(
+            magic, version, pad, ss._RECORD_V2.size, count, ss._HEADER.size + len(records)
+        )
+        path = tmp_path / f"v{version}.snap"
+        path.write_bytes(header + records + data[heap:])
+        return SnapshotStorageService(path).load()
+
+    expected = _tasks()
+    expected[1].completed_at = None
+    v2 = downgrade(2, tasks)
+    assert v2[0].recurrence == "week" and v2[1].completed_at is None
+    assert downgrade(1, _tasks()) == expected
@@ -0,0 +1,114 @@
+from datetime import datetime
+from services.sqlite_storage import SqliteStorageService
+from services.storage_service import StorageService
+from services.task_service import TaskService
+
+
+def _seed(svc):
+    svc.add("Write report @work #high due:2025-10-20")
+    svc.add("Buy milk @home @Shopping #low")
+    svc.add("Plan sprint @work due:2025-11-02 assigned:bob@example.com")
+
+
+def test_filters_are_pushed_down(tmp_path):
+    """Filters answer from SQL and match the in-memory JSON results."""
+    sql = TaskService(SqliteStorageService(tmp_path / "tasks.db"))
+    mem = TaskService(StorageService(tmp_path / "tasks.json"))
+    _seed(sql)
+    _seed(mem)
+
+    fresh = TaskService(SqliteStorageService(tmp_path / "tasks.db"))
+    cases = [
+        lambda s: s.filter_by_priority("high"),
+        lambda s: s.filter_by_tag("work"),
+        lambda s: s.filter_by_tag("shop.*"),
+        lambda s: s.filter_by_due("2025-1[01]"),
+        lambda s: s.search("MILK|sprint"),
+        lambda s: s.filter_by_due_range(after=datetime(2025, 10, 20)),
+        lambda s: s.filter_by_due_range(before=datetime(2025, 11, 1)),
+        lambda s: s.filter_by_assignee("bob@example.com"),
+        lambda s: s.list_all(),
+    ]
+    for case in cases:
+        got = [(t.id, t.description, t.tags) for t in case(fresh)]
+        assert got == [(t.id, t.description, t.tags) for t in case(mem)]
+    # None of the queries needed the in-memory list
+    assert fresh._todo is None
+
+
+def test_mutations_round_trip(tmp_path):
+    """Updates, completion and deletes persist per task."""
+    path = tmp_path / "tasks.db"
+    svc = TaskService(SqliteStorageService(path))
+    _seed(svc)
+    svc.update(1, "#low @errands")
+    svc.mark_complete(2)
+    svc.delete(3)
+
+    tasks = SqliteStorageService(path).load()
+    assert [t.id for t in tasks] == [1, 2]
+    assert tasks[0].tags == ["errands"] and tasks[0].priority == "low"
+    assert tasks[1].completed
+    assert TaskService(SqliteStorageService(path)).filter_by_tag("work") == []
+
+
+def test_invalid_search_pattern_returns_empty(tmp_path):
+    """Invalid regexes behave like the in-memory search."""
+    svc = TaskService(SqliteStorageService(tmp_path / "tasks.db"))
+    _seed(svc)
+    assert svc.search("(unclosed") == []
+
+
+def test_services_sharing_a_database_get_distinct_ids(tmp_path):
+    """SQLite assigns ids, so two writers never overwrite each other's tasks."""
+    path = tmp_path / "tasks.db"
+    a = TaskService(SqliteStorageService(path))
+    b = TaskService(SqliteStorageService(path))
+    first = a.add("task from A @a")
+    second = b.add("task from B @b")
+    assert (first.id, second.id) == (1, 2)
+    assert a.update(1, "#high") and b.mark_complete(1)
+    assert a._todo is None and b._todo is None
+
+    tasks = SqliteStorageService(path).load()
+    assert [(t.id, t.description, t.tags) for t in tasks] == [
+        (1, "task from A", ["a"]), (2, "task from B", ["b"]),
+    ]
+    assert tasks[0].priority == "high" and tasks[0].completed
+    # Deleted ids are not handed out again.
+    assert a.delete(2)
+    assert b.add("later").id == 3
+
+
+def test_write_behind_flusher_shares_the_connection_safely(tmp_path):
+    """Id reservations and a busy flusher never interleave transactions."""
+    path = tmp_path / "tasks.db"
+    svc = TaskService(SqliteStorageService(path), flush_interval=0.0005)
+    ids = [svc.add(f"Task {i}").id for i in range(500)]
+    svc.close()
+    assert ids == list(range(1, 501))
+    assert len(SqliteStorageService(path).load()) == 500
+
+
+def test_tables_without_autoincrement_are_migrated(tmp_path):
+    """Databases created before ids were assigned by SQLite keep their rows."""
+    import sqlite3
+
+    path = tmp_path / "old.db"
+    conn = sqlite3.connect(str(path))
+    conn.executescript("""
+        CREATE TABLE tasks (id INTEGER PRIMARY KEY, description TEXT NOT NULL,
+            tags TEXT NOT NULL DEFAULT '[]', priority TEXT, due_date TEXT,
+            assigned_to TEXT, time TEXT, completed INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT NOT NULL, updated_at TEXT NOT NULL);
+        CREATE TABLE task_tags (task_id INTEGER NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+            position INTEGER NOT NULL, tag TEXT NOT NULL, PRIMARY KEY (task_id, position));
+        INSERT INTO tasks VALUES (4, 'Old', '["x"]', NULL, NULL, NULL, NULL, 0,
+            '2025-01-01T00:00:00', '2025-01-01T00:00:00');
+        INSERT INTO task_tags VALUES (4, 0, 'x');
+    """)
+    conn.close()
+    svc = TaskService(SqliteStorageService(path))
+    assert svc.filter_by_tag("x")[0].description == "Old"
+    assert svc.add("New @y").id == 5
+    assert [t.id for t in SqliteStorageService(path).load()] == [4, 5]
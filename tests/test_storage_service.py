@@ -0,0 +1,67 @@
+import io
+import json
+from datetime import datetime
+
+import pytest
+from models.task import LazyTask, Task
+from services.storage_service import StorageService, iter_json_array
+
+
+def test_iter_json_array_across_chunk_boundaries():
+    """Elements split over tiny read chunks decode exactly like json.load."""
+    data = [
+        {"id": i, "s": "x}" * i, "n": [1.5, None, True], "o": {"k": [{"z": "},"}]}}
+        for i in range(20)
+    ] + [12345, "]"]
+    text = json.dumps(data, indent=2)
+    for size in (1, 3, 7, 64, 1 << 20):
+        assert list(iter_json_array(io.StringIO(text), chunk_size=size)) == data
+    assert list(iter_json_array(io.StringIO("  "))) == []
+    assert list(iter_json_array(io.StringIO("[ ]"))) == []
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(io.StringIO('[{"id": 1}, {"id":'), chunk_size=4))
+
+
+def test_lazy_task_decodes_dates_on_access(tmp_path):
+    """Loaded tasks keep ISO strings until a date field is read."""
+    original = Task(id=1, description="d", tags=["a"], due_date=datetime(2025, 10, 20),
+                    time=datetime(2025, 10, 20, 15, 0))
+    storage = StorageService(tmp_path / "tasks.json")
+    storage.save([original])
+
+    loaded = storage.load()[0]
+    assert isinstance(loaded, LazyTask)
+    assert "due_date" not in vars(loaded)
+    assert loaded.to_dict() == original.to_dict()
+    assert "due_date" not in vars(loaded)
+
+    assert loaded.due_date == datetime(2025, 10, 20)
+    assert "due_date" in vars(loaded)
+    loaded.time = None
+    assert loaded.to_dict()["time"] is None
+    loaded.time = original.time
+    assert loaded == original and original == loaded
+
+
+def test_compact_task_round_trip_and_service(tmp_path):
+    """CompactTask serializes like Task and works through TaskService."""
+    from models.task import CompactTask
+    from services.task_service import TaskService
+
+    original = Task(id=3, description="d", tags=["work", "ops"], priority="medium",
+                    due_date=datetime(2025, 10, 20), assigned_to="a@b.co",
+                    time=datetime(2025, 10, 20, 15, 30, 0, 123))
+    compact = CompactTask.from_dict(original.to_dict())
+    assert compact.to_dict() == original.to_dict()
+    assert compact == original
+    assert compact.tags[0] is CompactTask.from_dict(original.to_dict()).tags[0]
+
+    path = tmp_path / "tasks.json"
+    svc = TaskService(StorageService(path, compact=True))
+    t = svc.add("Ship it @release #high due:2025-11-01")
+    assert isinstance(t, CompactTask)
+    svc.update(t.id, "#low @later")
+    assert svc.filter_by_priority("low") == [t]
+    assert svc.filter_by_tag("later") == [t]
+    reloaded = TaskService(StorageService(path, compact=True)).list_all()
+    assert reloaded == [t] and isinstance(reloaded[0], CompactTask)
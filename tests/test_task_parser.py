@@ -18,3 +18,42 @@ def test_parse_time():
     assert "family" in res["tags"]
     assert res["time"] is not None
     assert res["due_date"] is not None
+
+def test_parse_matches_reference_parser(monkeypatch):
+    """Cached parsing returns the same fields as the original parser."""
+    import os
+    from datetime import timedelta
+    monkeypatch.syspath_prepend(os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+    from reference_parser import parse_task_input_reference
+
+    inputs = [
+        'Buy groceries @shopping #high due:2025-10-20 assigned:alice@example.com',
+        "Standup every monday at 9:30 AM @work @team",
+        '"Quoted" #LOW next week by 5pm',
+        "#hi@xgh spliced priority",
+        "assigned:not-an-email due:2025-13-45",
+        "",
+    ]
+    for raw in inputs * 2:
+        got, want = parse_task_input(raw), parse_task_input_reference(raw)
+        for key in ("due_date", "time"):
+            a, b = got.pop(key), want.pop(key)
+            assert (a is None) == (b is None)
+            assert a is None or abs(a - b) < timedelta(seconds=5)
+        assert got == want
+
+def test_parse_cache_returns_independent_results():
+    """Cache hits hand out fresh tag lists and can be disabled."""
+    from parsers.task_parser import configure_parse_cache, parse_cache_info
+
+    configure_parse_cache(8)
+    try:
+        first = parse_task_input("Cached @a @b")
+        first["tags"].append("mutated")
+        assert parse_task_input("Cached @a @b")["tags"] == ["a", "b"]
+        assert parse_cache_info().hits == 1
+        configure_parse_cache(0)
+        assert parse_cache_info() is None
+        assert parse_task_input("Cached @a @b")["tags"] == ["a", "b"]
+    finally:
+        configure_parse_cache()
@@ -27,3 +27,177 @@ def test_delete():
     t = svc.add("A task")
     assert svc.delete(t.id)
     assert svc.list_all() == []
+
+def test_add_many_persists_once(tmp_path):
+    """Bulk import assigns ids in input order and writes storage once."""
+    storage = StorageService(tmp_path / "tasks.json")
+    saves = []
+    original = storage.save
+    storage.save = lambda tasks: (saves.append(len(tasks)), original(tasks))
+    svc = TaskService(storage)
+    svc.add("Existing")
+
+    lines = [f"Task {i} @bulk #low\n" for i in range(25)] + ["\n", "Last one"]
+    added = svc.add_many(lines, workers=2, chunk_size=4)
+    assert [t.id for t in added] == list(range(2, 28))
+    assert added[-1].description == "Last one"
+    assert added[0].tags == ["bulk"] and added[0].priority == "low"
+    assert saves == [1, 27]
+    assert len(TaskService(StorageService(tmp_path / "tasks.json")).list_all()) == 27
+
+def test_write_behind_coalesces_and_flushes_on_close(tmp_path):
+    """Write-behind mode batches mutations and close() flushes the rest."""
+    filepath = tmp_path / "tasks.json"
+    storage = StorageService(filepath)
+    saves = []
+    original = storage.save
+    storage.save = lambda tasks: (saves.append(len(tasks)), original(tasks))
+    svc = TaskService(storage, flush_interval=60, flush_every=1000)
+    for i in range(5):
+        svc.add(f"Task {i}")
+    svc.mark_complete(2)
+    svc.delete(5)
+    assert saves == [] and svc.has_pending()
+
+    svc.close()
+    assert saves == [4]
+    reloaded = TaskService(StorageService(filepath)).list_all()
+    assert [t.id for t in reloaded] == [1, 2, 3, 4]
+    assert reloaded[1].completed
+
+
+def test_write_behind_flushes_after_threshold(tmp_path):
+    """Reaching flush_every wakes the background flusher."""
+    import time
+    filepath = tmp_path / "tasks.json"
+    svc = TaskService(StorageService(filepath), flush_interval=60, flush_every=3)
+    for i in range(3):
+        svc.add(f"Task {i}")
+    deadline = time.time() + 5
+    while svc.has_pending() and time.time() < deadline:
+        time.sleep(0.01)
+    assert not svc.has_pending()
+    assert len(json.loads(filepath.read_text())) == 3
+    svc.close()
+
+
+def test_write_behind_ids_survive_a_concurrent_write(tmp_path):
+    """The id add returns is the stored id even if another process wrote first."""
+    from services.journal_storage import JournalStorageService
+    from services.sharded_storage import ShardedStorageService
+    from services.sqlite_storage import SqliteStorageService
+
+    for cls in (
+        StorageService, JournalStorageService, ShardedStorageService, SqliteStorageService,
+    ):
+        path = tmp_path / f"{cls.__name__}.json"
+        TaskService(cls(path)).add("Seed")
+        behind = TaskService(cls(path), flush_interval=60, flush_every=1000)
+        assert len(behind.list_all()) == 1  # loaded at the seed's version
+        mine = behind.add("Mine @a")
+        other = TaskService(cls(path)).add("Theirs @b")
+        also_mine = behind.add("Also mine")
+        assert len({mine.id, other.id, also_mine.id}) == 3
+        behind.close()
+
+        stored = {t.id: t.description for t in TaskService(cls(path)).list_all()}
+        assert stored == {
+            1: "Seed", mine.id: "Mine", other.id: "Theirs", also_mine.id: "Also mine",
+        }, cls.__name__
+
+
+def test_stats_follow_mutations_without_rescanning(tmp_path):
+    """Incrementally kept counters match a fresh recount after mutations."""
+    from datetime import date, timedelta
+
+    svc = TaskService(StorageService(tmp_path / "tasks.json"))
+    today = date.today()
+    svc.add(f"Old bug @ops #high due:{(today - timedelta(days=3)).isoformat()}")
+    svc.add(f"Soon @ops @home due:{today.isoformat()} assigned:ann@example.com")
+    svc.add("Later #low due:2999-01-01")
+    svc.add("Undated")
+    before = svc.stats(today)
+    assert (before["tasks"], before["open"], before["overdue"]) == (4, 4, 1)
+    assert before["tags"]["ops"] == {"open": 2, "completed": 0}
+
+    assert svc.mark_complete(1)
+    assert svc.update(2, "#medium")
+    assert svc.delete(4)
+    st = svc.stats(today)
+
+    assert (st["tasks"], st["completed"], st["open"], st["overdue"]) == (3, 1, 2, 0)
+    assert st["due_this_week"] == 1
+    assert st["priority"] == {
+        "high": {"open": 0, "completed": 1},
+        "medium": {"open": 1, "completed": 0},
+        "low": {"open": 1, "completed": 0},
+    }
+    assert st["assignees"]["ann@example.com"] == {"open": 1, "completed": 0}
+    assert st["created_per_day"][today.isoformat()] == 3
+    assert st["completed_per_day"][today.isoformat()] == 1
+    fresh = TaskService(StorageService(tmp_path / "tasks.json")).stats(today)
+    assert fresh == st
+
+
+def test_completion_day_survives_edits(tmp_path):
+    """Stats date a completion by ``completed_at``, which edits leave alone."""
+    from datetime import date, datetime, timedelta
+    from models.task import Task
+    from services.sqlite_storage import SqliteStorageService
+
+    today = date.today()
+    done = datetime.combine(today - timedelta(days=3), datetime.min.time())
+    for storage in (
+        StorageService(tmp_path / "tasks.json"),
+        SqliteStorageService(tmp_path / "tasks.db"),
+    ):
+        storage.save([
+            Task(id=1, description="Shipped", completed=True, completed_at=done),
+            # Completed before completion times were recorded.
+            Task(id=2, description="Legacy", completed=True, updated_at=done),
+        ])
+        svc = TaskService(storage)
+        assert svc.update(1, "Shipped v2")
+        assert svc.update(2, "#low")
+        assert svc.stats(today)["completed_per_day"][done.date().isoformat()] == 1
+        assert svc.get(1).completed_at == done
+
+        assert svc.mark_incomplete(1) and svc.get(1).completed_at is None
+        assert svc.mark_complete(1)
+        st = TaskService(storage).stats(today)
+        assert st["completed_per_day"][today.isoformat()] == 2
+        assert st == svc.stats(today)
+
+
+def test_apply_bulk_persists_once(tmp_path):
+    """Bulk mutations by query change every match with one storage write."""
+    from services.journal_storage import JournalStorageService
+    from services.sharded_storage import ShardedStorageService
+
+    for storage in (
+        StorageService(tmp_path / "tasks.json"),
+        JournalStorageService(tmp_path / "journal.json"),
+        ShardedStorageService(tmp_path / "sharded.json"),
+    ):
+        svc = TaskService(storage)
+        svc.add_many([f"Task {i} @sprint{i % 2} due:2025-0{i % 9 + 1}-10" for i in range(20)])
+        writes = []
+        for name in ("save", "append_many"):
+            original = getattr(storage, name, None)
+            if original is not None:
+                setattr(storage, name, lambda *a, _f=original, _n=name: (writes.append(_n), _f(*a))[1])
+
+        done = svc.apply_bulk("tag:sprint1", "complete")
+        assert done == list(range(2, 21, 2))
+        assert len(writes) == 1
+        assert svc.apply_bulk("tag:sprint0", TaskService.updater("#high")) == list(range(1, 20, 2))
+        assert svc.apply_bulk("completed due<2025-05-01", "delete") == [2, 4, 10, 12, 20]
+        assert len(writes) == 3
+        assert svc.apply_bulk("tag:nothing", "delete") == []
+        assert len(writes) == 3
+
+        reloaded = TaskService(type(storage)(storage.filepath))
+        tasks = {t.id: t for t in reloaded.list_all()}
+        assert len(tasks) == 15 and 2 not in tasks
+        assert all(tasks[i].priority == "high" for i in range(1, 20, 2))
+        assert all(tasks[i].completed for i in (6, 8, 14, 16, 18))
@@ -0,0 +1,49 @@
+import re
+from models.task import Task
+from models.text_index import required_literals
+from models.todo_list import TodoList
+
+
+def _naive(todo, regex):
+    return [
+        t for t in todo.all_tasks()
+        if regex.search(t.description) or any(regex.search(tag) for tag in t.tags)
+    ]
+
+
+def test_required_literals():
+    """Literal fragments are extracted per alternative; weak patterns scan."""
+    assert required_literals("grocer|milk", re.I) == [["grocer"], ["milk"]]
+    assert required_literals(r"Buy\s+Milk", re.I) == [["buy", "milk"]]
+    assert required_literals("a+|milk", re.I) is None
+    assert required_literals("[a-z]+", re.I) is None
+
+
+def test_search_matches_full_scan_and_tracks_updates():
+    """Indexed search returns the same tasks as a scan, across mutations."""
+    todo = TodoList()
+    for desc, tags in [
+        ("Buy groceries", ["shopping"]),
+        ("Call MOM", ["family"]),
+        ("Weekly report", ["work", "Reports"]),
+        ("Straße fegen", ["home"]),
+        ("Fix bike", []),
+    ]:
+        todo.add_task(Task(id=0, description=desc, tags=tags))
+    patterns = ["grocer|mom", "report", "^call", "strasse|stra", "o.*e", "SHOP", "ike$"]
+
+    def check():
+        for p in patterns:
+            regex = re.compile(p, re.IGNORECASE)
+            assert todo.search(regex) == _naive(todo, regex), p
+
+    check()
+    todo.update_task(5, lambda t: setattr(t, "description", "Call the bike shop"))
+    todo.delete_task(2)
+    todo.add_task(Task(id=0, description="Report taxes", tags=["admin"]))
+    check()
+
+    stats = todo.index("text").stats()
+    assert stats["documents"] == 5
+    assert stats["index_queries"] < stats["queries"]
+    assert 0 < stats["hit_ratio"] < 1
@@ -0,0 +1,86 @@
+import re
+from datetime import datetime
+
+from models.task import Task
+from models.todo_list import TodoList
+
+
+def test_order_and_lookup_after_deletes():
+    """Deleting by id keeps the remaining insertion order intact."""
+    todo = TodoList()
+    for i in range(5):
+        todo.add_task(Task(id=0, description=f"t{i}"))
+    assert todo.delete_task(2)
+    assert not todo.delete_task(2)
+    assert [t.id for t in todo.all_tasks()] == [1, 3, 4, 5]
+    assert todo.find_by_id(4).description == "t3"
+    assert todo.find_by_id(2) is None
+    assert len(todo) == 4
+
+
+def test_load_tasks_keeps_order_and_next_id():
+    """Loaded order is preserved and new ids continue after the maximum."""
+    todo = TodoList()
+    todo.load_tasks([Task(id=7, description="a"), Task(id=3, description="b")])
+    assert [t.id for t in todo.all_tasks()] == [7, 3]
+    assert todo.add_task(Task(id=0, description="c")).id == 8
+    todo.load_tasks([])
+    assert todo.add_task(Task(id=0, description="d")).id == 9
+
+
+def test_indexes_follow_arbitrary_updates():
+    """Tag, priority and due indexes stay in sync through update and delete."""
+    todo = TodoList()
+    a = todo.add_task(Task(id=0, description="a", tags=["Work"], priority="high",
+                           due_date=datetime(2026, 1, 5)))
+    b = todo.add_task(Task(id=0, description="b", tags=["home"], priority="low",
+                           due_date=datetime(2026, 2, 1)))
+    # Build the indexes before mutating so they have to be maintained
+    assert todo.with_tag_matching("work") == [a]
+    assert todo.with_priority("high") == [a]
+    assert todo.due_between(after=datetime(2026, 1, 1)) == [a, b]
+
+    def retag(t):
+        t.tags = ["work", "ops"]
+        t.priority = "high"
+        t.due_date = datetime(2025, 12, 31)
+
+    todo.update_task(b.id, retag)
+    assert todo.with_tag_matching("WORK") == [a, b]
+    assert todo.with_tag_matching("o.*") == [b]
+    assert todo.with_priority("low") == []
+    assert todo.due_between(before=datetime(2026, 1, 1)) == [b]
+    assert todo.due_matching(re.compile("2026-01")) == [a]
+
+    todo.delete_task(a.id)
+    assert todo.with_priority("high") == [b]
+    assert todo.with_tag_matching("Work") == [b]
+
+
+def test_sort_and_next_indexes_follow_mutations():
+    """Sorted views and the next-due queue match a fresh sort after changes."""
+    from models.indexes import SORT_KEYS
+
+    todo = TodoList()
+    for i in range(12):
+        todo.add_task(Task(
+            id=0, description=f"t{i}", priority=["high", "low", None][i % 3],
+            due_date=datetime(2026, 1 + i % 4, 1) if i % 5 else None,
+            time=datetime(2026, 1 + i % 4, 1, 23 - i) if i % 2 else None,
+        ))
+    for name in ("due", "priority", "created", "updated"):
+        list(todo.iter_sorted(name))  # build before mutating
+    assert [t.id for t in todo.next_due(3)] == [5, 9, 10]
+
+    todo.mark_complete(9)
+    todo.delete_task(5)
+    todo.update_task(3, lambda t: setattr(t, "due_date", datetime(2025, 6, 1)))
+    todo.add_task(Task(id=0, description="late", due_date=datetime(2030, 1, 1)))
+    for name in ("due", "priority", "created", "updated"):
+        expected = sorted(todo.all_tasks(), key=SORT_KEYS[name])
+        assert list(todo.iter_sorted(name)) == expected, name
+        after = SORT_KEYS[name](expected[4])
+        assert list(todo.iter_sorted(name, after)) == expected[5:], name
+    open_due = [t for t in todo.iter_sorted("due") if not t.completed and (t.time or t.due_date)]
+    assert todo.next_due(4) == open_due[:4]
+    assert todo.next_due(4)[0].id == 3